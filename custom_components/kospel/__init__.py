@@ -1,6 +1,7 @@
 """The Kospel Heater integration."""
 
 import logging
+import time
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +10,7 @@ import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
@@ -16,12 +18,38 @@ from .const import (
     CONF_HEATER_IP,
     CONF_DEVICE_ID,
     BACKEND_TYPE_HTTP,
+    BACKEND_TYPE_BINARY,
+    BACKEND_TYPE_REPLAY,
+    BACKEND_TYPE_SIMULATION,
     BACKEND_TYPE_YAML,
+    CAPTURE_DIRECTORY,
+    CONF_CAPTURE_FILE,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_REPLAY_SPEED,
+    CONF_TIME_MULTIPLIER,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_TIME_MULTIPLIER,
+    get_binary_state_file_path,
     get_yaml_state_file_path,
 )
-from .coordinator import KospelDataUpdateCoordinator
+from .binary_backend import BinaryRegisterBackend
+from .coordinator import (
+    DATA_IP_RECOVERY_ATTEMPTS,
+    KospelDataUpdateCoordinator,
+    async_recover_heater_address,
+)
+from .energy import energy_store
+from .latency import LatencyTracker, TimedRegisterBackend, latency_store
+from .rolling import rolling_store
+from .runtime import runtime_store
+from .scheduler import ScheduledRegisterBackend, request_scheduler
+from .services import async_setup_services
+from .recording import RecordingRegisterBackend, ReplayRegisterBackend
+from .simulation import SimulatedHeaterBackend
+from .yaml_backend import CachedYamlRegisterBackend
+from kospel_cmi import KospelConnectionError
 from kospel_cmi.controller.device import EkcoM3
-from kospel_cmi.kospel.backend import HttpRegisterBackend, YamlRegisterBackend
+from kospel_cmi.kospel.backend import HttpRegisterBackend
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,8 +63,12 @@ PLATFORMS: list[str] = [
 ]
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
-    """Set up the Kospel integration."""
+    """Set up the Kospel integration (services)."""
+    async_setup_services(hass)
     return True
 
 
@@ -46,39 +78,151 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     backend_type = entry.data.get(CONF_BACKEND_TYPE, BACKEND_TYPE_HTTP)
     session: aiohttp.ClientSession | None = None
-    backend: HttpRegisterBackend | YamlRegisterBackend
+    latency: LatencyTracker | None = None
+    hedge_backend: TimedRegisterBackend | None = None
+    backend: (
+        HttpRegisterBackend
+        | CachedYamlRegisterBackend
+        | BinaryRegisterBackend
+        | SimulatedHeaterBackend
+        | RecordingRegisterBackend
+        | ReplayRegisterBackend
+        | ScheduledRegisterBackend
+    )
 
     if backend_type == BACKEND_TYPE_YAML:
         integration_dir = Path(__file__).resolve().parent
-        state_file_path = get_yaml_state_file_path(integration_dir)
-        state_file_path.parent.mkdir(parents=True, exist_ok=True)
-        backend = YamlRegisterBackend(state_file=str(state_file_path))
+        state_file_path = get_yaml_state_file_path(integration_dir, entry.entry_id)
+        backend = CachedYamlRegisterBackend(
+            hass,
+            state_file_path,
+            seed_file=get_yaml_state_file_path(integration_dir),
+        )
+        await backend.async_load()
         _LOGGER.info(
             "Kospel integration using YAML backend: %s",
             state_file_path,
         )
+    elif backend_type == BACKEND_TYPE_SIMULATION:
+        state_file_path = get_yaml_state_file_path(
+            Path(__file__).resolve().parent, entry.entry_id
+        )
+        store = CachedYamlRegisterBackend(hass, state_file_path)
+        await store.async_load()
+        time_multiplier = entry.data.get(CONF_TIME_MULTIPLIER, DEFAULT_TIME_MULTIPLIER)
+        backend = SimulatedHeaterBackend(store, time_multiplier=time_multiplier)
+        _LOGGER.info(
+            "Kospel integration using simulation backend (x%s): %s",
+            time_multiplier,
+            state_file_path,
+        )
+    elif backend_type == BACKEND_TYPE_REPLAY:
+        backend = ReplayRegisterBackend(
+            Path(entry.data[CONF_CAPTURE_FILE]),
+            speed=entry.data.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+            loop=True,
+        )
+        await backend.async_open()
+        _LOGGER.info(
+            "Kospel integration replaying %s (%s batches)",
+            entry.data[CONF_CAPTURE_FILE],
+            backend.batch_count,
+        )
+    elif backend_type == BACKEND_TYPE_BINARY:
+        image_path = get_binary_state_file_path(
+            Path(__file__).resolve().parent, entry.entry_id
+        )
+        backend = BinaryRegisterBackend(image_path)
+        await backend.async_open()
+        _LOGGER.info("Kospel integration using binary backend: %s", image_path)
     else:
         heater_ip = entry.data[CONF_HEATER_IP]
         device_id = entry.data[CONF_DEVICE_ID]
         api_base_url = f"http://{heater_ip}/api/dev/{device_id}"
         session = aiohttp.ClientSession()
-        backend = HttpRegisterBackend(session, api_base_url)
+        latency = LatencyTracker(latency_store(hass, entry.entry_id), heater_ip)
+        await latency.async_load()
+        # One request at a time per module, writes first; timeouts exclude
+        # queueing. Hedged reads bypass the queue to run next to a slow read.
+        hedge_backend = TimedRegisterBackend(
+            HttpRegisterBackend(session, api_base_url), latency
+        )
+        backend = ScheduledRegisterBackend(
+            hedge_backend, request_scheduler(heater_ip), target=api_base_url
+        )
+        if (entry.options or {}).get(CONF_CAPTURE_TRAFFIC, False):
+            capture_path = Path(hass.config.path(CAPTURE_DIRECTORY)) / (
+                f"{entry.entry_id}-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+            )
+            backend = RecordingRegisterBackend(backend, capture_path)
+            _LOGGER.info("Capturing heater traffic to %s", capture_path)
 
     try:
         heater_controller = EkcoM3(backend=backend, strict_refresh=True)
-        coordinator = KospelDataUpdateCoordinator(hass, entry, heater_controller)
+        coordinator = KospelDataUpdateCoordinator(
+            hass,
+            entry,
+            heater_controller,
+            backend=backend,
+            latency=latency,
+            hedge_backend=hedge_backend,
+        )
         hass.data[DOMAIN][entry.entry_id] = coordinator
+        await coordinator.energy.async_load()
+        await coordinator.runtime.async_load()
+        if coordinator.rolling is not None:
+            await coordinator.rolling.async_load()
         await coordinator.async_config_entry_first_refresh()
     except Exception as err:
+        # Release what the attempt opened (HTTP session, state files, capture
+        # buffer); the retry builds everything again.
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await backend.aclose()
         if session is not None:
             await session.close()
         _LOGGER.error("Error setting up Kospel integration: %s", err)
+        if _caused_by_connection_error(err):
+            # Heater may have taken a new DHCP lease while HA was down. Probe
+            # in the background so the retry is not delayed by the scan.
+            hass.async_create_background_task(
+                _async_recover_and_retry(hass, entry),
+                name=f"{DOMAIN} IP recovery {entry.entry_id}",
+            )
         raise ConfigEntryNotReady from err
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so option and data changes take effect.
+
+    E.g. traffic capture, or a heater address updated by IP recovery.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_recover_and_retry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Retry setup at once when the heater is found at a new address.
+
+    The update listener is only registered by a successful setup, so an
+    entry waiting for its retry is reloaded here.
+    """
+    if await async_recover_heater_address(hass, entry):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
+def _caused_by_connection_error(err: BaseException) -> bool:
+    """True if ``err`` or any exception in its cause chain is a connection error."""
+    current: BaseException | None = err
+    while current is not None:
+        if isinstance(current, KospelConnectionError):
+            return True
+        current = current.__cause__
+    return False
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -86,6 +230,32 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok:
         coordinator: KospelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
         await coordinator.heater_controller.aclose()
+        await coordinator.energy.async_flush()
+        await coordinator.runtime.async_flush()
+        if coordinator.rolling is not None:
+            await coordinator.rolling.async_flush()
+        if coordinator.latency is not None:
+            await coordinator.latency.async_flush()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored meters and the state files of a removed entry."""
+    hass.data.get(DATA_IP_RECOVERY_ATTEMPTS, {}).pop(entry.entry_id, None)
+    await energy_store(hass, entry.entry_id).async_remove()
+    await rolling_store(hass, entry.entry_id).async_remove()
+    await runtime_store(hass, entry.entry_id).async_remove()
+    await latency_store(hass, entry.entry_id).async_remove()
+    integration_dir = Path(__file__).resolve().parent
+    backend_type = entry.data.get(CONF_BACKEND_TYPE)
+    if backend_type in (BACKEND_TYPE_YAML, BACKEND_TYPE_SIMULATION):
+        paths = [get_yaml_state_file_path(integration_dir, entry.entry_id)]
+    elif backend_type == BACKEND_TYPE_BINARY:
+        image_path = get_binary_state_file_path(integration_dir, entry.entry_id)
+        paths = [image_path, image_path.with_suffix(".journal")]
+    else:
+        return
+    for path in paths:
+        await hass.async_add_executor_job(path.unlink, True)
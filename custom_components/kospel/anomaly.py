@@ -0,0 +1,224 @@
+"""Streaming anomaly detection on refreshed heater values.
+
+Detectors run in the coordinator on every successful refresh and keep a few
+numbers of state each (constant memory per heater, nothing read back from the
+recorder):
+
+- ``pressure_drop``: pressure falls well below its slow EWMA baseline. The
+  threshold is the larger of ``PRESSURE_DROP_MIN_BAR`` and
+  ``PRESSURE_DROP_SIGMA`` standard deviations of the residuals (Welford), so
+  noisy sensors do not trip it. The baseline is frozen while the anomaly is
+  active and the anomaly clears once pressure recovers.
+- ``room_not_heating`` / ``water_not_heating``: the circuit status is RUNNING
+  for a full check window but the (EWMA-smoothed) temperature rose less than
+  the required minimum. Clears when the circuit stops or the temperature rises.
+
+The module only imports the standard library.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+ANOMALY_PRESSURE_DROP = "pressure_drop"
+ANOMALY_ROOM_NOT_HEATING = "room_not_heating"
+ANOMALY_WATER_NOT_HEATING = "water_not_heating"
+ANOMALY_TYPES = (
+    ANOMALY_PRESSURE_DROP,
+    ANOMALY_ROOM_NOT_HEATING,
+    ANOMALY_WATER_NOT_HEATING,
+)
+
+# Pressure: baseline smoothing, samples before judging, and drop thresholds.
+PRESSURE_BASELINE_ALPHA = 0.05
+PRESSURE_WARMUP_SAMPLES = 20
+PRESSURE_DROP_MIN_BAR = 0.3
+PRESSURE_DROP_SIGMA = 6.0
+
+# Heating stagnation: smoothing, check window (s) and minimum rise (°C) per window.
+TEMPERATURE_ALPHA = 0.3
+ROOM_CHECK_WINDOW_SECONDS = 45 * 60.0
+ROOM_MIN_RISE_C = 0.2
+WATER_CHECK_WINDOW_SECONDS = 20 * 60.0
+WATER_MIN_RISE_C = 1.0
+
+
+class Welford:
+    """Running mean and variance (Welford's algorithm)."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self) -> None:
+        """Initialize with no observations."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0 with fewer than two observations)."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+@dataclass
+class AnomalyChange:
+    """An anomaly that became active or cleared on this refresh."""
+
+    anomaly: str
+    active: bool
+    value: float
+    reference: float
+
+
+class PressureDropDetector:
+    """Flags sudden pressure drops against an EWMA baseline."""
+
+    def __init__(self) -> None:
+        """Initialize inactive; the first sample sets the baseline."""
+        self.active = False
+        self._baseline: float | None = None
+        self._residuals = Welford()
+
+    def threshold(self) -> float:
+        """Current drop threshold in bar."""
+        return max(PRESSURE_DROP_MIN_BAR, PRESSURE_DROP_SIGMA * self._residuals.std)
+
+    def update(self, pressure: float) -> AnomalyChange | None:
+        """Feed one pressure sample; return a change when the state flips."""
+        if self._baseline is None:
+            self._baseline = pressure
+            return None
+        baseline = self._baseline
+        residual = pressure - baseline
+        if self.active:
+            if residual > -PRESSURE_DROP_MIN_BAR / 2:
+                self.active = False
+                self._baseline = pressure
+                return AnomalyChange(ANOMALY_PRESSURE_DROP, False, pressure, baseline)
+            return None
+        if (
+            self._residuals.count >= PRESSURE_WARMUP_SAMPLES
+            and -residual > self.threshold()
+        ):
+            self.active = True
+            return AnomalyChange(ANOMALY_PRESSURE_DROP, True, pressure, baseline)
+        self._residuals.add(residual)
+        self._baseline = baseline + PRESSURE_BASELINE_ALPHA * residual
+        return None
+
+
+class HeatingStagnationDetector:
+    """Flags a circuit that runs for a whole window without warming up."""
+
+    def __init__(self, anomaly: str, window_seconds: float, min_rise: float) -> None:
+        """Initialize an inactive detector.
+
+        Args:
+            anomaly: Anomaly name reported in changes (``ANOMALY_*``).
+            window_seconds: Running time after which the rise is checked.
+            min_rise: Smoothed temperature rise (°C) expected within the window.
+        """
+        self.anomaly = anomaly
+        self.active = False
+        self._window_seconds = window_seconds
+        self._min_rise = min_rise
+        self._smoothed: float | None = None
+        # (start time, smoothed temperature) of the current check window.
+        self._reference: tuple[float, float] | None = None
+
+    def update(
+        self, running: bool, temperature: float, timestamp: float
+    ) -> AnomalyChange | None:
+        """Feed one sample; return a change when the state flips."""
+        if self._smoothed is None:
+            self._smoothed = temperature
+        else:
+            self._smoothed += TEMPERATURE_ALPHA * (temperature - self._smoothed)
+        smoothed = self._smoothed
+
+        if not running:
+            self._reference = None
+            if self.active:
+                self.active = False
+                return AnomalyChange(self.anomaly, False, smoothed, smoothed)
+            return None
+
+        if self._reference is None:
+            self._reference = (timestamp, smoothed)
+            return None
+        start, reference = self._reference
+        rise = smoothed - reference
+        if self.active and rise >= self._min_rise:
+            self.active = False
+            self._reference = (timestamp, smoothed)
+            return AnomalyChange(self.anomaly, False, smoothed, reference)
+        if timestamp - start < self._window_seconds:
+            return None
+        self._reference = (timestamp, smoothed)
+        if not self.active and rise < self._min_rise:
+            self.active = True
+            return AnomalyChange(self.anomaly, True, smoothed, reference)
+        return None
+
+
+class AnomalyDetector:
+    """All detectors of one heater."""
+
+    def __init__(self) -> None:
+        """Initialize the pressure, room and DHW detectors."""
+        self._pressure = PressureDropDetector()
+        self._room = HeatingStagnationDetector(
+            ANOMALY_ROOM_NOT_HEATING, ROOM_CHECK_WINDOW_SECONDS, ROOM_MIN_RISE_C
+        )
+        self._water = HeatingStagnationDetector(
+            ANOMALY_WATER_NOT_HEATING, WATER_CHECK_WINDOW_SECONDS, WATER_MIN_RISE_C
+        )
+
+    def is_active(self, anomaly: str) -> bool:
+        """Return whether ``anomaly`` is currently flagged."""
+        return {
+            ANOMALY_PRESSURE_DROP: self._pressure,
+            ANOMALY_ROOM_NOT_HEATING: self._room,
+            ANOMALY_WATER_NOT_HEATING: self._water,
+        }[anomaly].active
+
+    def update(
+        self,
+        timestamp: float,
+        pressure: float | None,
+        room_temperature: float | None,
+        room_heating: bool,
+        water_temperature: float | None,
+        water_heating: bool,
+    ) -> list[AnomalyChange]:
+        """Feed one refresh; missing values leave their detector untouched.
+
+        Args:
+            timestamp: Monotonic sample time in seconds.
+            pressure: Pressure in bar.
+            room_temperature: Room temperature in °C.
+            room_heating: CH circuit status is RUNNING.
+            water_temperature: DHW tank temperature in °C.
+            water_heating: DHW circuit status is RUNNING.
+
+        Returns:
+            Anomalies that became active or cleared.
+        """
+        changes: list[AnomalyChange | None] = []
+        if pressure is not None:
+            changes.append(self._pressure.update(pressure))
+        if room_temperature is not None:
+            changes.append(self._room.update(room_heating, room_temperature, timestamp))
+        if water_temperature is not None:
+            changes.append(
+                self._water.update(water_heating, water_temperature, timestamp)
+            )
+        return [change for change in changes if change is not None]
@@ -0,0 +1,341 @@
+"""Binary file-backed register backend: memory-mapped image plus write journal.
+
+Development alternative to the YAML backends for scripted workloads with many
+writes. State lives in two files:
+
+- ``<name>.bin``: fixed 512-byte image of registers 0b00..0bff (two raw bytes
+  per register, exactly as in the hex string), memory-mapped while open.
+- ``<name>.journal``: append-only log of writes, one 7-byte record each
+  (register offset, two value bytes, CRC32 of both).
+
+Writes update the mapped image and queue a journal record; records are appended
+on the executor after a short debounce. Once the journal holds
+``compact_threshold`` records the image is synced to disk and the journal
+truncated. On open, valid journal records are replayed over the image and a
+torn or corrupt tail (crash during append) is cut off, so the state is always
+the image plus every fully written record.
+
+The module only imports the standard library, PyYAML and kospel_cmi, so
+scripts can load it without Home Assistant.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+
+import yaml
+
+from kospel_cmi.exceptions import KospelWriteError
+from kospel_cmi.registers.utils import int_to_reg_address, reg_address_to_int
+
+_LOGGER = logging.getLogger(__name__)
+
+IMAGE_REGISTER_PREFIX = "0b"
+IMAGE_REGISTER_COUNT = 256
+IMAGE_SIZE = IMAGE_REGISTER_COUNT * 2
+
+# Register offset (0-255), raw value bytes, CRC32 of offset and value.
+JOURNAL_RECORD = struct.Struct("<B2sI")
+
+# Journal records kept before the image is synced and the journal truncated.
+JOURNAL_COMPACT_THRESHOLD = 1024
+# Writes arriving within this window share one journal append.
+JOURNAL_FLUSH_DELAY_SECONDS = 0.5
+
+DEFAULT_REGISTER_VALUE = "0000"
+
+
+def _record_crc(offset: int, value: bytes) -> int:
+    """CRC32 protecting one journal record."""
+    return zlib.crc32(bytes((offset,)) + value)
+
+
+def encode_journal_record(offset: int, value: bytes) -> bytes:
+    """Pack one journal record."""
+    return JOURNAL_RECORD.pack(offset, value, _record_crc(offset, value))
+
+
+def replay_journal(data: bytes, image: bytearray | mmap.mmap) -> tuple[int, int]:
+    """Apply valid journal records from ``data`` to ``image``.
+
+    Stops at the first short or corrupt record (torn append).
+
+    Returns:
+        (records applied, byte length of the valid journal prefix).
+    """
+    records = 0
+    position = 0
+    while position + JOURNAL_RECORD.size <= len(data):
+        offset, value, crc = JOURNAL_RECORD.unpack_from(data, position)
+        if offset >= IMAGE_REGISTER_COUNT or crc != _record_crc(offset, value):
+            break
+        image[offset * 2 : offset * 2 + 2] = value
+        records += 1
+        position += JOURNAL_RECORD.size
+    return records, position
+
+
+class BinaryRegisterBackend:
+    """Register backend over a memory-mapped register image and write journal.
+
+    Call ``async_open`` before use and ``aclose`` to flush and release files.
+    Only registers 0b00..0bff exist; other reads return 0000 and other writes
+    raise ``KospelWriteError``.
+    """
+
+    def __init__(
+        self,
+        image_path: Path,
+        journal_path: Path | None = None,
+        compact_threshold: int = JOURNAL_COMPACT_THRESHOLD,
+        flush_delay: float = JOURNAL_FLUSH_DELAY_SECONDS,
+    ) -> None:
+        """Initialize the backend (no I/O).
+
+        Args:
+            image_path: Register image file (created when missing).
+            journal_path: Journal file; defaults to ``image_path`` with a
+                ``.journal`` suffix.
+            compact_threshold: Journal records that trigger compaction.
+            flush_delay: Debounce for journal appends, in seconds.
+        """
+        self._image_path = image_path
+        self._journal_path = journal_path or image_path.with_suffix(".journal")
+        self._compact_threshold = compact_threshold
+        self._flush_delay = flush_delay
+        self._image_file = None
+        self._image: mmap.mmap | None = None
+        self._journal_fd: int | None = None
+        self._journal_records = 0
+        self._pending: list[bytes] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Future[None] | None = None
+
+    @property
+    def image_path(self) -> Path:
+        """Path of the register image."""
+        return self._image_path
+
+    @property
+    def journal_path(self) -> Path:
+        """Path of the write journal."""
+        return self._journal_path
+
+    async def async_open(self) -> None:
+        """Open files, map the image and recover from the journal (executor)."""
+        await asyncio.get_running_loop().run_in_executor(None, self._open)
+
+    def _open(self) -> None:
+        """Blocking part of ``async_open``."""
+        self._image_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._image_path.exists():
+            self._image_path.write_bytes(bytes(IMAGE_SIZE))
+        image_file = open(self._image_path, "r+b")  # noqa: SIM115
+        if os.fstat(image_file.fileno()).st_size != IMAGE_SIZE:
+            _LOGGER.warning(
+                "Register image %s has wrong size; resizing to %s bytes",
+                self._image_path,
+                IMAGE_SIZE,
+            )
+            image_file.truncate(IMAGE_SIZE)
+        self._image_file = image_file
+        self._image = mmap.mmap(image_file.fileno(), IMAGE_SIZE)
+
+        try:
+            journal = self._journal_path.read_bytes()
+        except FileNotFoundError:
+            journal = b""
+        records, valid_length = replay_journal(journal, self._image)
+        if valid_length != len(journal):
+            _LOGGER.warning(
+                "Discarding %s bytes of torn journal tail in %s",
+                len(journal) - valid_length,
+                self._journal_path,
+            )
+        self._journal_fd = os.open(
+            self._journal_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644
+        )
+        os.ftruncate(self._journal_fd, valid_length)
+        self._journal_records = records
+        if records:
+            _LOGGER.debug(
+                "Replayed %s journal records into %s", records, self._image_path
+            )
+        if records >= self._compact_threshold:
+            self._compact()
+
+    def _offset(self, register: str) -> int | None:
+        """Image offset (register index) for ``register``, None when not mapped."""
+        if register[:2] != IMAGE_REGISTER_PREFIX:
+            return None
+        try:
+            index = reg_address_to_int(register)
+        except (ValueError, TypeError):
+            return None
+        return index if 0 <= index < IMAGE_REGISTER_COUNT else None
+
+    def _require_image(self) -> mmap.mmap:
+        """Return the mapped image or raise if the backend is not open."""
+        if self._image is None:
+            raise RuntimeError("BinaryRegisterBackend used before async_open()")
+        return self._image
+
+    async def read_register(self, register: str) -> str:
+        """Read a single register from the mapped image."""
+        image = self._require_image()
+        offset = self._offset(register)
+        if offset is None:
+            return DEFAULT_REGISTER_VALUE
+        return image[offset * 2 : offset * 2 + 2].hex()
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Read ``count`` consecutive registers from the mapped image."""
+        image = self._require_image()
+        start = reg_address_to_int(start_register)
+        prefix = start_register[:2]
+        result: dict[str, str] = {}
+        for index in range(start, start + count):
+            register = int_to_reg_address(prefix, index)
+            offset = self._offset(register)
+            result[register] = (
+                DEFAULT_REGISTER_VALUE
+                if offset is None
+                else image[offset * 2 : offset * 2 + 2].hex()
+            )
+        return result
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Write a register to the image and queue its journal record.
+
+        Raises:
+            KospelWriteError: Register outside the image or malformed value.
+        """
+        image = self._require_image()
+        offset = self._offset(register)
+        if offset is None:
+            raise KospelWriteError(
+                f"Register {register} is outside the binary register image"
+            )
+        try:
+            value = bytes.fromhex(hex_value)
+        except ValueError as err:
+            raise KospelWriteError(f"Invalid register value {hex_value!r}") from err
+        if len(value) != 2:
+            raise KospelWriteError(f"Invalid register value {hex_value!r}")
+
+        image[offset * 2 : offset * 2 + 2] = value
+        self._pending.append(encode_journal_record(offset, value))
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._flush_delay, self._schedule_flush
+            )
+
+    def _schedule_flush(self) -> None:
+        """Timer callback: start the journal flush unless one is running."""
+        self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._flush_delay, self._schedule_flush
+            )
+            return
+        self._flush_task = asyncio.ensure_future(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Append queued records to the journal now, compacting if due (executor)."""
+        if not self._pending or self._journal_fd is None:
+            return
+        records, self._pending = self._pending, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._append, records
+            )
+        except OSError as err:
+            # Keep records for the next flush; the image already holds them.
+            self._pending[:0] = records
+            _LOGGER.error(
+                "Could not append to journal %s: %s", self._journal_path, err
+            )
+
+    def _append(self, records: list[bytes]) -> None:
+        """Append records to the journal and compact when over the threshold."""
+        assert self._journal_fd is not None
+        os.write(self._journal_fd, b"".join(records))
+        os.fsync(self._journal_fd)
+        self._journal_records += len(records)
+        if self._journal_records >= self._compact_threshold:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Sync the image to disk, then truncate the journal it now contains."""
+        assert self._image is not None and self._journal_fd is not None
+        self._image.flush()
+        os.ftruncate(self._journal_fd, 0)
+        os.fsync(self._journal_fd)
+        _LOGGER.debug(
+            "Compacted %s journal records into %s",
+            self._journal_records,
+            self._image_path,
+        )
+        self._journal_records = 0
+
+    def snapshot(self) -> dict[str, str]:
+        """Return all 256 image registers as ``{"0bXX": hex}``."""
+        image = self._require_image()
+        return {
+            int_to_reg_address(IMAGE_REGISTER_PREFIX, index): image[
+                index * 2 : index * 2 + 2
+            ].hex()
+            for index in range(IMAGE_REGISTER_COUNT)
+        }
+
+    async def async_export_yaml(self, path: Path) -> None:
+        """Write the current registers as a YAML state file (executor).
+
+        The output uses the YAML backend format, so it can be inspected or
+        loaded as a YAML entry's state file.
+        """
+        registers = self.snapshot()
+        await asyncio.get_running_loop().run_in_executor(
+            None, _write_yaml_export, path, registers
+        )
+
+    async def aclose(self) -> None:
+        """Flush queued writes, compact and release files. Idempotent."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        if self._image is None:
+            return
+        await self.async_flush()
+        await asyncio.get_running_loop().run_in_executor(None, self._close)
+
+    def _close(self) -> None:
+        """Blocking part of ``aclose``."""
+        if self._journal_records:
+            self._compact()
+        if self._image is not None:
+            self._image.close()
+            self._image = None
+        if self._image_file is not None:
+            self._image_file.close()
+            self._image_file = None
+        if self._journal_fd is not None:
+            os.close(self._journal_fd)
+            self._journal_fd = None
+
+
+def _write_yaml_export(path: Path, registers: dict[str, str]) -> None:
+    """Write registers as YAML (sorted keys, strings kept as strings)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        yaml.safe_dump(registers, default_flow_style=False, sort_keys=True),
+        encoding="utf-8",
+    )
@@ -1,4 +1,4 @@
-"""Binary sensor entities for Kospel integration (connectivity)."""
+"""Binary sensor entities for Kospel integration (connectivity, anomalies)."""
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -9,6 +9,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .anomaly import ANOMALY_TYPES
 from .const import DOMAIN, get_device_info, get_device_identifier
 from .coordinator import KospelDataUpdateCoordinator
 
@@ -20,7 +21,14 @@ async def async_setup_entry(
 ) -> None:
     """Set up Kospel binary sensor entities."""
     coordinator: KospelDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([KospelConnectivityBinarySensor(coordinator, entry)])
+    entities: list[BinarySensorEntity] = [
+        KospelConnectivityBinarySensor(coordinator, entry)
+    ]
+    entities.extend(
+        KospelAnomalyBinarySensor(coordinator, entry, anomaly)
+        for anomaly in ANOMALY_TYPES
+    )
+    async_add_entities(entities)
 
 
 class KospelConnectivityBinarySensor(
@@ -51,3 +59,35 @@ class KospelConnectivityBinarySensor(
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
+
+
+class KospelAnomalyBinarySensor(
+    CoordinatorEntity[KospelDataUpdateCoordinator], BinarySensorEntity
+):
+    """Problem sensor for one streaming anomaly (see ``AnomalyDetector``)."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(
+        self,
+        coordinator: KospelDataUpdateCoordinator,
+        entry: ConfigEntry,
+        anomaly: str,
+    ) -> None:
+        """Initialize the anomaly binary sensor."""
+        super().__init__(coordinator)
+        device_id = get_device_identifier(entry)
+        self._anomaly = anomaly
+        self._attr_unique_id = f"{device_id}_{anomaly}"
+        self._attr_translation_key = anomaly
+        self._attr_device_info = get_device_info(entry)
+
+    @property
+    def is_on(self) -> bool:
+        """Return True while the anomaly is flagged."""
+        return self.coordinator.anomalies.is_active(self._anomaly)
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
@@ -1,6 +1,5 @@
 """Climate entity for Kospel integration."""
 
-import asyncio
 import logging
 from typing import Final, TypedDict, Unpack
 
@@ -19,14 +18,17 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    ATTR_DATA_AGE,
     DOMAIN,
+    MANUAL_TEMP_MAX,
+    MANUAL_TEMP_MIN,
     get_device_info,
     get_device_identifier,
-    get_refresh_delay_after_set,
+    property_registers,
 )
 from .coordinator import KospelDataUpdateCoordinator
+from .transaction import RegisterTransaction
 
-from kospel_cmi import KospelError
 from kospel_cmi.registers.enums import HeaterMode, HeatingStatus
 from kospel_cmi.controller.device import EkcoM3
 
@@ -75,6 +77,12 @@ class KospelClimateEntity(
         HeaterMode.PARTY.value,
         HeaterMode.VACATION.value,
     ]
+    _attr_min_temp = MANUAL_TEMP_MIN
+    _attr_max_temp = MANUAL_TEMP_MAX
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
+    _registers = property_registers(
+        "heater_mode", "room_temperature", "room_setpoint", "co_heating_status"
+    )
 
     def __init__(self, coordinator: KospelDataUpdateCoordinator) -> None:
         """Initialize the climate entity."""
@@ -149,8 +157,14 @@ class KospelClimateEntity(
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.communication_ok
+        """Return if the entity's registers are fresh."""
+        return self.coordinator.registers_available(self._registers)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the age of the entity's registers in seconds."""
+        age = self.coordinator.data_age(self._registers)
+        return {ATTR_DATA_AGE: round(age)} if age is not None else {}
 
     async def async_turn_on(self) -> None:
         """Turn the heater on using automatic (winter) heating.
@@ -173,8 +187,6 @@ class KospelClimateEntity(
                 only the mode is changed without a preset).
         """
         _LOGGER.debug("Setting HVAC mode to %s", hvac_mode)
-        controller: EkcoM3 = self.coordinator.data
-
         if hvac_mode == HVACMode.OFF:
             mode = HeaterMode.OFF
         elif hvac_mode == HVACMode.HEAT:
@@ -184,14 +196,12 @@ class KospelClimateEntity(
         else:
             raise HomeAssistantError(f"Unsupported HVAC mode: {hvac_mode}")
 
+        transaction = self.coordinator.transaction()
         try:
-            await controller.set_heater_mode(mode)
-        except KospelError as err:
-            _LOGGER.error("Failed to set heater mode: %s", err)
+            transaction.set_heater_mode(mode)
+        except ValueError as err:
             raise HomeAssistantError(f"Failed to set heater mode: {err}") from err
-        self.async_write_ha_state()
-        await asyncio.sleep(get_refresh_delay_after_set(self.coordinator.entry))
-        await self.coordinator.async_request_refresh()
+        await self._async_commit(transaction, "heater mode")
 
     async def async_set_temperature(self, **kwargs: Unpack[_ClimateSetTemperatureKwargs]) -> None:
         """Set the manual heating target temperature.
@@ -205,19 +215,16 @@ class KospelClimateEntity(
                 "Target temperature can only be set in Heat (manual) mode. "
                 "Switch HVAC mode to Heat first."
             )
-        controller: EkcoM3 = self.coordinator.data
         temperature = kwargs.get("temperature")
         if temperature is not None:
+            transaction = self.coordinator.transaction()
             try:
-                await controller.set_manual_heating(temperature)
-            except KospelError as err:
-                _LOGGER.error("Failed to set manual heating: %s", err)
+                transaction.set_manual_heating(temperature)
+            except ValueError as err:
                 raise HomeAssistantError(
                     f"Failed to set manual heating: {err}"
                 ) from err
-            self.async_write_ha_state()
-            await asyncio.sleep(get_refresh_delay_after_set(self.coordinator.entry))
-            await self.coordinator.async_request_refresh()
+            await self._async_commit(transaction, "manual heating")
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the automatic program (winter, summer, party, vacation).
@@ -235,14 +242,31 @@ class KospelClimateEntity(
         if preset_mode not in self._attr_preset_modes:
             raise HomeAssistantError(f"Unsupported preset mode: {preset_mode}")
 
-        controller: EkcoM3 = self.coordinator.data
+        transaction = self.coordinator.transaction()
         try:
-            await controller.set_heater_mode(HeaterMode(preset_mode.lower()))
-        except KospelError as err:
-            _LOGGER.error("Failed to set preset mode: %s", err)
+            transaction.set_heater_mode(HeaterMode(preset_mode.lower()))
+        except ValueError as err:
             raise HomeAssistantError(f"Failed to set preset mode: {err}") from err
+        await self._async_commit(transaction, "preset mode")
+
+    async def _async_commit(self, transaction: RegisterTransaction, what: str) -> None:
+        """Write ``transaction`` to the heater and refresh coordinator data.
+
+        Nothing is written or refreshed when the heater already holds every
+        planned value.
+
+        Raises:
+            HomeAssistantError: If any planned register did not reach the device
+                (the entity then shows what the device holds).
+        """
+        result = await self.coordinator.async_commit(transaction)
+        if not result.writes:
+            return
         self.async_write_ha_state()
-        await asyncio.sleep(get_refresh_delay_after_set(self.coordinator.entry))
+        if not result.complete:
+            _LOGGER.error("Failed to set %s: %s", what, result)
+            raise HomeAssistantError(f"Failed to set {what}: {result}")
+        self.coordinator.async_boost_polling()
         await self.coordinator.async_request_refresh()
 
     def _handle_coordinator_update(self) -> None:
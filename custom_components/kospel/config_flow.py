@@ -2,8 +2,12 @@
 
 import asyncio
 import logging
-from ipaddress import ip_interface
+import time
+from collections import OrderedDict
+from pathlib import Path
+from ipaddress import IPv4Address, IPv4Network, ip_address, ip_interface
 from ipaddress import ip_network
+from collections.abc import Callable, Iterator
 from typing import Any
 
 import aiohttp
@@ -13,36 +17,274 @@ from homeassistant import config_entries
 from homeassistant.components import network
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import aiohttp_client
 
-from kospel_cmi import discover_devices, probe_device
+from kospel_cmi import probe_device
 
 from .const import (
     DOMAIN,
     CONF_BACKEND_TYPE,
+    CONF_CAPTURE_FILE,
+    CONF_CAPTURE_TRAFFIC,
     CONF_HEATER_IP,
+    CONF_HEDGED_READS,
     CONF_DEVICE_ID,
     CONF_REFRESH_DELAY_AFTER_SET,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_REPLAY_SPEED,
+    CONF_ROLLING_STATISTICS,
     CONF_SERIAL_NUMBER,
+    CONF_STATE_WRITE_INTERVAL,
     CONF_SIMULATION_MODE,
+    CONF_TIME_MULTIPLIER,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
     DEFAULT_REFRESH_DELAY_AFTER_SET,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_STATE_WRITE_INTERVAL,
+    DEFAULT_TIME_MULTIPLIER,
     KOSPEL_MAC_PREFIXES,
     BACKEND_TYPE_HTTP,
+    BACKEND_TYPE_BINARY,
+    BACKEND_TYPE_REPLAY,
+    BACKEND_TYPE_SIMULATION,
     BACKEND_TYPE_YAML,
     REFRESH_DELAY_MAX,
     REFRESH_DELAY_MIN,
+    REPLAY_SPEED_MAX,
+    STATE_WRITE_INTERVAL_MAX,
+    TIME_MULTIPLIER_MAX,
+    TIME_MULTIPLIER_MIN,
+    UPDATE_INTERVAL_LOWER_LIMIT,
+    UPDATE_INTERVAL_UPPER_LIMIT,
     make_unique_id,
 )
+from .discovery import async_get_discovery_cache
+from .recording import load_capture
 
 LOGGER = logging.getLogger(__name__)
 DISCOVERY_TIMEOUT_SECONDS = 90.0
 MAX_NETWORK_SCAN_HOSTS = 1024
 
+# Kernel neighbor (ARP) table; hosts listed here answered recently, so they are
+# probed before the blind subnet sweep.
+NEIGHBOR_TABLE_PATH = "/proc/net/arp"
+NEIGHBOR_PROBE_TIMEOUT_SECONDS = 1.5
+NEIGHBOR_PROBE_CONCURRENCY = 20
+SUBNET_PROBE_TIMEOUT_SECONDS = 3.0
+SUBNET_PROBE_CONCURRENCY = 20
+
+# DHCP candidate registry: hosts expire after the TTL, the oldest are evicted
+# above the size bound. Failed probes are reused only briefly, since a module
+# that just took a lease may not serve HTTP yet.
+DHCP_CANDIDATE_TTL_SECONDS = 3600.0
+DHCP_CANDIDATE_MAX_HOSTS = 64
+DHCP_PROBE_FAILURE_TTL_SECONDS = 5.0
+DHCP_PROBE_CONCURRENCY = 8
+
+# Successful probes from any path (scan, DHCP, manual validation) are reused
+# for this long, so validation and entry creation skip redundant round trips.
+PROBE_RESULT_FRESH_SECONDS = 30.0
+
+# Pseudo option on the device list while a scan is still running.
+KEEP_SCANNING_OPTION = "keep_scanning"
+
 
 class CannotConnect(Exception):
     """Raised when connection to heater fails."""
 
 
-_DHCP_CANDIDATE_HOSTS: set[str] = set()
+class _DiscoveryProgress:
+    """Running state of one discovery scan, shared with the progress step.
+
+    Devices are recorded as soon as a probe confirms them, so results survive a
+    scan that is cancelled or hits ``DISCOVERY_TIMEOUT_SECONDS``.
+    """
+
+    def __init__(self, on_update: Callable[[], None] | None = None) -> None:
+        """Initialize empty progress; ``on_update`` runs after each change."""
+        self.devices: list[tuple[Any, int]] = []
+        self.total_hosts = 0
+        self.probed_hosts = 0
+        self.finished = False
+        self.updated = asyncio.Event()
+        self._on_update = on_update
+        self._seen: set[tuple[str, int]] = set()
+
+    @property
+    def fraction(self) -> float:
+        """Share of scheduled hosts already probed (0.0 to 1.0)."""
+        if self.finished:
+            return 1.0
+        if self.total_hosts <= 0:
+            return 0.0
+        return min(1.0, self.probed_hosts / self.total_hosts)
+
+    def add_hosts(self, count: int) -> None:
+        """Schedule ``count`` more hosts for probing."""
+        self.total_hosts += count
+
+    def host_probed(self, info: Any | None) -> None:
+        """Record one finished probe and any devices it confirmed."""
+        self.probed_hosts += 1
+        if info is not None:
+            self.add_devices(_expand_device_ids([info]))
+        elif self._on_update is not None:
+            self._on_update()
+
+    def add_devices(self, devices: list[tuple[Any, int]]) -> None:
+        """Record confirmed (info, device_id) candidates, ignoring duplicates."""
+        added = False
+        for info, device_id in devices:
+            key = (str(info.serial_number), device_id)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self.devices.append((info, device_id))
+            added = True
+        if added:
+            self.updated.set()
+        if self._on_update is not None:
+            self._on_update()
+
+    def finish(self) -> None:
+        """Mark the scan as finished (completed, failed or timed out)."""
+        self.finished = True
+        self.updated.set()
+        if self._on_update is not None:
+            self._on_update()
+
+
+class _DhcpCandidateRegistry:
+    """Hosts announced by DHCP as Kospel candidates, with probe deduplication.
+
+    Behaves like a set of hosts (``add``, ``update``, ``clear``, membership,
+    iteration) whose entries expire after ``ttl_seconds`` and are evicted
+    oldest-first above ``max_hosts``. Probes go through ``async_probe``:
+    concurrent probes of one host share a single request, results are cached
+    for a short time and at most ``concurrency`` probes run at once. Shared
+    probes use Home Assistant's client session, which outlives any caller.
+
+    The registry also holds the probe results of scans and manual validation
+    (``record``), so every setup path reads one cache (``get_fresh``).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DHCP_CANDIDATE_TTL_SECONDS,
+        max_hosts: int = DHCP_CANDIDATE_MAX_HOSTS,
+        concurrency: int = DHCP_PROBE_CONCURRENCY,
+    ) -> None:
+        """Initialize an empty registry."""
+        self._ttl_seconds = ttl_seconds
+        self._max_hosts = max_hosts
+        self._concurrency = concurrency
+        # host -> last seen (monotonic), least recently seen first.
+        self._hosts: OrderedDict[str, float] = OrderedDict()
+        # host -> (expires_at, KospelDeviceInfo or None)
+        self._results: dict[str, tuple[float, Any | None]] = {}
+        self._inflight: dict[str, asyncio.Task[Any | None]] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def add(self, host: str) -> None:
+        """Record (or refresh) a candidate host."""
+        self._hosts[host] = time.monotonic()
+        self._hosts.move_to_end(host)
+        self._evict()
+
+    def update(self, hosts: Any) -> None:
+        """Record several candidate hosts."""
+        for host in hosts:
+            self.add(host)
+
+    def clear(self) -> None:
+        """Forget all candidates and cached probe results."""
+        self._hosts.clear()
+        self._results.clear()
+        self._inflight.clear()
+        self._semaphore = None
+
+    def __contains__(self, host: object) -> bool:
+        self._evict()
+        return host in self._hosts
+
+    def __len__(self) -> int:
+        self._evict()
+        return len(self._hosts)
+
+    def __iter__(self) -> Iterator[str]:
+        self._evict()
+        return iter(list(self._hosts))
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def record(self, host: str, info: Any | None) -> None:
+        """Cache a probe result of ``host``; failures (None) only briefly."""
+        now = time.monotonic()
+        for expired in [
+            cached
+            for cached, (expires_at, _) in self._results.items()
+            if expires_at <= now
+        ]:
+            del self._results[expired]
+        ttl = (
+            PROBE_RESULT_FRESH_SECONDS
+            if info is not None
+            else DHCP_PROBE_FAILURE_TTL_SECONDS
+        )
+        self._results[host] = (now + ttl, info)
+
+    def get_fresh(self, host: str) -> Any | None:
+        """Return a successful probe of ``host`` that is still fresh."""
+        cached = self._results.get(host)
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        return cached[1]
+
+    def _evict(self) -> None:
+        """Drop expired hosts, then the oldest ones above the size bound."""
+        cutoff = time.monotonic() - self._ttl_seconds
+        while self._hosts:
+            host, last_seen = next(iter(self._hosts.items()))
+            if last_seen >= cutoff and len(self._hosts) <= self._max_hosts:
+                break
+            del self._hosts[host]
+            self._results.pop(host, None)
+
+    async def async_probe(self, hass: HomeAssistant, host: str) -> Any | None:
+        """Probe ``host`` once, sharing in-flight requests and fresh results."""
+        cached = self._results.get(host)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(host)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._async_probe_uncached(
+                    aiohttp_client.async_get_clientsession(hass), host
+                )
+            )
+            self._inflight[host] = task
+            task.add_done_callback(lambda _: self._inflight.pop(host, None))
+        return await asyncio.shield(task)
+
+    async def _async_probe_uncached(
+        self, session: aiohttp.ClientSession, host: str
+    ) -> Any | None:
+        """Run one bounded probe and cache its result."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        async with self._semaphore:
+            info = await probe_device(session, host)
+        self.record(host, info)
+        return info
+
+
+_DHCP_CANDIDATE_HOSTS = _DhcpCandidateRegistry()
+
 # NOTE:
 # Auto-discovery via DHCP/OUI is intentionally kept in code but hidden from
 # the user-facing flow. During field testing we observed MAC-prefix mismatch
@@ -50,6 +292,16 @@ _DHCP_CANDIDATE_HOSTS: set[str] = set()
 # Keep this logic for future re-enable once OUI matching is verified.
 
 
+async def _async_probe_host(
+    session: aiohttp.ClientSession, host: str, **kwargs: Any
+) -> Any | None:
+    """Probe ``host`` and cache a successful result in ``_DHCP_CANDIDATE_HOSTS``."""
+    info = await probe_device(session, host, **kwargs)
+    if info is not None:
+        _DHCP_CANDIDATE_HOSTS.record(host, info)
+    return info
+
+
 def _normalize_mac(mac: str | None) -> str | None:
     """Return lowercase hex-only MAC string or None for invalid values."""
     if not mac:
@@ -66,8 +318,156 @@ def _is_kospel_mac(mac: str | None) -> bool:
     return any(normalized.startswith(prefix) for prefix in KOSPEL_MAC_PREFIXES)
 
 
-async def _discover_by_kospel_mac(
+def _read_neighbor_table(path: str = NEIGHBOR_TABLE_PATH) -> list[tuple[str, str]]:
+    """Return (ip, mac) pairs of resolved neighbors from the kernel ARP table.
+
+    Blocking file read; call via the executor. Returns an empty list when the
+    table is unavailable (non-Linux hosts, restricted containers).
+    """
+    try:
+        with open(path, encoding="ascii") as arp_file:
+            lines = arp_file.read().splitlines()[1:]
+    except OSError as err:
+        LOGGER.debug("Neighbor table %s not readable: %s", path, err)
+        return []
+
+    neighbors: list[tuple[str, str]] = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 4:
+            continue
+        host, flags, mac = fields[0], fields[2], fields[3]
+        # Flags 0x0 marks an incomplete entry (no reply to ARP request).
+        if flags == "0x0" or _normalize_mac(mac) in (None, "000000000000"):
+            continue
+        neighbors.append((host, mac))
+    return neighbors
+
+
+async def _async_get_neighbor_table(hass: HomeAssistant) -> list[tuple[str, str]]:
+    """Read the kernel neighbor table without blocking the event loop."""
+    return await hass.async_add_executor_job(_read_neighbor_table)
+
+
+def _prioritize_neighbor_hosts(
+    neighbors: list[tuple[str, str]],
+    networks: list[IPv4Network],
+) -> tuple[list[str], list[str]]:
+    """Split live neighbors inside scanned networks into (kospel_mac, other) hosts.
+
+    Order of the neighbor table is preserved and duplicates are dropped.
+    """
+    kospel_hosts: list[str] = []
+    other_hosts: list[str] = []
+    seen: set[str] = set()
+    for host, mac in neighbors:
+        if host in seen:
+            continue
+        try:
+            address = ip_address(host)
+        except ValueError:
+            continue
+        if not isinstance(address, IPv4Address):
+            continue
+        if not any(address in network for network in networks):
+            continue
+        seen.add(host)
+        if _is_kospel_mac(mac):
+            kospel_hosts.append(host)
+        else:
+            other_hosts.append(host)
+    return kospel_hosts, other_hosts
+
+
+async def _probe_hosts(
     session: aiohttp.ClientSession,
+    hosts: list[str],
+    timeout: float = NEIGHBOR_PROBE_TIMEOUT_SECONDS,
+    concurrency_limit: int = NEIGHBOR_PROBE_CONCURRENCY,
+    progress: _DiscoveryProgress | None = None,
+) -> list[Any]:
+    """Probe a list of hosts with bounded concurrency; return confirmed devices.
+
+    Each result is reported to ``progress`` as soon as its probe finishes.
+    """
+    sem = asyncio.Semaphore(concurrency_limit)
+    if progress is not None:
+        progress.add_hosts(len(hosts))
+
+    async def _probe(host: str) -> Any:
+        async with sem:
+            info = await _async_probe_host(session, host, timeout=timeout)
+        if progress is not None:
+            progress.host_probed(info)
+        return info
+
+    results = await asyncio.gather(
+        *[_probe(host) for host in hosts], return_exceptions=True
+    )
+    return [
+        result
+        for result in results
+        if result is not None and not isinstance(result, Exception)
+    ]
+
+
+def _expand_device_ids(devices: list[Any]) -> list[tuple[Any, int]]:
+    """Expand module probe results into (info, device_id) candidates."""
+    return [(info, device_id) for info in devices for device_id in info.device_ids]
+
+
+async def _async_remember_devices(hass: HomeAssistant, devices: list[Any]) -> None:
+    """Record confirmed modules in the persistent discovery cache."""
+    cache = await async_get_discovery_cache(hass)
+    for info in devices:
+        cache.async_record(info)
+
+
+async def _async_probe_cached_modules(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    progress: _DiscoveryProgress | None = None,
+) -> list[Any]:
+    """Validate cached modules with a single probe per host.
+
+    Modules whose device IDs are all configured already are skipped, so adding
+    a second heater is not short-circuited by the first one. A cached host that
+    now answers with another serial number is forgotten.
+    """
+    cache = await async_get_discovery_cache(hass)
+    configured = {
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    candidates = [
+        module
+        for module in cache.modules()
+        if not all(
+            make_unique_id(module.serial_number, device_id) in configured
+            for device_id in module.device_ids
+        )
+    ]
+    if not candidates:
+        return []
+
+    LOGGER.debug(
+        "Network scan validating %s cached hosts first",
+        len(candidates),
+    )
+    devices = await _probe_hosts(
+        session, [module.host for module in candidates], progress=progress
+    )
+    confirmed_serials = {str(info.serial_number) for info in devices}
+    for module in candidates:
+        if module.serial_number not in confirmed_serials and any(
+            info.host == module.host for info in devices
+        ):
+            cache.async_forget(module.serial_number)
+    return devices
+
+
+async def _discover_by_kospel_mac(
+    hass: HomeAssistant,
+    progress: _DiscoveryProgress | None = None,
 ) -> list[tuple[Any, int]]:
     """Discover devices from DHCP auto-discovered Kospel candidates.
 
@@ -78,12 +478,19 @@ async def _discover_by_kospel_mac(
         LOGGER.debug("Auto discovery has no DHCP candidate hosts")
         return []
 
-    LOGGER.debug(
-        "Auto discovery probing DHCP candidates: %s",
-        sorted(_DHCP_CANDIDATE_HOSTS),
-    )
+    hosts = sorted(_DHCP_CANDIDATE_HOSTS)
+    LOGGER.debug("Auto discovery probing DHCP candidates: %s", hosts)
+    if progress is not None:
+        progress.add_hosts(len(hosts))
+
+    async def _probe(host: str) -> Any:
+        info = await _DHCP_CANDIDATE_HOSTS.async_probe(hass, host)
+        if progress is not None:
+            progress.host_probed(info)
+        return info
+
     probe_results = await asyncio.gather(
-        *[probe_device(session, host) for host in sorted(_DHCP_CANDIDATE_HOSTS)],
+        *[_probe(host) for host in hosts],
         return_exceptions=True,
     )
 
@@ -103,7 +510,9 @@ async def validate_http_input(
     """Validate HTTP backend input (heater IP and device ID).
 
     Probes the device via probe_device to verify connectivity and that
-    the device_id exists on the module. Returns title and serial_number on success.
+    the device_id exists on the module, unless a fresh probe result of the
+    same host listing that device_id is cached. Returns title and
+    serial_number on success.
 
     Returns:
         Dict with "title" and optionally "serial_number" for the config entry.
@@ -114,13 +523,16 @@ async def validate_http_input(
     heater_ip = data[CONF_HEATER_IP].strip()
     device_id = data[CONF_DEVICE_ID]
 
-    async with aiohttp.ClientSession() as session:
-        info = await probe_device(session, heater_ip)
+    info = _DHCP_CANDIDATE_HOSTS.get_fresh(heater_ip)
+    if info is None or device_id not in info.device_ids:
+        async with aiohttp.ClientSession() as session:
+            info = await _async_probe_host(session, heater_ip)
     if info is None:
         raise CannotConnect()
     if device_id not in info.device_ids:
         raise CannotConnect()
 
+    await _async_remember_devices(hass, [info])
     serial = info.serial_number
     return {
         "title": f"Kospel Heater {heater_ip} (device {device_id})",
@@ -153,39 +565,82 @@ async def _get_subnets_to_scan(hass: HomeAssistant) -> list[str]:
 
 
 async def _discover_by_network_scan(
-    hass: HomeAssistant, session: aiohttp.ClientSession
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    progress: _DiscoveryProgress | None = None,
 ) -> list[tuple[Any, int]]:
-    """Discover devices by scanning all IPv4 subnets from network adapters."""
+    """Discover devices on all IPv4 subnets from network adapters.
+
+    Cached modules from earlier discoveries are validated first, then live
+    hosts from the kernel neighbor table (Kospel MAC prefixes before everything
+    else); discovery returns as soon as one of these tiers confirms a device.
+    The full subnet sweep is the fallback. Confirmed devices are streamed to
+    ``progress`` while the sweep runs.
+    """
     subnets = await _get_subnets_to_scan(hass)
     if not subnets:
         LOGGER.warning("Network scan has no enabled IPv4 subnets to scan")
         return []
 
-    discovered: list[tuple[Any, int]] = []
+    networks: list[IPv4Network] = []
     for subnet in subnets:
         try:
             network_obj = ip_network(subnet, strict=False)
-            host_count = max(0, int(network_obj.num_addresses) - 2)
         except ValueError:
             LOGGER.warning("Skipping invalid subnet from adapter list: %s", subnet)
             continue
+        if isinstance(network_obj, IPv4Network):
+            networks.append(network_obj)
+
+    devices = await _async_probe_cached_modules(hass, session, progress)
+    if devices:
+        discovered = _expand_device_ids(devices)
+        LOGGER.debug(
+            "Network scan found %s device candidates via discovery cache",
+            len(discovered),
+        )
+        return discovered
+
+    neighbors = await _async_get_neighbor_table(hass)
+    kospel_hosts, other_hosts = _prioritize_neighbor_hosts(neighbors, networks)
+    for tier, hosts in (("kospel_mac", kospel_hosts), ("neighbor", other_hosts)):
+        if not hosts:
+            continue
+        LOGGER.debug("Network scan probing %s %s hosts first", len(hosts), tier)
+        devices = await _probe_hosts(session, hosts, progress=progress)
+        if devices:
+            discovered = _expand_device_ids(devices)
+            LOGGER.debug(
+                "Network scan found %s device candidates via %s tier",
+                len(discovered),
+                tier,
+            )
+            return discovered
 
+    sweep_networks: list[IPv4Network] = []
+    for network_obj in networks:
+        host_count = max(0, int(network_obj.num_addresses) - 2)
         if host_count > MAX_NETWORK_SCAN_HOSTS:
             LOGGER.warning(
                 "Skipping large subnet %s (%s hosts > limit %s)",
-                subnet,
+                network_obj,
                 host_count,
                 MAX_NETWORK_SCAN_HOSTS,
             )
             continue
+        sweep_networks.append(network_obj)
 
-        LOGGER.info("Network scan probing subnet=%s", subnet)
-        devices = await discover_devices(
-            session, subnet, timeout=3.0, concurrency_limit=20
+    discovered: list[tuple[Any, int]] = []
+    for network_obj in sweep_networks:
+        LOGGER.info("Network scan probing subnet=%s", network_obj)
+        devices = await _probe_hosts(
+            session,
+            [str(host) for host in network_obj.hosts()],
+            timeout=SUBNET_PROBE_TIMEOUT_SECONDS,
+            concurrency_limit=SUBNET_PROBE_CONCURRENCY,
+            progress=progress,
         )
-        for info in devices:
-            for device_id in info.device_ids:
-                discovered.append((info, device_id))
+        discovered.extend(_expand_device_ids(devices))
     LOGGER.debug("Network scan found %s device candidates", len(discovered))
     return discovered
 
@@ -201,7 +656,11 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             tuple[Any, int]
         ] = []  # (KospelDeviceInfo, device_id)
         self._discovery_method: str = "auto_discovery"
+        # Progress-step task: finishes when the scan ends or finds new devices.
         self._discover_task: asyncio.Task[None] | None = None
+        self._scan_task: asyncio.Task[None] | None = None
+        self._discovery = _DiscoveryProgress()
+        self._shown_device_count = 0
 
     async def async_step_dhcp(self, discovery_info: dict[str, Any]) -> FlowResult:
         """Handle discovery from Home Assistant DHCP integration.
@@ -228,11 +687,11 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             len(_DHCP_CANDIDATE_HOSTS),
         )
 
-        async with aiohttp.ClientSession() as session:
-            info = await probe_device(session, host)
+        info = await _DHCP_CANDIDATE_HOSTS.async_probe(self.hass, host)
         if info is None or not info.device_ids:
             LOGGER.warning("DHCP candidate probe failed for host=%s", host)
             return self.async_abort(reason="cannot_connect")
+        await _async_remember_devices(self.hass, [info])
 
         if len(info.device_ids) == 1:
             device_id = info.device_ids[0]
@@ -277,6 +736,9 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                                 "network_scan": "Network scan",
                                 "manual": "Manual entry",
                                 "yaml": "YAML (for development only)",
+                                "binary": "Binary file (for development only)",
+                                "simulation": "Simulated heater (for development only)",
+                                "replay": "Replay a capture (for development only)",
                             }
                         )
                     }
@@ -291,9 +753,87 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     CONF_BACKEND_TYPE: BACKEND_TYPE_YAML,
                 },
             )
+        if mode == "simulation":
+            return await self.async_step_simulation()
+        if mode == "replay":
+            return await self.async_step_replay()
+        if mode == "binary":
+            return self.async_create_entry(
+                title="Kospel Heater (binary / development)",
+                data={
+                    CONF_BACKEND_TYPE: BACKEND_TYPE_BINARY,
+                },
+            )
 
         return await self._async_continue_http_method(mode)
 
+    async def async_step_simulation(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Create a simulated heater entry with the chosen time multiplier."""
+        if user_input is None:
+            return self.async_show_form(
+                step_id="simulation",
+                data_schema=vol.Schema(
+                    {
+                        vol.Required(
+                            CONF_TIME_MULTIPLIER, default=DEFAULT_TIME_MULTIPLIER
+                        ): vol.All(
+                            vol.Coerce(float),
+                            vol.Range(min=TIME_MULTIPLIER_MIN, max=TIME_MULTIPLIER_MAX),
+                        ),
+                    }
+                ),
+            )
+
+        return self.async_create_entry(
+            title="Kospel Heater (simulation / development)",
+            data={
+                CONF_BACKEND_TYPE: BACKEND_TYPE_SIMULATION,
+                CONF_TIME_MULTIPLIER: user_input[CONF_TIME_MULTIPLIER],
+            },
+        )
+
+    async def async_step_replay(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Create an entry replaying a capture log recorded in capture mode."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            capture_file = user_input[CONF_CAPTURE_FILE].strip()
+            try:
+                batches = await self.hass.async_add_executor_job(
+                    load_capture, Path(capture_file)
+                )
+            except (OSError, ValueError, KeyError) as err:
+                LOGGER.debug("Invalid capture %s: %s", capture_file, err)
+                batches = []
+            if batches:
+                return self.async_create_entry(
+                    title=f"Kospel Heater (replay {Path(capture_file).name})",
+                    data={
+                        CONF_BACKEND_TYPE: BACKEND_TYPE_REPLAY,
+                        CONF_CAPTURE_FILE: capture_file,
+                        CONF_REPLAY_SPEED: user_input[CONF_REPLAY_SPEED],
+                    },
+                )
+            errors["base"] = "invalid_capture"
+
+        return self.async_show_form(
+            step_id="replay",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CAPTURE_FILE): str,
+                    vol.Required(
+                        CONF_REPLAY_SPEED, default=DEFAULT_REPLAY_SPEED
+                    ): vol.All(
+                        vol.Coerce(float), vol.Range(min=0.0, max=REPLAY_SPEED_MAX)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
     async def _async_continue_http_method(self, method: str) -> FlowResult:
         """Continue flow for selected HTTP method."""
         # Keep auto_discovery implementation for future use, but hide it from UI
@@ -336,50 +876,88 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         return await self._async_continue_http_method(user_input["http_method"])
 
+    @callback
+    def _async_discovery_progressed(self) -> None:
+        """Push scan progress to the frontend progress bar."""
+        self.async_update_progress(self._discovery.fraction)
+
     async def _async_run_discovery(self) -> None:
-        """Run discovery task and store results for discover_result step."""
+        """Run discovery, streaming confirmed devices into ``_discovered_devices``.
+
+        Devices confirmed before a timeout or failure are kept and offered.
+        """
+        progress = self._discovery
         try:
             LOGGER.info("Starting discovery run via method=%s", self._discovery_method)
             all_devices: list[tuple[Any, int]] = []
 
-            async with aiohttp.ClientSession() as session:
-                if self._discovery_method == "network_scan":
-                    all_devices = await asyncio.wait_for(
-                        _discover_by_network_scan(self.hass, session),
-                        timeout=DISCOVERY_TIMEOUT_SECONDS,
-                    )
-                else:
+            if self._discovery_method == "network_scan":
+                async with aiohttp.ClientSession() as session:
                     all_devices = await asyncio.wait_for(
-                        _discover_by_kospel_mac(session),
+                        _discover_by_network_scan(self.hass, session, progress),
                         timeout=DISCOVERY_TIMEOUT_SECONDS,
                     )
+            else:
+                all_devices = await asyncio.wait_for(
+                    _discover_by_kospel_mac(self.hass, progress),
+                    timeout=DISCOVERY_TIMEOUT_SECONDS,
+                )
 
-            self._discovered_devices = all_devices
+            progress.add_devices(all_devices)
             LOGGER.debug(
                 "Discovery completed via method=%s found_devices=%s",
                 self._discovery_method,
-                len(self._discovered_devices),
+                len(progress.devices),
             )
         except asyncio.TimeoutError:
             LOGGER.warning(
-                "Discovery timed out after %s seconds via method=%s",
+                "Discovery timed out after %s seconds via method=%s "
+                "(keeping %s devices found so far)",
                 DISCOVERY_TIMEOUT_SECONDS,
                 self._discovery_method,
+                len(progress.devices),
             )
-            self._discovered_devices = []
         except Exception:
             LOGGER.exception("Discovery failed via method=%s", self._discovery_method)
-            self._discovered_devices = []
+        finally:
+            self._discovered_devices = list(progress.devices)
+            progress.finish()
+        if progress.devices:
+            await _async_remember_devices(
+                self.hass, [info for info, _ in progress.devices]
+            )
+
+    async def _async_wait_for_discovery_update(self) -> None:
+        """Return once the scan finishes or finds devices not yet shown."""
+        progress = self._discovery
+        while not progress.finished and (
+            len(progress.devices) <= self._shown_device_count
+        ):
+            progress.updated.clear()
+            await progress.updated.wait()
+
+    def _async_cancel_scan(self) -> None:
+        """Stop a running scan (user picked a device or left the flow)."""
+        if self._scan_task is not None and not self._scan_task.done():
+            LOGGER.debug("Cancelling running discovery scan")
+            self._scan_task.cancel()
+        self._scan_task = None
+
+    @callback
+    def async_remove(self) -> None:
+        """Cancel background discovery when the flow is aborted or closed."""
+        self._async_cancel_scan()
 
     async def async_step_discover(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Scan network for Kospel devices."""
+        """Scan network for Kospel devices, showing found devices as they appear."""
         LOGGER.info(
             "Discovery UI step entered (method=%s)",
             self._discovery_method,
         )
         if user_input and user_input.get("action") == "manual":
+            self._async_cancel_scan()
             return self.async_show_form(
                 step_id="http",
                 data_schema=vol.Schema(
@@ -389,12 +967,22 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     }
                 ),
             )
+        if user_input and user_input.get("action") == "retry":
+            self._async_cancel_scan()
+
+        if self._discover_task is not None:
+            if not self._discover_task.done():
+                LOGGER.debug("Reusing running discovery progress task")
+                return self._async_show_discover_progress()
+            LOGGER.debug("Discovery progress task is done, moving to result step")
+            self._discover_task = None
+            return self.async_show_progress_done(next_step_id="discover_result")
 
         # Avoid progress-step edge cases when auto discovery has no DHCP candidates.
         if (
             self._discovery_method == "auto_discovery"
             and not _DHCP_CANDIDATE_HOSTS
-            and self._discover_task is None
+            and self._scan_task is None
         ):
             LOGGER.info(
                 "Auto discovery has no DHCP candidates, showing result directly"
@@ -402,29 +990,41 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             self._discovered_devices = []
             return await self.async_step_discover_result()
 
-        if self._discover_task is None:
-            LOGGER.debug("Creating new discovery progress task")
-            self._discover_task = self.hass.async_create_task(
-                self._async_run_discovery()
-            )
-        elif not self._discover_task.done():
-            LOGGER.debug("Reusing running discovery progress task")
-        else:
-            LOGGER.debug("Discovery progress task is done, moving to result step")
-            self._discover_task = None
-            return self.async_show_progress_done(next_step_id="discover_result")
+        if self._scan_task is None:
+            LOGGER.debug("Creating new discovery scan task")
+            self._discovery = _DiscoveryProgress(self._async_discovery_progressed)
+            self._discovered_devices = []
+            self._shown_device_count = 0
+            self._scan_task = self.hass.async_create_task(self._async_run_discovery())
+
+        self._discover_task = self.hass.async_create_task(
+            self._async_wait_for_discovery_update()
+        )
+        return self._async_show_discover_progress()
+
+    def _async_show_discover_progress(self) -> FlowResult:
+        """Show the scan progress step with a running count of found devices."""
         return self.async_show_progress(
             step_id="discover",
             progress_action="discover",
             progress_task=self._discover_task,
+            description_placeholders={"found": str(len(self._discovery.devices))},
         )
 
     async def async_step_discover_result(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle discovery result: show device list or retry form."""
+        """Handle discovery result: show device list or retry form.
+
+        While the scan is still running the list also offers to keep scanning,
+        so the user can stop early once their heater appears.
+        """
         # Clear cached task only after progress step transitions to result.
         self._discover_task = None
+        scan_running = self._scan_task is not None and not self._scan_task.done()
+        if scan_running:
+            self._discovered_devices = list(self._discovery.devices)
+        self._shown_device_count = len(self._discovered_devices)
         if not self._discovered_devices:
             LOGGER.debug(
                 "Discovery result empty for method=%s",
@@ -455,6 +1055,8 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 f"{info.host} — {info.serial_number} (dev {device_id}, {model})"
             )
         LOGGER.debug("Discovery result offers %s selectable devices", len(options))
+        if scan_running:
+            options[KEEP_SCANNING_OPTION] = "Keep scanning for more devices…"
 
         return self.async_show_form(
             step_id="select_device",
@@ -473,6 +1075,10 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="unknown")
 
         selected_unique_id = user_input["device"]
+        if selected_unique_id == KEEP_SCANNING_OPTION:
+            return await self.async_step_discover()
+
+        self._async_cancel_scan()
         info = None
         device_id = None
         for dev_info, dev_id in self._discovered_devices:
@@ -487,6 +1093,22 @@ class KospelConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(selected_unique_id)
         self._abort_if_unique_id_configured()
 
+        if _DHCP_CANDIDATE_HOSTS.get_fresh(info.host) is None:
+            # Discovery result is stale: confirm once before creating the entry.
+            async with aiohttp.ClientSession() as session:
+                confirmed = await _async_probe_host(session, info.host)
+            if (
+                confirmed is None
+                or str(confirmed.serial_number) != str(info.serial_number)
+                or device_id not in confirmed.device_ids
+            ):
+                LOGGER.warning(
+                    "Selected device %s no longer answers at host=%s",
+                    selected_unique_id,
+                    info.host,
+                )
+                return self.async_abort(reason="cannot_connect")
+
         heater_ip = info.host.split(":")[0] if ":" in info.host else info.host
 
         return self.async_create_entry(
@@ -604,23 +1226,81 @@ class KospelOptionsFlowHandler(config_entries.OptionsFlowWithConfigEntry):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage integration options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input.get(
+                CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+            ) > user_input.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL):
+                errors["base"] = "invalid_update_interval_bounds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         default_delay = self.options.get(
             CONF_REFRESH_DELAY_AFTER_SET, DEFAULT_REFRESH_DELAY_AFTER_SET
         )
+        schema: dict[Any, Any] = {
+            vol.Required(
+                CONF_REFRESH_DELAY_AFTER_SET,
+                default=default_delay,
+            ): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=REFRESH_DELAY_MIN, max=REFRESH_DELAY_MAX),
+            ),
+            vol.Required(
+                CONF_MIN_UPDATE_INTERVAL,
+                default=self.options.get(
+                    CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                ),
+            ): vol.All(
+                vol.Coerce(float),
+                vol.Range(
+                    min=UPDATE_INTERVAL_LOWER_LIMIT, max=UPDATE_INTERVAL_UPPER_LIMIT
+                ),
+            ),
+            vol.Required(
+                CONF_MAX_UPDATE_INTERVAL,
+                default=self.options.get(
+                    CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                ),
+            ): vol.All(
+                vol.Coerce(float),
+                vol.Range(
+                    min=UPDATE_INTERVAL_LOWER_LIMIT, max=UPDATE_INTERVAL_UPPER_LIMIT
+                ),
+            ),
+            vol.Required(
+                CONF_ROLLING_STATISTICS,
+                default=self.options.get(CONF_ROLLING_STATISTICS, False),
+            ): bool,
+            vol.Required(
+                CONF_LONG_TERM_STATISTICS,
+                default=self.options.get(CONF_LONG_TERM_STATISTICS, False),
+            ): bool,
+            vol.Required(
+                CONF_STATE_WRITE_INTERVAL,
+                default=self.options.get(
+                    CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL
+                ),
+            ): vol.All(
+                vol.Coerce(float), vol.Range(min=0.0, max=STATE_WRITE_INTERVAL_MAX)
+            ),
+        }
+        backend_type = self.config_entry.data.get(CONF_BACKEND_TYPE, BACKEND_TYPE_HTTP)
+        if backend_type == BACKEND_TYPE_HTTP:
+            schema[
+                vol.Required(
+                    CONF_HEDGED_READS,
+                    default=self.options.get(CONF_HEDGED_READS, False),
+                )
+            ] = bool
+            schema[
+                vol.Required(
+                    CONF_CAPTURE_TRAFFIC,
+                    default=self.options.get(CONF_CAPTURE_TRAFFIC, False),
+                )
+            ] = bool
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        CONF_REFRESH_DELAY_AFTER_SET,
-                        default=default_delay,
-                    ): vol.All(
-                        vol.Coerce(float),
-                        vol.Range(min=REFRESH_DELAY_MIN, max=REFRESH_DELAY_MAX),
-                    ),
-                }
-            ),
+            data_schema=vol.Schema(schema),
+            errors=errors,
         )
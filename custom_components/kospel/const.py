@@ -26,6 +26,25 @@ KOSPEL_MAC_PREFIXES = ("70b3d5249",)
 # Backend type values
 BACKEND_TYPE_HTTP = "http"
 BACKEND_TYPE_YAML = "yaml"
+BACKEND_TYPE_BINARY = "binary"
+BACKEND_TYPE_SIMULATION = "simulation"
+BACKEND_TYPE_REPLAY = "replay"
+
+# Capture (record) mode for HTTP entries; logs go to <config>/kospel_captures.
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CAPTURE_DIRECTORY = "kospel_captures"
+
+# Replay backend: capture log path and replay speed (0 = one batch per poll).
+CONF_CAPTURE_FILE = "capture_file"
+CONF_REPLAY_SPEED = "replay_speed"
+DEFAULT_REPLAY_SPEED = 1.0
+REPLAY_SPEED_MAX = 10000.0
+
+# Simulation backend: simulated seconds per wall-clock second.
+CONF_TIME_MULTIPLIER = "time_multiplier"
+DEFAULT_TIME_MULTIPLIER = 60.0
+TIME_MULTIPLIER_MIN = 1.0
+TIME_MULTIPLIER_MAX = 10000.0
 
 # Relative path for YAML state file inside the integration directory
 YAML_STATE_FILE_RELATIVE = "data/state.yaml"
@@ -38,31 +57,138 @@ COMMUNICATION_FAILURE_THRESHOLD = max(
     1, int(math.ceil(90.0 / SCAN_INTERVAL.total_seconds()))
 )
 
+# IP-change recovery: consecutive connection errors before a targeted rediscovery,
+# max hosts probed per attempt, and minimum time between attempts per heater.
+IP_RECOVERY_FAILURE_THRESHOLD = 3
+IP_RECOVERY_PROBE_BUDGET = 64
+IP_RECOVERY_COOLDOWN = timedelta(minutes=5)
+
 # Delay before coordinator refresh after set operations (device needs time to persist).
 CONF_REFRESH_DELAY_AFTER_SET = "refresh_delay_after_set"
 DEFAULT_REFRESH_DELAY_AFTER_SET = 1.0  # seconds
 REFRESH_DELAY_MIN = 0.5
 REFRESH_DELAY_MAX = 5.0
 
+# Optional rolling-window min/max/mean sensors (15 min, 1 h, 24 h).
+CONF_ROLLING_STATISTICS = "rolling_statistics"
+
+# Optional import of 5-minute aggregates as hourly long-term statistics.
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+# Minimum seconds between state writes of telemetry sensors (0 = every refresh).
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+DEFAULT_STATE_WRITE_INTERVAL = 0.0
+STATE_WRITE_INTERVAL_MAX = 3600.0
+
+# Adaptive polling: the interval follows the decoded state between these bounds
+# (fastest while CH or DHW heats, slowest when idle in off/summer mode), and
+# stays at the minimum for a while after writes and mode changes.
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+DEFAULT_MIN_UPDATE_INTERVAL = 5.0  # seconds
+DEFAULT_MAX_UPDATE_INTERVAL = 60.0  # seconds
+UPDATE_INTERVAL_LOWER_LIMIT = 2.0
+UPDATE_INTERVAL_UPPER_LIMIT = 600.0
+POLL_BOOST_DURATION = timedelta(minutes=2)
+
+# In-cycle retry of the coordinator read: attempts (incl. a hedged request)
+# and the deadline for all of them. Hedging sends a second request once the
+# first is slower than the module's p95 RTT (HTTP, optional).
+REFRESH_MAX_ATTEMPTS = 2
+REFRESH_DEADLINE = timedelta(seconds=10)
+CONF_HEDGED_READS = "hedged_reads"
+
+# Registers behind the EkcoM3 properties read by entities (the library does not
+# expose this); entity availability and ``data_age`` follow these registers.
+PROPERTY_REGISTERS: dict[str, tuple[str, ...]] = {
+    "heater_mode": ("0b55",),
+    "cwu_mode": ("0b30",),
+    "is_water_heater_enabled": ("0b55",),
+    "valve_position": ("0b51",),
+    "co_heating_status": ("0b55", "0b51", "0b46"),
+    "cwu_heating_status": ("0b55", "0b51", "0b46"),
+    "room_temperature_economy": ("0b68",),
+    "room_temperature_comfort": ("0b6a",),
+    "room_temperature_comfort_plus": ("0b6b",),
+    "room_temperature_comfort_minus": ("0b69",),
+    "pressure": ("0b4e",),
+    "water_current_temperature": ("0b4a",),
+    "room_temperature": ("0b4b",),
+    "supply_setpoint": ("0b2f",),
+    "room_setpoint": ("0b31",),
+    "power": ("0b46",),
+    "boiler_max_power_index": ("0b62",),
+    "boiler_max_power_kw": ("0b34",),
+}
+ATTR_DATA_AGE = "data_age"
+# Energy sensor attributes: sample intervals skipped by the integration.
+ATTR_GAP_COUNT = "gap_count"
+ATTR_GAP_SECONDS = "gap_seconds"
+# Registers older than this (or than COMMUNICATION_FAILURE_THRESHOLD polls at
+# the current interval, if longer) make their entities unavailable.
+REGISTER_STALE_AFTER = timedelta(seconds=90)
+
+# Burst polling (kospel.start_burst): default registers (power, water, room,
+# outside temperature), limits, entity state publish rate and read merging.
+BURST_DEFAULT_REGISTERS = ("0b46", "0b4a", "0b4b", "0b4c")
+BURST_DEFAULT_INTERVAL_SECONDS = 1.0
+BURST_INTERVAL_MIN_SECONDS = 1.0
+BURST_INTERVAL_MAX_SECONDS = 10.0
+BURST_DEFAULT_DURATION_MINUTES = 5
+BURST_DURATION_MAX_MINUTES = 60
+BURST_PUBLISH_INTERVAL = timedelta(seconds=5)
+BURST_SPAN_MAX_GAP = 8
+
+# Room preset temperature bounds (number entities, kospel.bulk_set).
+ROOM_PRESET_TEMP_MIN = 10.0
+ROOM_PRESET_TEMP_MAX = 25.0
+ROOM_PRESET_TEMP_STEP = 0.1
+
+# Manual heating target bounds (climate entity, kospel.bulk_set).
+MANUAL_TEMP_MIN = 7.0
+MANUAL_TEMP_MAX = 35.0
+
+# Bulk settings (kospel.bulk_set): heaters written at once overall and per CMI
+# module (its requests run one at a time anyway, see scheduler.py).
+BULK_SET_MAX_PARALLEL = 8
+BULK_SET_HOST_PARALLEL = 1
+
+# Event fired when a streaming anomaly (see anomaly.py) becomes active or clears.
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+
 # Simulation mode constants (deprecated; migration only)
 SIMULATION_MODE_ENV_VAR = "SIMULATION_MODE"
 
 
-def get_yaml_state_file_path(integration_dir: Optional[Path] = None) -> Path:
+def get_yaml_state_file_path(
+    integration_dir: Optional[Path] = None, entry_id: Optional[str] = None
+) -> Path:
     """Return the full path for the YAML backend state file.
 
-    State file is located in the integration directory under data/state.yaml.
+    State file is located in the integration directory under data/. Each entry
+    gets its own file (data/state_<entry_id>.yaml); without entry_id the legacy
+    shared data/state.yaml is returned.
     Used when backend_type is yaml (development / file-based mode).
 
     Args:
         integration_dir: Base directory of the integration. If None, not set.
+        entry_id: Config entry ID for a per-entry state file.
 
     Returns:
-        Path to state.yaml. Caller should pass Path(__file__).resolve().parent.
+        Path to the state file. Caller should pass Path(__file__).resolve().parent.
     """
     if integration_dir is None:
         integration_dir = Path(__file__).resolve().parent
-    return integration_dir / "data" / "state.yaml"
+    if entry_id is None:
+        return integration_dir / "data" / "state.yaml"
+    return integration_dir / "data" / f"state_{entry_id}.yaml"
+
+
+def get_binary_state_file_path(integration_dir: Path, entry_id: str) -> Path:
+    """Return the register image path for a binary (development) entry.
+
+    The write journal lives next to it with a ``.journal`` suffix.
+    """
+    return integration_dir / "data" / f"state_{entry_id}.bin"
 
 
 def make_unique_id(serial_number: str, device_id: int) -> str:
@@ -78,6 +204,14 @@ def make_unique_id(serial_number: str, device_id: int) -> str:
     return f"{serial_number}_{device_id}"
 
 
+def property_registers(*properties: str) -> tuple[str, ...]:
+    """Registers read by the given EkcoM3 properties (see ``PROPERTY_REGISTERS``)."""
+    registers = {
+        register for name in properties for register in PROPERTY_REGISTERS[name]
+    }
+    return tuple(sorted(registers))
+
+
 def get_device_identifier(entry: "ConfigEntry") -> str:
     """Return identifier for entities (unique_id prefix). Uses serial_deviceid or entry_id."""
     serial = entry.data.get(CONF_SERIAL_NUMBER)
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import Any
+
+import aiohttp
 
 from kospel_cmi import (
     IncompleteRegisterRefreshError,
@@ -11,15 +18,175 @@ from kospel_cmi import (
     RegisterReadError,
 )
 from kospel_cmi.controller.device import EkcoM3
+from kospel_cmi.registers.enums import HeaterMode, HeatingStatus
+from kospel_cmi.registers.utils import int_to_reg_address, reg_address_to_int
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import COMMUNICATION_FAILURE_THRESHOLD, DOMAIN, SCAN_INTERVAL
+from .const import (
+    BACKEND_TYPE_HTTP,
+    BURST_PUBLISH_INTERVAL,
+    BURST_SPAN_MAX_GAP,
+    COMMUNICATION_FAILURE_THRESHOLD,
+    CONF_BACKEND_TYPE,
+    CONF_HEDGED_READS,
+    CONF_HEATER_IP,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_ROLLING_STATISTICS,
+    CONF_SERIAL_NUMBER,
+    CONF_STATE_WRITE_INTERVAL,
+    DEFAULT_MAX_UPDATE_INTERVAL,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_STATE_WRITE_INTERVAL,
+    DOMAIN,
+    EVENT_ANOMALY,
+    IP_RECOVERY_COOLDOWN,
+    IP_RECOVERY_FAILURE_THRESHOLD,
+    IP_RECOVERY_PROBE_BUDGET,
+    POLL_BOOST_DURATION,
+    REGISTER_STALE_AFTER,
+    REFRESH_DEADLINE,
+    REFRESH_MAX_ATTEMPTS,
+    SCAN_INTERVAL,
+    get_refresh_delay_after_set,
+)
+from .anomaly import AnomalyDetector
+from .discovery import async_rediscover_module
+from .energy import EnergyIntegrator, energy_store
+from .latency import LATENCY_MIN_SAMPLES, LatencyTracker
+from .longterm import LongTermStatisticsWriter
+from .rolling import ROLLING_QUANTITIES, RollingStatistics, rolling_store
+from .runtime import (
+    RUNTIME_CH,
+    RUNTIME_DHW,
+    RUNTIME_MODE,
+    RUNTIME_VALVE,
+    RuntimeCounters,
+    runtime_store,
+)
+from .transaction import RegisterTransaction, TransactionResult
 
 _LOGGER = logging.getLogger(__name__)
 
+# Full register batch read on every refresh.
+BATCH_START = "0b00"
+BATCH_COUNT = 256
+
+# hass.data key: entry_id -> time.monotonic() of the last IP recovery attempt
+# (survives reloads; dropped with the entry).
+DATA_IP_RECOVERY_ATTEMPTS = f"{DOMAIN}_ip_recovery_attempts"
+
+
+async def async_recover_heater_address(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Look for an HTTP heater at a new address after its DHCP lease changed.
+
+    Matches on the serial number stored in the entry, probing the discovery
+    cache and the old subnet nearest-first within ``IP_RECOVERY_PROBE_BUDGET``.
+    Attempts are rate-limited per entry by ``IP_RECOVERY_COOLDOWN``. Updating
+    the entry data makes its update listener reload it on the new address.
+
+    Returns:
+        True when the heater was found elsewhere and ``CONF_HEATER_IP`` was updated.
+    """
+    if entry.data.get(CONF_BACKEND_TYPE, BACKEND_TYPE_HTTP) != BACKEND_TYPE_HTTP:
+        return False
+    serial = entry.data.get(CONF_SERIAL_NUMBER)
+    old_host = entry.data.get(CONF_HEATER_IP)
+    if not serial or not old_host:
+        return False
+
+    now = time.monotonic()
+    attempts: dict[str, float] = hass.data.setdefault(DATA_IP_RECOVERY_ATTEMPTS, {})
+    last_attempt = attempts.get(entry.entry_id)
+    if (
+        last_attempt is not None
+        and now - last_attempt < IP_RECOVERY_COOLDOWN.total_seconds()
+    ):
+        return False
+    attempts[entry.entry_id] = now
+
+    _LOGGER.info("Heater %s unreachable at %s, looking for a new address", serial, old_host)
+    async with aiohttp.ClientSession() as session:
+        info = await async_rediscover_module(
+            hass, session, serial, old_host, IP_RECOVERY_PROBE_BUDGET
+        )
+    if info is None or info.host == old_host:
+        _LOGGER.info("Heater %s not found near %s", serial, old_host)
+        return False
+
+    _LOGGER.warning(
+        "Heater %s moved from %s to %s; updating configuration",
+        serial,
+        old_host,
+        info.host,
+    )
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_HEATER_IP: info.host}
+    )
+    return True
+
+
+def register_spans(
+    registers: Iterable[str], max_gap: int = BURST_SPAN_MAX_GAP
+) -> list[tuple[str, int]]:
+    """Group registers into (start register, count) batch reads.
+
+    Registers of the same page closer than ``max_gap`` addresses share one
+    read, so a few scattered registers cost one or two requests.
+    """
+    by_page: dict[str, list[int]] = {}
+    for register in registers:
+        by_page.setdefault(register[:2], []).append(reg_address_to_int(register))
+    spans: list[tuple[str, int]] = []
+    for page, indexes in sorted(by_page.items()):
+        ordered = sorted(set(indexes))
+        start = end = ordered[0]
+        for index in ordered[1:]:
+            if index - end > max_gap:
+                spans.append((int_to_reg_address(page, start), end - start + 1))
+                start = index
+            end = index
+        spans.append((int_to_reg_address(page, start), end - start + 1))
+    return spans
+
+
+_QUIET_STATUSES = (HeatingStatus.IDLE, HeatingStatus.DISABLED)
+_QUIET_MODES = (HeaterMode.OFF, HeaterMode.SUMMER)
+
+
+def adaptive_update_interval(
+    co_status: HeatingStatus | None,
+    cwu_status: HeatingStatus | None,
+    heater_mode: HeaterMode | None,
+    minimum: timedelta,
+    maximum: timedelta,
+) -> timedelta:
+    """Polling interval for the decoded state, within ``minimum``..``maximum``.
+
+    Fastest while CH or DHW heats, slowest when both are idle or disabled in
+    off/summer mode, ``SCAN_INTERVAL`` (clamped) otherwise.
+    """
+    if HeatingStatus.RUNNING in (co_status, cwu_status):
+        return minimum
+    if (
+        co_status in _QUIET_STATUSES
+        and cwu_status in _QUIET_STATUSES
+        and heater_mode in _QUIET_MODES
+    ):
+        return maximum
+    return min(max(SCAN_INTERVAL, minimum), maximum)
+
+
+def _state_value(state: object) -> str | None:
+    """Enum value (or string) of a decoded state, None when unknown."""
+    if state is None:
+        return None
+    return str(getattr(state, "value", state))
+
 
 class KospelDataUpdateCoordinator(DataUpdateCoordinator[EkcoM3]):
     """Class to manage fetching data from the Kospel heater."""
@@ -29,6 +196,9 @@ class KospelDataUpdateCoordinator(DataUpdateCoordinator[EkcoM3]):
         hass: HomeAssistant,
         entry: ConfigEntry,
         heater_controller: EkcoM3,
+        backend: Any = None,
+        latency: LatencyTracker | None = None,
+        hedge_backend: Any = None,
     ) -> None:
         """Initialize the coordinator.
 
@@ -36,24 +206,109 @@ class KospelDataUpdateCoordinator(DataUpdateCoordinator[EkcoM3]):
             hass: Home Assistant instance.
             entry: Config entry for this integration.
             heater_controller: EkcoM3 device (backed by HTTP or YAML backend).
+            backend: The controller's register backend, for targeted reads
+                (burst polling); None disables them.
+            latency: RTT statistics of the heater module (HTTP only); polling
+                slows down while its latency degrades.
+            hedge_backend: Backend for hedged reads, bypassing the module's
+                request scheduler so they run next to the slow read (HTTP
+                only); None disables hedging.
         """
+        options = entry.options or {}
+        self.min_update_interval = timedelta(
+            seconds=options.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL)
+        )
+        self.max_update_interval = max(
+            self.min_update_interval,
+            timedelta(
+                seconds=options.get(
+                    CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+                )
+            ),
+        )
         super().__init__(
             hass,
             _LOGGER,
             config_entry=entry,
             name=DOMAIN,
-            update_interval=SCAN_INTERVAL,
+            update_interval=min(
+                max(SCAN_INTERVAL, self.min_update_interval), self.max_update_interval
+            ),
             always_update=True,
         )
         self.entry = entry
         self.heater_controller = heater_controller
+        self.backend = backend
+        self.latency = latency
+        self.hedge_backend = hedge_backend
+        self._burst_task: asyncio.Task[None] | None = None
+        self._burst_resume_interval: timedelta = SCAN_INTERVAL
+        # time.monotonic() until which polling stays at the minimum interval.
+        self._boost_until: float = 0.0
+        self._last_heater_mode: HeaterMode | None = None
         self._failure_streak: int = 0
+        # register -> time.monotonic() of the last successful read.
+        self._register_updated: dict[str, float] = {}
+        # Register values last read from the device (a copy: the library's
+        # setters update the controller cache before the device confirms).
+        self.registers: dict[str, str] = {}
+        # Register writes skipped because the device already held the value.
+        self.elided_writes: int = 0
+        self._connection_failure_streak: int = 0
+        self.energy = EnergyIntegrator(energy_store(hass, entry.entry_id))
+        self.runtime = RuntimeCounters(runtime_store(hass, entry.entry_id))
+        self.anomalies = AnomalyDetector()
+        self.rolling: RollingStatistics | None = None
+        if options.get(CONF_ROLLING_STATISTICS, False):
+            self.rolling = RollingStatistics(
+                rolling_store(hass, entry.entry_id), ROLLING_QUANTITIES
+            )
+        self.long_term: LongTermStatisticsWriter | None = None
+        if options.get(CONF_LONG_TERM_STATISTICS, False):
+            self.long_term = LongTermStatisticsWriter(hass, entry)
+        self.state_write_interval: float = options.get(
+            CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL
+        )
+        self.hedged_reads: bool = options.get(CONF_HEDGED_READS, False)
 
     @property
     def communication_ok(self) -> bool:
         """True if communication is OK (debounced; see ``COMMUNICATION_FAILURE_THRESHOLD``)."""
         return self._failure_streak < COMMUNICATION_FAILURE_THRESHOLD
 
+    @property
+    def stale_after(self) -> float:
+        """Seconds after which a register's value counts as stale."""
+        interval = self.update_interval or self._burst_resume_interval
+        return max(
+            REGISTER_STALE_AFTER.total_seconds(),
+            COMMUNICATION_FAILURE_THRESHOLD * interval.total_seconds(),
+        )
+
+    def data_age(self, registers: Iterable[str]) -> float | None:
+        """Seconds since the oldest of ``registers`` was read (None if never)."""
+        updated = [self._register_updated.get(register) for register in registers]
+        if not updated or None in updated:
+            return None
+        return time.monotonic() - min(updated)
+
+    def registers_available(self, registers: tuple[str, ...]) -> bool:
+        """Availability of an entity reading ``registers``.
+
+        Entities without registers (derived values) follow ``communication_ok``.
+        """
+        if not registers:
+            return self.communication_ok
+        age = self.data_age(registers)
+        return age is not None and age <= self.stale_after
+
+    @callback
+    def _async_mark_fresh(self, registers: Iterable[str]) -> None:
+        """Record that ``registers`` were just read."""
+        now = time.monotonic()
+        for register in registers:
+            self._register_updated[register] = now
+
     @callback
     def _async_refresh_finished(self) -> None:
         """Track consecutive failures for debounced availability."""
@@ -65,8 +320,11 @@ class KospelDataUpdateCoordinator(DataUpdateCoordinator[EkcoM3]):
     async def _async_update_data(self) -> EkcoM3:
         """Fetch data from the heater controller.
 
-        Uses the library strict refresh (see ``EkcoM3(..., strict_refresh=True)``):
-        incomplete batches raise ``IncompleteRegisterRefreshError`` without mutating cache.
+        Reads the register batch itself (``_async_read_registers``): required
+        registers missing from the batch are re-fetched with targeted reads, and
+        if any is still missing ``IncompleteRegisterRefreshError`` is raised
+        without mutating the cache (as the library strict refresh does).
+        Connection errors are retried within the cycle (``_async_refresh_controller``).
 
         Returns:
             EkcoM3 instance (entities access settings via coordinator.data).
@@ -75,18 +333,371 @@ class KospelDataUpdateCoordinator(DataUpdateCoordinator[EkcoM3]):
             UpdateFailed: On transport/read errors or incomplete strict refresh.
         """
         try:
-            await self.heater_controller.refresh()
+            await self._async_refresh_controller()
+        except KospelConnectionError as err:
+            self._connection_failure_streak += 1
+            self._async_maybe_start_ip_recovery()
+            _LOGGER.debug("Heater read failed: %s", err, exc_info=True)
+            raise UpdateFailed(f"Error communicating with heater: {err}") from err
         except IncompleteRegisterRefreshError as err:
             _LOGGER.warning(
                 "Incomplete heater register batch (strict): missing %s",
                 ", ".join(sorted(err.missing_registers)),
             )
             raise UpdateFailed(f"Incomplete heater data: {err}") from err
-        except (KospelConnectionError, RegisterReadError) as err:
+        except RegisterReadError as err:
             _LOGGER.debug("Heater read failed: %s", err, exc_info=True)
             raise UpdateFailed(f"Error communicating with heater: {err}") from err
         except KospelError as err:
             _LOGGER.error("Unexpected Kospel error during refresh: %s", err)
             raise UpdateFailed(f"Error communicating with heater: {err}") from err
 
+        self._connection_failure_streak = 0
+        self._async_record_samples()
+        self._async_adapt_update_interval()
         return self.heater_controller
+
+    async def _async_refresh_controller(self) -> None:
+        """Refresh the controller, retrying connection errors within the cycle.
+
+        Up to ``REFRESH_MAX_ATTEMPTS`` requests within ``REFRESH_DEADLINE``: a
+        failed attempt with a connection error (reset, timeout) is retried at
+        once. With hedged reads enabled, a second request starts when the
+        first is slower than the module's p95 RTT. It goes through
+        ``hedge_backend``, around the request scheduler, so both are in flight
+        at once; the first success wins and the other request is cancelled,
+        and only the winner's registers are loaded into the controller.
+
+        Raises:
+            KospelConnectionError: All attempts failed or the deadline passed.
+            KospelError: Other errors of the attempt (not retried).
+        """
+        hedge_delay = self._hedge_delay()
+        attempts = 1
+        pending = {self._start_refresh_attempt()}
+        try:
+            async with asyncio.timeout(REFRESH_DEADLINE.total_seconds()):
+                while True:
+                    can_hedge = attempts < REFRESH_MAX_ATTEMPTS
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=hedge_delay if can_hedge else None,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not done:
+                        _LOGGER.debug("Heater read slower than p95, sending hedged read")
+                        attempts += 1
+                        pending.add(self._start_refresh_attempt(self.hedge_backend))
+                        continue
+                    errors = [task.exception() for task in done]
+                    for task, error in zip(done, errors):
+                        if error is None:
+                            registers = task.result()
+                            if registers is not None:
+                                self.heater_controller.from_registers(registers)
+                                self.registers = dict(registers)
+                            self._async_mark_fresh(
+                                registers or EkcoM3.REQUIRED_REGISTERS
+                            )
+                            return
+                    if pending:
+                        continue
+                    error = errors[-1]
+                    if (
+                        not isinstance(error, KospelConnectionError)
+                        or attempts >= REFRESH_MAX_ATTEMPTS
+                    ):
+                        raise error
+                    _LOGGER.debug("Heater read failed (%s), retrying", error)
+                    attempts += 1
+                    pending = {self._start_refresh_attempt()}
+        except TimeoutError as err:
+            raise KospelConnectionError(
+                f"No heater response within {REFRESH_DEADLINE.total_seconds():.0f} s"
+            ) from err
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _start_refresh_attempt(
+        self, backend: Any = None
+    ) -> asyncio.Future[dict[str, str] | None]:
+        """Start one register read as a task."""
+        return asyncio.ensure_future(self._async_read_registers(backend))
+
+    async def _async_read_registers(self, backend: Any = None) -> dict[str, str] | None:
+        """Read the full batch, re-fetching missing required registers.
+
+        Registers of ``EkcoM3.REQUIRED_REGISTERS`` absent from the batch (a
+        partial response) are read again in small spans and merged, instead of
+        losing the cycle. Reads go through ``backend``, by default the
+        coordinator's. Without a backend the controller refreshes itself.
+
+        Returns:
+            Complete register map, or None when the controller refreshed itself.
+
+        Raises:
+            IncompleteRegisterRefreshError: Required registers are still missing.
+        """
+        if self.backend is None:
+            await self.heater_controller.refresh()
+            return None
+        backend = backend or self.backend
+        registers = await backend.read_registers(BATCH_START, BATCH_COUNT)
+        missing = EkcoM3.REQUIRED_REGISTERS - registers.keys()
+        if not missing:
+            return registers
+        _LOGGER.debug("Batch missed %s, re-fetching", ", ".join(sorted(missing)))
+        for start_register, count in register_spans(missing):
+            batch = await backend.read_registers(start_register, count)
+            registers.update(
+                {register: value for register, value in batch.items() if register in missing}
+            )
+        if missing := EkcoM3.REQUIRED_REGISTERS - registers.keys():
+            raise IncompleteRegisterRefreshError(missing_registers=frozenset(missing))
+        return registers
+
+    def _hedge_delay(self) -> float | None:
+        """Seconds before a hedged read (module p95 RTT), None when not hedging."""
+        if (
+            not self.hedged_reads
+            or self.hedge_backend is None
+            or self.latency is None
+            or self.latency.sample_count < LATENCY_MIN_SAMPLES
+        ):
+            return None
+        return self.latency.percentile(0.95)
+
+    @callback
+    def async_boost_polling(self) -> None:
+        """Poll at the minimum interval for ``POLL_BOOST_DURATION`` (after writes)."""
+        self._boost_until = time.monotonic() + POLL_BOOST_DURATION.total_seconds()
+        self._async_set_update_interval(self.min_update_interval)
+
+    @callback
+    def _async_adapt_update_interval(self) -> None:
+        """Pick the next polling interval from the refreshed state."""
+        controller = self.heater_controller
+        heater_mode = controller.heater_mode
+        if self._last_heater_mode is not None and heater_mode != self._last_heater_mode:
+            # Mode changed outside Home Assistant (panel, schedule): follow closely.
+            self._boost_until = time.monotonic() + POLL_BOOST_DURATION.total_seconds()
+        self._last_heater_mode = heater_mode
+        if time.monotonic() < self._boost_until:
+            interval = self.min_update_interval
+        else:
+            interval = adaptive_update_interval(
+                controller.co_heating_status,
+                controller.cwu_heating_status,
+                heater_mode,
+                self.min_update_interval,
+                self.max_update_interval,
+            )
+        if self.latency is not None and (factor := self.latency.load_factor) > 1.0:
+            _LOGGER.debug("Module latency degraded, polling %.1fx slower", factor)
+            interval = min(interval * factor, self.max_update_interval)
+        self._async_set_update_interval(interval)
+
+    @callback
+    def _async_set_update_interval(self, interval: timedelta) -> None:
+        """Apply ``interval`` now, or when a running burst ends."""
+        if self.burst_active:
+            self._burst_resume_interval = interval
+            return
+        if interval != self.update_interval:
+            _LOGGER.debug("Polling interval %s -> %s", self.update_interval, interval)
+            self.update_interval = interval
+
+    @callback
+    def _async_record_samples(self) -> None:
+        """Feed the refreshed readings to meters, counters, statistics and detectors."""
+        controller = self.heater_controller
+        now = time.time()
+        power_kw = controller.power
+        power_w = power_kw * 1000.0 if power_kw is not None else None
+        self.energy.async_add_sample(power_w, now)
+        self.runtime.async_update(
+            {
+                RUNTIME_CH: _state_value(controller.co_heating_status),
+                RUNTIME_DHW: _state_value(controller.cwu_heating_status),
+                RUNTIME_VALVE: _state_value(controller.valve_position),
+                RUNTIME_MODE: _state_value(controller.heater_mode),
+            },
+            now,
+        )
+        samples = {
+            "room_temperature": controller.room_temperature,
+            "water_temperature": controller.water_current_temperature,
+            "pressure": controller.pressure,
+            "power": power_w,
+        }
+        if self.rolling is not None:
+            self.rolling.async_add_samples(samples, now)
+        if self.long_term is not None:
+            self.long_term.async_add_samples(samples, now)
+        for change in self.anomalies.update(
+            time.monotonic(),
+            pressure=controller.pressure,
+            room_temperature=controller.room_temperature,
+            room_heating=controller.co_heating_status == HeatingStatus.RUNNING,
+            water_temperature=controller.water_current_temperature,
+            water_heating=controller.cwu_heating_status == HeatingStatus.RUNNING,
+        ):
+            _LOGGER.log(
+                logging.WARNING if change.active else logging.INFO,
+                "Heater anomaly %s %s (value %s, reference %s)",
+                change.anomaly,
+                "detected" if change.active else "cleared",
+                round(change.value, 2),
+                round(change.reference, 2),
+            )
+            self.hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {
+                    "entry_id": self.entry.entry_id,
+                    "anomaly": change.anomaly,
+                    "active": change.active,
+                    "value": round(change.value, 2),
+                    "reference": round(change.reference, 2),
+                },
+            )
+
+    @callback
+    def _async_maybe_start_ip_recovery(self) -> None:
+        """Start a background rediscovery after sustained connection errors."""
+        if self._connection_failure_streak < IP_RECOVERY_FAILURE_THRESHOLD:
+            return
+        self.entry.async_create_background_task(
+            self.hass,
+            async_recover_heater_address(self.hass, self.entry),
+            name=f"{DOMAIN} IP recovery {self.entry.entry_id}",
+        )
+
+    def transaction(self) -> RegisterTransaction:
+        """Start planning register writes against the last read registers.
+
+        Writes of values that fresh registers (see ``stale_after``) already
+        hold are elided; stale ones are written regardless.
+        """
+        fresh_since = time.monotonic() - self.stale_after
+        confirmed = {
+            register: value
+            for register, value in self.registers.items()
+            if self._register_updated.get(register, fresh_since - 1) >= fresh_since
+        }
+        return RegisterTransaction(self.registers, confirmed)
+
+    async def async_commit(self, transaction: RegisterTransaction) -> TransactionResult:
+        """Commit ``transaction`` and load the registers it read back.
+
+        The read-back waits the entry's refresh delay after set, so the
+        device has persisted the writes. The verified values go into the
+        controller right away, so entities reflect what the device holds
+        before the next refresh.
+
+        Raises:
+            ValueError: When the backend does not support direct writes.
+        """
+        if self.backend is None:
+            raise ValueError("Register transactions need direct backend access")
+        if transaction.elided:
+            self.elided_writes += len(transaction.elided)
+            _LOGGER.debug(
+                "Skipping unchanged %s (%s writes elided)",
+                ", ".join(transaction.elided),
+                self.elided_writes,
+            )
+        result = await transaction.async_commit(
+            self.backend, get_refresh_delay_after_set(self.entry)
+        )
+        if result.read_back:
+            self.registers.update(result.read_back)
+            self.heater_controller.from_registers(dict(self.registers))
+            self._async_mark_fresh(result.read_back)
+        if not result.complete:
+            _LOGGER.warning("Register writes incomplete: %s", result)
+        return result
+
+    @property
+    def burst_active(self) -> bool:
+        """True while a burst is polling."""
+        return self._burst_task is not None and not self._burst_task.done()
+
+    @callback
+    def async_start_burst(
+        self, registers: list[str], interval: float, duration: timedelta
+    ) -> None:
+        """Poll only ``registers`` every ``interval`` seconds for ``duration``.
+
+        Replaces a running burst. The regular schedule is paused meanwhile and
+        resumes (with an immediate full refresh) when the burst ends. Every
+        sample feeds the meters and detectors; entity state is published at
+        most every ``BURST_PUBLISH_INTERVAL``.
+
+        Raises:
+            ValueError: When the backend does not support targeted reads.
+        """
+        if self.backend is None:
+            raise ValueError("Burst polling needs direct backend access")
+        if self._burst_task is not None:
+            self._burst_task.cancel()
+        else:
+            self._burst_resume_interval = self.update_interval or SCAN_INTERVAL
+            self.update_interval = None
+        self._burst_task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_run_burst(sorted(set(registers)), interval, duration),
+            name=f"{DOMAIN} burst {self.entry.entry_id}",
+        )
+
+    async def _async_run_burst(
+        self, registers: list[str], interval: float, duration: timedelta
+    ) -> None:
+        """Burst loop: targeted reads merged into a full snapshot."""
+        spans = register_spans(registers)
+        wanted = frozenset(registers)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration.total_seconds()
+        next_publish = 0.0
+        samples = failures = 0
+        _LOGGER.info(
+            "Burst polling %s every %.1f s for %s (%s request(s) per sample)",
+            ", ".join(registers),
+            interval,
+            duration,
+            len(spans),
+        )
+        try:
+            # Start from a full batch so entities needing other registers stay valid.
+            snapshot = await self._async_read_registers()
+            self.registers = dict(snapshot)
+            self._async_mark_fresh(snapshot)
+            while (started := loop.time()) < deadline:
+                try:
+                    for start_register, count in spans:
+                        batch = await self.backend.read_registers(start_register, count)
+                        fresh = {reg: val for reg, val in batch.items() if reg in wanted}
+                        snapshot.update(fresh)
+                        self._async_mark_fresh(fresh)
+                except KospelError as err:
+                    failures += 1
+                    _LOGGER.debug("Burst read failed: %s", err)
+                else:
+                    samples += 1
+                    self.registers = dict(snapshot)
+                    self.heater_controller.from_registers(dict(snapshot))
+                    self._async_record_samples()
+                    if started >= next_publish:
+                        next_publish = started + BURST_PUBLISH_INTERVAL.total_seconds()
+                        self.async_set_updated_data(self.heater_controller)
+                await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+        except KospelError as err:
+            _LOGGER.warning("Burst polling aborted: %s", err)
+        finally:
+            _LOGGER.info(
+                "Burst polling finished: %s samples, %s failed reads", samples, failures
+            )
+        # Replaced or cancelled bursts never get here; the last one resumes polling.
+        self._burst_task = None
+        self.update_interval = self._burst_resume_interval
+        await self.async_request_refresh()
@@ -0,0 +1,256 @@
+"""Discovery state shared across config flows and heaters.
+
+Holds the persistent discovery cache (serial number -> last known host), so
+retries of the config flow and re-added heaters do not rescan the network, and
+the targeted rediscovery used when a configured heater changes IP address.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from ipaddress import IPv4Address, IPv4Network, ip_address
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from kospel_cmi import probe_device
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.discovery_cache"
+STORAGE_VERSION = 1
+# Debounce for Store writes; discovery records arrive in bursts during a scan.
+STORAGE_SAVE_DELAY = 10.0
+
+# Cached modules not seen for this long are evicted (DHCP leases rarely last longer).
+DISCOVERY_CACHE_TTL_SECONDS = 30 * 24 * 3600.0
+
+# Targeted rediscovery after an IP change (per attempt).
+REDISCOVERY_PREFIX_LENGTH = 24
+REDISCOVERY_PROBE_TIMEOUT_SECONDS = 1.5
+REDISCOVERY_CONCURRENCY = 16
+
+DATA_DISCOVERY_CACHE = f"{DOMAIN}_discovery_cache"
+_DATA_DISCOVERY_CACHE_LOCK = f"{DOMAIN}_discovery_cache_lock"
+
+
+@dataclass
+class CachedModule:
+    """Last known location of one C.MI module."""
+
+    serial_number: str
+    host: str
+    device_ids: list[int]
+    last_seen: float
+
+
+class KospelDiscoveryCache:
+    """Persistent map of module serial number to host, device IDs and last-seen time.
+
+    Filled from successful probes (manual validation, DHCP, network scan) and
+    evicted by TTL. Validated by probing cached hosts before any sweep.
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        ttl_seconds: float = DISCOVERY_CACHE_TTL_SECONDS,
+    ) -> None:
+        """Initialize an empty cache backed by ``store``.
+
+        Args:
+            store: Home Assistant Store used for persistence.
+            ttl_seconds: Entries older than this are evicted.
+        """
+        self._store = store
+        self._ttl_seconds = ttl_seconds
+        self._modules: dict[str, CachedModule] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted entries, dropping malformed and expired ones."""
+        data = await self._store.async_load()
+        modules = (data or {}).get("modules", {})
+        for serial, raw in modules.items():
+            try:
+                self._modules[serial] = CachedModule(
+                    serial_number=serial,
+                    host=str(raw["host"]),
+                    device_ids=[int(device_id) for device_id in raw["device_ids"]],
+                    last_seen=float(raw["last_seen"]),
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Dropping malformed discovery cache entry %s", serial)
+        self._evict_expired()
+
+    def get(self, serial_number: str) -> CachedModule | None:
+        """Return the cached module for ``serial_number`` if not expired."""
+        self._evict_expired()
+        return self._modules.get(serial_number)
+
+    def modules(self) -> list[CachedModule]:
+        """Return non-expired modules, most recently seen first."""
+        self._evict_expired()
+        return sorted(
+            self._modules.values(), key=lambda module: module.last_seen, reverse=True
+        )
+
+    @callback
+    def async_record(self, info: Any) -> None:
+        """Record a confirmed probe result (``KospelDeviceInfo``) and schedule a save."""
+        serial = getattr(info, "serial_number", None)
+        host = getattr(info, "host", None)
+        if not serial or not host:
+            return
+        self._modules[str(serial)] = CachedModule(
+            serial_number=str(serial),
+            host=str(host),
+            device_ids=[int(device_id) for device_id in info.device_ids],
+            last_seen=time.time(),
+        )
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_forget(self, serial_number: str) -> None:
+        """Drop a module whose cached host no longer answers with this serial."""
+        if self._modules.pop(serial_number, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _evict_expired(self) -> None:
+        """Remove entries not seen within the TTL."""
+        cutoff = time.time() - self._ttl_seconds
+        expired = [
+            serial
+            for serial, module in self._modules.items()
+            if module.last_seen < cutoff
+        ]
+        for serial in expired:
+            del self._modules[serial]
+        if expired:
+            _LOGGER.debug("Evicted %s expired discovery cache entries", len(expired))
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize entries for the Store."""
+        return {
+            "modules": {
+                serial: {
+                    key: value
+                    for key, value in asdict(module).items()
+                    if key != "serial_number"
+                }
+                for serial, module in self._modules.items()
+            }
+        }
+
+
+async def async_get_discovery_cache(hass: HomeAssistant) -> KospelDiscoveryCache:
+    """Return the shared discovery cache, loading it from storage on first use."""
+    cache: KospelDiscoveryCache | None = hass.data.get(DATA_DISCOVERY_CACHE)
+    if cache is not None:
+        return cache
+
+    lock: asyncio.Lock = hass.data.setdefault(_DATA_DISCOVERY_CACHE_LOCK, asyncio.Lock())
+    async with lock:
+        cache = hass.data.get(DATA_DISCOVERY_CACHE)
+        if cache is None:
+            cache = KospelDiscoveryCache(Store(hass, STORAGE_VERSION, STORAGE_KEY))
+            await cache.async_load()
+            hass.data[DATA_DISCOVERY_CACHE] = cache
+    return cache
+
+
+def split_host_port(host: str) -> tuple[str, str]:
+    """Split ``"ip:port"`` into ``("ip", ":port")``; port part is empty when absent."""
+    address, sep, port = host.strip().partition(":")
+    return address, f"{sep}{port}"
+
+
+def hosts_near(
+    host: str,
+    budget: int,
+    prefix_length: int = REDISCOVERY_PREFIX_LENGTH,
+) -> list[str]:
+    """Return up to ``budget`` addresses of the host's subnet, nearest first.
+
+    The old address itself is excluded; an optional ``:port`` suffix is kept on
+    every candidate. Returns an empty list for hostnames and non-IPv4 hosts.
+    """
+    address_str, port = split_host_port(host)
+    try:
+        address = ip_address(address_str)
+    except ValueError:
+        return []
+    if not isinstance(address, IPv4Address) or budget <= 0:
+        return []
+
+    network = IPv4Network(f"{address}/{prefix_length}", strict=False)
+    candidates = sorted(
+        (candidate for candidate in network.hosts() if candidate != address),
+        key=lambda candidate: (abs(int(candidate) - int(address)), int(candidate)),
+    )
+    return [f"{candidate}{port}" for candidate in candidates[:budget]]
+
+
+async def async_rediscover_module(
+    hass: HomeAssistant,
+    session: aiohttp.ClientSession,
+    serial_number: str,
+    old_host: str,
+    probe_budget: int,
+) -> Any | None:
+    """Find a module that moved to a new address, matching on serial number.
+
+    Tries the host from the discovery cache first (DHCP or a scan may already
+    know it), then addresses of the old subnet ordered by distance from the old
+    address, probing at most ``probe_budget`` hosts. Stops at the first match.
+
+    Returns:
+        ``KospelDeviceInfo`` of the module at its new address, or None.
+    """
+    cache = await async_get_discovery_cache(hass)
+    candidates: list[str] = []
+    cached = cache.get(serial_number)
+    if cached is not None and cached.host != old_host:
+        candidates.append(cached.host)
+    for host in hosts_near(old_host, probe_budget):
+        if host not in candidates:
+            candidates.append(host)
+    candidates = candidates[:probe_budget]
+    if not candidates:
+        return None
+
+    _LOGGER.debug(
+        "Rediscovering module %s near %s (%s candidate hosts)",
+        serial_number,
+        old_host,
+        len(candidates),
+    )
+    sem = asyncio.Semaphore(REDISCOVERY_CONCURRENCY)
+
+    async def _probe(host: str) -> Any | None:
+        async with sem:
+            info = await probe_device(
+                session, host, timeout=REDISCOVERY_PROBE_TIMEOUT_SECONDS
+            )
+        if info is not None and str(info.serial_number) == serial_number:
+            return info
+        return None
+
+    tasks = [asyncio.ensure_future(_probe(host)) for host in candidates]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            info = await next_done
+            if info is not None:
+                cache.async_record(info)
+                return info
+    finally:
+        for task in tasks:
+            task.cancel()
+    return None
@@ -0,0 +1,142 @@
+"""Energy metering: heater power integrated over coordinator refreshes.
+
+Every successful refresh adds one power sample; consecutive samples are
+integrated with the trapezoidal rule into a running kWh total, which backs the
+``total_increasing`` energy sensor. The total and the last sample persist in a
+per-entry ``Store`` (debounced), so the meter survives restarts and a short
+restart is integrated like any other poll interval.
+
+Gaps are explicit: an interval longer than ``ENERGY_MAX_GAP_SECONDS`` (heater
+unreachable, Home Assistant stopped) or a sample without a power reading ends
+the current segment without adding energy, and is counted in ``gap_count`` and
+``gap_seconds`` instead of being guessed.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ENERGY_STORAGE_VERSION = 1
+# Debounce for Store writes; a sample arrives on every refresh.
+ENERGY_SAVE_DELAY = 60.0
+# Longer intervals between samples are not integrated (state in between unknown).
+ENERGY_MAX_GAP_SECONDS = 300.0
+
+_SECONDS_PER_HOUR = 3600.0
+
+
+def energy_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the Store holding the energy meter of one config entry."""
+    return Store(hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.energy.{entry_id}")
+
+
+class EnergyIntegrator:
+    """Running kWh total from power samples (trapezoidal rule, explicit gaps)."""
+
+    def __init__(
+        self,
+        store: Store,
+        max_gap_seconds: float = ENERGY_MAX_GAP_SECONDS,
+    ) -> None:
+        """Initialize an empty meter backed by ``store``.
+
+        Args:
+            store: Home Assistant Store used for persistence.
+            max_gap_seconds: Sample intervals longer than this are skipped.
+        """
+        self._store = store
+        self._max_gap_seconds = max_gap_seconds
+        self._total_kwh = 0.0
+        self._gap_count = 0
+        self._gap_seconds = 0.0
+        # (epoch seconds, W) of the previous sample; None at a segment start.
+        self._last_sample: tuple[float, float] | None = None
+
+    @property
+    def total_kwh(self) -> float:
+        """Energy integrated so far, in kWh."""
+        return self._total_kwh
+
+    @property
+    def gap_count(self) -> int:
+        """Number of intervals that were not integrated."""
+        return self._gap_count
+
+    @property
+    def gap_seconds(self) -> float:
+        """Total length of the skipped intervals, in seconds."""
+        return self._gap_seconds
+
+    async def async_load(self) -> None:
+        """Restore the persisted meter; malformed data starts from zero."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        try:
+            self._total_kwh = float(data["total_kwh"])
+            self._gap_count = int(data.get("gap_count", 0))
+            self._gap_seconds = float(data.get("gap_seconds", 0.0))
+            last = data.get("last_sample")
+            self._last_sample = (
+                (float(last[0]), float(last[1])) if last is not None else None
+            )
+        except (KeyError, TypeError, ValueError, IndexError):
+            _LOGGER.warning("Discarding malformed energy meter data: %s", data)
+            self._total_kwh = 0.0
+            self._gap_count = 0
+            self._gap_seconds = 0.0
+            self._last_sample = None
+
+    @callback
+    def async_add_sample(self, power_w: float | None, timestamp: float) -> None:
+        """Integrate the interval since the previous sample and schedule a save.
+
+        Args:
+            power_w: Instantaneous power in W; None when the reading is missing.
+            timestamp: Sample time in epoch seconds.
+        """
+        last = self._last_sample
+        if power_w is None or power_w < 0:
+            if last is not None:
+                self._gap_count += 1
+                self._last_sample = None
+                self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+            return
+
+        if last is not None:
+            elapsed = timestamp - last[0]
+            if elapsed > self._max_gap_seconds:
+                self._gap_count += 1
+                self._gap_seconds += elapsed
+                _LOGGER.debug("Energy meter skipped a %.0f s gap", elapsed)
+            elif elapsed > 0:
+                mean_w = (last[1] + power_w) / 2.0
+                self._total_kwh += mean_w * elapsed / _SECONDS_PER_HOUR / 1000.0
+            elif elapsed < 0:
+                # Wall clock stepped back; restart the segment at this sample.
+                self._gap_count += 1
+        self._last_sample = (timestamp, power_w)
+        self._store.async_delay_save(self._data_to_save, ENERGY_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the meter now (on unload)."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize the meter for the Store."""
+        return {
+            "total_kwh": self._total_kwh,
+            "gap_count": self._gap_count,
+            "gap_seconds": self._gap_seconds,
+            "last_sample": (
+                list(self._last_sample) if self._last_sample is not None else None
+            ),
+        }
@@ -0,0 +1,237 @@
+"""Round-trip time tracking and adaptive timeouts for the heater module.
+
+``TimedRegisterBackend`` wraps the HTTP backend and times the full-page
+batch reads of the polls. Span and single-register reads come back much
+faster and would pull the statistics (and with them the timeout) below what
+a full page needs, so they pass through with the library timeout. The
+``LatencyTracker`` keeps, per heater host, a smoothed RTT and its mean
+deviation (as TCP does, RFC 6298), a slow baseline of the smoothed RTT and the
+last ``LATENCY_SAMPLE_COUNT`` samples for percentiles.
+
+Read timeouts are ``max(srtt + 4 * rttvar, 1.5 * p99)`` within
+``LATENCY_TIMEOUT_MIN``..``LATENCY_TIMEOUT_MAX`` once enough samples exist
+(the library's 5 s before that). Each consecutive timeout doubles the
+timeout, up to ``LATENCY_TIMEOUT_BACKOFF_MAX`` times, so a slow-but-alive
+module is not cut off repeatedly while a dead one still fails after a few
+RTTs. Writes pass through untimed with the library timeout: a cut-off write
+may still have been applied, and the module's flash writes would skew the
+read statistics.
+
+``load_factor`` compares the smoothed RTT with its baseline; the coordinator
+stretches the polling interval by it while the module is slowing down
+(typically an overloaded CMI). Statistics persist in a per-entry ``Store``
+and are discarded when the heater host changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from kospel_cmi.exceptions import KospelConnectionError
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+LATENCY_STORAGE_VERSION = 1
+LATENCY_SAVE_DELAY = 300.0
+LATENCY_SAMPLE_COUNT = 200
+# Batch reads of at least this many registers (a full page) are timed.
+LATENCY_TIMED_COUNT = 256
+# Samples needed before timeouts are derived from the statistics.
+LATENCY_MIN_SAMPLES = 20
+LATENCY_TIMEOUT_MIN = 0.05  # seconds
+LATENCY_TIMEOUT_MAX = 5.0  # seconds (library default)
+LATENCY_P99_MARGIN = 1.5
+LATENCY_TIMEOUT_BACKOFF_MAX = 4
+# RFC 6298 gains; the baseline follows the smoothed RTT over ~100 samples.
+_SRTT_GAIN = 1 / 8
+_RTTVAR_GAIN = 1 / 4
+_BASELINE_GAIN = 1 / 100
+# Smoothed RTT / baseline above which polling backs off, and the cap.
+LATENCY_DEGRADED_RATIO = 1.5
+LATENCY_LOAD_FACTOR_MAX = 4.0
+
+
+def latency_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the Store holding the RTT statistics of one config entry."""
+    return Store(hass, LATENCY_STORAGE_VERSION, f"{DOMAIN}.latency.{entry_id}")
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class LatencyTracker:
+    """RTT statistics of one heater host."""
+
+    def __init__(self, store: Store, host: str) -> None:
+        """Initialize empty statistics for ``host`` backed by ``store``."""
+        self._store = store
+        self._host = host
+        self._srtt: float | None = None
+        self._rttvar = 0.0
+        self._baseline: float | None = None
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLE_COUNT)
+        self._consecutive_timeouts = 0
+
+    @property
+    def srtt(self) -> float | None:
+        """Smoothed RTT in seconds (None before the first sample)."""
+        return self._srtt
+
+    @property
+    def sample_count(self) -> int:
+        """Number of recent samples held."""
+        return len(self._samples)
+
+    def percentile(self, fraction: float) -> float | None:
+        """RTT percentile (0..1) of the recent samples, None without samples."""
+        if not self._samples:
+            return None
+        return _percentile(sorted(self._samples), fraction)
+
+    @property
+    def timeout(self) -> float:
+        """Timeout in seconds for the next read."""
+        if self._srtt is None or len(self._samples) < LATENCY_MIN_SAMPLES:
+            return LATENCY_TIMEOUT_MAX
+        base = max(
+            self._srtt + 4 * self._rttvar,
+            LATENCY_P99_MARGIN * _percentile(sorted(self._samples), 0.99),
+        )
+        backoff = 2 ** min(self._consecutive_timeouts, LATENCY_TIMEOUT_BACKOFF_MAX)
+        return min(LATENCY_TIMEOUT_MAX, max(LATENCY_TIMEOUT_MIN, base) * backoff)
+
+    @property
+    def load_factor(self) -> float:
+        """Polling interval multiplier (1.0 unless the RTT trend degrades)."""
+        if self._srtt is None or not self._baseline:
+            return 1.0
+        ratio = self._srtt / self._baseline
+        if ratio < LATENCY_DEGRADED_RATIO:
+            return 1.0
+        return min(ratio, LATENCY_LOAD_FACTOR_MAX)
+
+    def add_sample(self, rtt: float) -> None:
+        """Record one successful request's round-trip time (seconds)."""
+        self._consecutive_timeouts = 0
+        self._samples.append(rtt)
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar += _RTTVAR_GAIN * (abs(self._srtt - rtt) - self._rttvar)
+            self._srtt += _SRTT_GAIN * (rtt - self._srtt)
+        if self._baseline is None:
+            self._baseline = self._srtt
+        else:
+            self._baseline += _BASELINE_GAIN * (self._srtt - self._baseline)
+        self._store.async_delay_save(self._data_to_save, LATENCY_SAVE_DELAY)
+
+    def add_timeout(self) -> None:
+        """Record a timed-out request (doubles the next timeout)."""
+        self._consecutive_timeouts += 1
+
+    async def async_load(self) -> None:
+        """Restore persisted statistics of the same host; others are dropped."""
+        data = await self._store.async_load()
+        if not data or data.get("host") != self._host:
+            return
+        try:
+            samples = [float(value) for value in data["samples"]]
+            srtt = data["srtt"]
+            baseline = data["baseline"]
+            self._srtt = float(srtt) if srtt is not None else None
+            self._rttvar = float(data["rttvar"])
+            self._baseline = float(baseline) if baseline is not None else None
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.warning("Discarding malformed latency statistics")
+            self._srtt = None
+            self._rttvar = 0.0
+            self._baseline = None
+            return
+        self._samples.extend(samples)
+
+    async def async_flush(self) -> None:
+        """Write the statistics now (on unload)."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize the statistics for the Store."""
+        return {
+            "host": self._host,
+            "srtt": self._srtt,
+            "rttvar": self._rttvar,
+            "baseline": self._baseline,
+            "samples": [round(sample, 4) for sample in self._samples],
+        }
+
+
+class TimedRegisterBackend:
+    """Register backend that times the reads of a wrapped backend and bounds them."""
+
+    def __init__(
+        self,
+        backend: Any,
+        tracker: LatencyTracker,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            backend: Backend whose calls are timed (calls pass through).
+            tracker: Statistics fed by the calls and providing read timeouts.
+            clock: Monotonic clock (injectable for tests).
+        """
+        self._backend = backend
+        self._tracker = tracker
+        self._clock = clock
+
+    async def _timed_read(self, read: Any, what: str) -> Any:
+        """Await ``read`` within the tracker timeout, recording its RTT."""
+        timeout = self._tracker.timeout
+        started = self._clock()
+        try:
+            async with asyncio.timeout(timeout):
+                result = await read
+        except TimeoutError as err:
+            self._tracker.add_timeout()
+            raise KospelConnectionError(
+                f"Timed out after {timeout:.2f} s reading {what}"
+            ) from err
+        self._tracker.add_sample(self._clock() - started)
+        return result
+
+    async def read_register(self, register: str) -> str:
+        """Read one register through the wrapped backend (library timeout)."""
+        return await self._backend.read_register(register)
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Batch-read; full pages are timed and bounded by the adaptive timeout."""
+        if count < LATENCY_TIMED_COUNT:
+            return await self._backend.read_registers(start_register, count)
+        return await self._timed_read(
+            self._backend.read_registers(start_register, count),
+            f"registers from {start_register}",
+        )
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Write through the wrapped backend (library timeout)."""
+        await self._backend.write_register(register, hex_value)
+
+    async def aclose(self) -> None:
+        """Close the wrapped backend."""
+        aclose = getattr(self._backend, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,176 @@
+"""Long-term statistics imported from refresh samples.
+
+Samples of power and temperatures are aggregated in the coordinator into
+5-minute buckets (sum, count, min, max). When an hour is complete its buckets
+are rolled up into one mean/min/max row per quantity and imported as external
+statistics (``kospel:<device>_<quantity>``) in a single recorder call, so
+detailed history does not need a recorder state row per sample.
+
+Home Assistant only accepts hour-aligned rows for imported statistics (the
+5-minute short-term table is recorder-internal), hence the roll-up; the mean
+of an hour is the mean of its bucket means, which weights every 5 minutes
+with data equally however often they were sampled. The open hour is kept in
+memory only; a restart imports it with the samples seen after the restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower, UnitOfPressure, UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, get_device_identifier
+
+_LOGGER = logging.getLogger(__name__)
+
+LTS_BUCKET_SECONDS = 300.0
+_SECONDS_PER_HOUR = 3600.0
+
+# Quantity -> (unit, statistic name suffix).
+LTS_QUANTITIES: dict[str, tuple[str, str]] = {
+    "room_temperature": (UnitOfTemperature.CELSIUS, "CH temperature"),
+    "water_temperature": (UnitOfTemperature.CELSIUS, "DHW temperature"),
+    "pressure": (UnitOfPressure.BAR, "pressure"),
+    "power": (UnitOfPower.WATT, "power"),
+}
+
+
+@dataclass
+class _Bucket:
+    """Aggregate of the samples within one bucket."""
+
+    start: float
+    total: float
+    count: int
+    low: float
+    high: float
+
+
+class StatisticsAggregator:
+    """5-minute buckets per quantity, rolled up into hourly rows."""
+
+    def __init__(self, bucket_seconds: float = LTS_BUCKET_SECONDS) -> None:
+        """Initialize empty buckets.
+
+        Args:
+            bucket_seconds: Bucket length; must divide an hour.
+        """
+        self._bucket_seconds = bucket_seconds
+        self._current: dict[str, _Bucket] = {}
+        # Completed buckets not yet rolled up (at most one hour per quantity).
+        self._completed: dict[str, list[_Bucket]] = {}
+
+    def add(
+        self, samples: dict[str, float | None], timestamp: float
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Add one sample per quantity (None skipped).
+
+        Returns:
+            Quantity -> hourly rows (``start``, ``mean``, ``min``, ``max``) of
+            the hours completed by this sample, oldest first.
+        """
+        start = timestamp - timestamp % self._bucket_seconds
+        rows: dict[str, list[dict[str, Any]]] = {}
+        for quantity, value in samples.items():
+            if value is None:
+                continue
+            current = self._current.get(quantity)
+            if current is not None and start > current.start:
+                self._completed.setdefault(quantity, []).append(current)
+                current = None
+            if current is None:
+                self._current[quantity] = _Bucket(start, value, 1, value, value)
+            else:
+                # Same bucket, or the clock stepped back: fold into the open one.
+                current.total += value
+                current.count += 1
+                current.low = min(current.low, value)
+                current.high = max(current.high, value)
+            hourly = self._roll_up(quantity, start)
+            if hourly:
+                rows[quantity] = hourly
+        return rows
+
+    def _roll_up(self, quantity: str, open_start: float) -> list[dict[str, Any]]:
+        """Turn completed buckets of hours before ``open_start`` into rows."""
+        completed = self._completed.get(quantity)
+        if not completed:
+            return []
+        open_hour = open_start - open_start % _SECONDS_PER_HOUR
+        rows: list[dict[str, Any]] = []
+        while completed and completed[0].start < open_hour:
+            hour = completed[0].start - completed[0].start % _SECONDS_PER_HOUR
+            buckets: list[_Bucket] = []
+            while completed and completed[0].start < hour + _SECONDS_PER_HOUR:
+                buckets.append(completed.pop(0))
+            rows.append(
+                {
+                    "start": datetime.fromtimestamp(hour, tz=UTC),
+                    "mean": sum(b.total / b.count for b in buckets) / len(buckets),
+                    "min": min(b.low for b in buckets),
+                    "max": max(b.high for b in buckets),
+                }
+            )
+        return rows
+
+
+def statistic_id(entry: ConfigEntry, quantity: str) -> str:
+    """External statistic id of ``quantity`` for one heater."""
+    device = re.sub(r"[^a-z0-9_]", "_", get_device_identifier(entry).lower())
+    return f"{DOMAIN}:{device}_{quantity}"
+
+
+class LongTermStatisticsWriter:
+    """Feeds refresh samples to the aggregator and imports finished hours."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the writer for one heater."""
+        self._hass = hass
+        self._aggregator = StatisticsAggregator()
+        self._metadata: dict[str, dict[str, Any]] = {
+            quantity: {
+                "has_mean": True,
+                "has_sum": False,
+                "name": f"{entry.title} {label}",
+                "source": DOMAIN,
+                "statistic_id": statistic_id(entry, quantity),
+                "unit_of_measurement": unit,
+            }
+            for quantity, (unit, label) in LTS_QUANTITIES.items()
+        }
+
+    @callback
+    def async_add_samples(
+        self, samples: dict[str, float | None], timestamp: float
+    ) -> None:
+        """Aggregate one refresh; import hours completed by it."""
+        for quantity, rows in self._aggregator.add(
+            {key: samples.get(key) for key in LTS_QUANTITIES}, timestamp
+        ).items():
+            self._async_import(quantity, rows)
+
+    @callback
+    def _async_import(self, quantity: str, rows: list[dict[str, Any]]) -> None:
+        """Queue one batch of hourly rows with the recorder."""
+        # Imported lazily: the recorder is an after-dependency, not a requirement.
+        from homeassistant.components.recorder import statistics as recorder_statistics
+
+        metadata = dict(self._metadata[quantity])
+        try:
+            from homeassistant.components.recorder.models import StatisticMeanType
+        except ImportError:
+            pass
+        else:
+            metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+        _LOGGER.debug(
+            "Importing %s hourly statistics rows for %s",
+            len(rows),
+            metadata["statistic_id"],
+        )
+        recorder_statistics.async_add_external_statistics(self._hass, metadata, rows)
@@ -1,6 +1,5 @@
 """Number entities for Kospel integration (room preset temperatures)."""
 
-import asyncio
 import logging
 
 from homeassistant.components.number import NumberDeviceClass, NumberEntity
@@ -12,18 +11,22 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from kospel_cmi import KospelError
 from kospel_cmi.controller.device import EkcoM3
 
-from .const import DOMAIN, get_device_info, get_device_identifier, get_refresh_delay_after_set
+from .const import (
+    ATTR_DATA_AGE,
+    DOMAIN,
+    ROOM_PRESET_TEMP_MAX,
+    ROOM_PRESET_TEMP_MIN,
+    ROOM_PRESET_TEMP_STEP,
+    get_device_info,
+    get_device_identifier,
+    property_registers,
+)
 from .coordinator import KospelDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-ROOM_PRESET_TEMP_MIN = 10.0
-ROOM_PRESET_TEMP_MAX = 25.0
-ROOM_PRESET_TEMP_STEP = 0.1
-
 # (translation_key / unique_id suffix / EkcoM3 property name, async setter name)
 _ROOM_PRESET_ENTITIES: list[tuple[str, str]] = [
     ("room_temperature_economy", "set_room_temperature_economy"),
@@ -63,6 +66,7 @@ class KospelRoomPresetNumberEntity(
     _attr_native_step = ROOM_PRESET_TEMP_STEP
     _attr_device_class = NumberDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
 
     def __init__(
         self,
@@ -86,6 +90,7 @@ class KospelRoomPresetNumberEntity(
         self._attr_device_info = get_device_info(entry)
         self._value_attr = value_attr
         self._setter_name = setter_name
+        self._registers = property_registers(value_attr)
 
     @property
     def native_value(self) -> float | None:
@@ -95,22 +100,32 @@ class KospelRoomPresetNumberEntity(
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.communication_ok
+        """Return if the entity's registers are fresh."""
+        return self.coordinator.registers_available(self._registers)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the age of the entity's registers in seconds."""
+        age = self.coordinator.data_age(self._registers)
+        return {ATTR_DATA_AGE: round(age)} if age is not None else {}
 
     async def async_set_native_value(self, value: float) -> None:
-        """Write preset temperature to the heater and refresh coordinator data."""
-        controller: EkcoM3 = self.coordinator.data
-        setter = getattr(controller, self._setter_name)
-        try:
-            await setter(value)
-        except KospelError as err:
-            _LOGGER.error("Failed to set %s: %s", self._setter_name, err)
-            raise HomeAssistantError(
-                f"Failed to set room preset ({self._setter_name}): {err}"
-            ) from err
+        """Write preset temperature to the heater and refresh coordinator data.
+
+        Skipped entirely when the heater already holds the value.
+        """
+        transaction = self.coordinator.transaction()
+        transaction.set_room_preset(self._setter_name, value)
+        result = await self.coordinator.async_commit(transaction)
+        if not result.writes:
+            return
         self.async_write_ha_state()
-        await asyncio.sleep(get_refresh_delay_after_set(self.coordinator.entry))
+        if not result.complete:
+            _LOGGER.error("Failed to set %s: %s", self._setter_name, result)
+            raise HomeAssistantError(
+                f"Failed to set room preset ({self._setter_name}): {result}"
+            )
+        self.coordinator.async_boost_polling()
         await self.coordinator.async_request_refresh()
 
     def _handle_coordinator_update(self) -> None:
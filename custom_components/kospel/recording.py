@@ -0,0 +1,439 @@
+"""Record-and-replay of heater register traffic.
+
+``RecordingRegisterBackend`` wraps a live backend (the HTTP backend in capture
+mode) and logs every batch read, single read and write with its timestamp.
+``ReplayRegisterBackend`` feeds such a log back to ``EkcoM3`` at real time,
+N x speed or one batch per read, reproducing partial batches, odd values and
+transport errors offline.
+
+Log format: gzip-compressed JSON lines, one gzip member per flush (members
+concatenate, so a capture can be appended to across restarts). Each recording
+session starts with a header ``{"op": "h", "v": 1, "t0": <epoch ms>}``; later
+records carry ``t`` = milliseconds since the previous record. Batch records
+are delta-encoded against the previous batch of the same range (``s`` start
+register, ``n`` count) in the session::
+
+    {"op": "b", "t": 15012, "s": "0b00", "n": 256, "d": {"0b4b": "d700"}, "x": []}
+
+``d`` holds changed or new registers, ``x`` registers missing from this batch
+that the previous one of the range had. Failures are recorded as ``"e"``
+(exception class) and ``"m"`` (message) instead of data. Writes are
+``{"op": "w", "r", "v"}``, single reads ``{"op": "r", "r", "v"}``.
+
+The module only imports the standard library and kospel_cmi.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import gzip
+import json
+import logging
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from kospel_cmi.exceptions import (
+    KospelConnectionError,
+    KospelError,
+    KospelWriteError,
+    RegisterReadError,
+)
+from kospel_cmi.registers.utils import reg_address_to_int
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FORMAT_VERSION = 1
+# Records are buffered and appended as one gzip member per flush.
+CAPTURE_FLUSH_DELAY_SECONDS = 30.0
+
+_REPLAYED_ERRORS: dict[str, type[KospelError]] = {
+    "KospelConnectionError": KospelConnectionError,
+    "RegisterReadError": RegisterReadError,
+    "KospelWriteError": KospelWriteError,
+}
+
+
+def _append_gzip_member(path: Path, lines: list[str]) -> None:
+    """Append lines as one gzip member (blocking)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as capture:
+        capture.write("".join(lines))
+
+
+class RecordingRegisterBackend:
+    """Register backend that logs all traffic of a wrapped backend."""
+
+    def __init__(
+        self,
+        backend: Any,
+        capture_path: Path,
+        flush_delay: float = CAPTURE_FLUSH_DELAY_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the recorder.
+
+        Args:
+            backend: Backend whose traffic is recorded (calls pass through).
+            capture_path: gzip JSON-lines log, appended to when it exists.
+            flush_delay: Seconds between buffered appends to the log.
+            clock: Epoch-seconds clock (injectable for tests).
+        """
+        self._backend = backend
+        self._capture_path = capture_path
+        self._flush_delay = flush_delay
+        self._clock = clock
+        self._pending: list[str] = []
+        self._last_ms: int | None = None
+        # (start register, count) -> last batch read of that range.
+        self._last_batches: dict[tuple[str, int], dict[str, str]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Future[None] | None = None
+
+    @property
+    def capture_path(self) -> Path:
+        """Path of the capture log."""
+        return self._capture_path
+
+    def _record(self, record: dict[str, Any]) -> None:
+        """Timestamp and buffer one record; schedule a flush."""
+        now_ms = int(self._clock() * 1000)
+        if self._last_ms is None:
+            self._pending.append(
+                json.dumps(
+                    {"op": "h", "v": CAPTURE_FORMAT_VERSION, "t0": now_ms},
+                    separators=(",", ":"),
+                )
+                + "\n"
+            )
+            self._last_ms = now_ms
+        record["t"] = now_ms - self._last_ms
+        self._last_ms = now_ms
+        self._pending.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._flush_delay, self._schedule_flush
+            )
+
+    @staticmethod
+    def _error_fields(err: Exception) -> dict[str, str]:
+        """Record fields describing a failed call."""
+        return {"e": type(err).__name__, "m": str(err)}
+
+    async def read_register(self, register: str) -> str:
+        """Read through the wrapped backend and record the result."""
+        try:
+            value = await self._backend.read_register(register)
+        except Exception as err:
+            self._record({"op": "r", "r": register, **self._error_fields(err)})
+            raise
+        self._record({"op": "r", "r": register, "v": value})
+        return value
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Batch-read through the wrapped backend and record the delta.
+
+        The delta is taken against the last batch of the same range, so span
+        reads (bursts, verification) do not break full-page deltas.
+        """
+        record: dict[str, Any] = {"op": "b", "s": start_register, "n": count}
+        try:
+            registers = await self._backend.read_registers(start_register, count)
+        except Exception as err:
+            self._record({**record, **self._error_fields(err)})
+            raise
+        last_batch = self._last_batches.get((start_register, count), {})
+        record["d"] = {
+            register: value
+            for register, value in registers.items()
+            if last_batch.get(register) != value
+        }
+        record["x"] = sorted(set(last_batch) - set(registers))
+        self._last_batches[start_register, count] = dict(registers)
+        self._record(record)
+        return registers
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Write through the wrapped backend and record the outcome."""
+        record: dict[str, Any] = {"op": "w", "r": register, "v": hex_value}
+        try:
+            await self._backend.write_register(register, hex_value)
+        except Exception as err:
+            self._record({**record, **self._error_fields(err)})
+            raise
+        self._record(record)
+
+    def _schedule_flush(self) -> None:
+        """Timer callback: start a flush unless one is running."""
+        self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._flush_delay, self._schedule_flush
+            )
+            return
+        self._flush_task = asyncio.ensure_future(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Append buffered records to the capture log now (executor)."""
+        if not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _append_gzip_member, self._capture_path, lines
+            )
+        except OSError as err:
+            _LOGGER.error("Could not write capture %s: %s", self._capture_path, err)
+
+    async def aclose(self) -> None:
+        """Flush the log and close the wrapped backend."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.async_flush()
+        aclose = getattr(self._backend, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class _ReplayBatch:
+    """One decoded batch record (absolute time, range, delta or error)."""
+
+    __slots__ = (
+        "time_ms",
+        "session",
+        "range",
+        "delta",
+        "missing",
+        "error",
+        "message",
+    )
+
+    def __init__(
+        self,
+        time_ms: int,
+        session: int,
+        range_: tuple[str, int],
+        delta: dict[str, str],
+        missing: list[str],
+        error: str | None,
+        message: str,
+    ) -> None:
+        """Initialize the batch.
+
+        Args:
+            time_ms: Epoch milliseconds of the read.
+            session: Index of the recording session in the log.
+            range_: Start register and count of the read.
+            delta: Registers changed since the previous batch of the range.
+            missing: Registers the previous batch of the range had, this one not.
+            error: Exception class name of a failed read, else None.
+            message: Exception message of a failed read.
+        """
+        self.time_ms = time_ms
+        self.session = session
+        self.range = range_
+        self.delta = delta
+        self.missing = missing
+        self.error = error
+        self.message = message
+
+
+def load_capture(path: Path) -> list[_ReplayBatch]:
+    """Decode batch records of a capture log (blocking).
+
+    Raises:
+        ValueError: When the file is not a capture log.
+    """
+    batches: list[_ReplayBatch] = []
+    session = -1
+    current_ms: int | None = None
+    with gzip.open(path, "rt", encoding="utf-8") as capture:
+        for line_number, line in enumerate(capture, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                _LOGGER.warning("Stopping at malformed capture line %s", line_number)
+                break
+            if record.get("op") == "h":
+                session += 1
+                current_ms = int(record["t0"])
+                continue
+            if current_ms is None:
+                raise ValueError(f"{path} does not start with a capture header")
+            current_ms += int(record.get("t", 0))
+            if record.get("op") != "b":
+                continue
+            batches.append(
+                _ReplayBatch(
+                    time_ms=current_ms,
+                    session=session,
+                    range_=(str(record["s"]), int(record["n"])),
+                    delta=dict(record.get("d", {})),
+                    missing=list(record.get("x", [])),
+                    error=record.get("e"),
+                    message=str(record.get("m", "")),
+                )
+            )
+    return batches
+
+
+class ReplayRegisterBackend:
+    """Register backend replaying batch reads from a capture log.
+
+    With ``speed > 0`` the replay position follows wall time x speed from the
+    first read; with ``speed == 0`` every batch read returns the next recorded
+    batch of the same range. A read answers from the latest batch of its
+    range; a range never recorded is answered from the other ranges' state.
+    Recorded failures are raised again. Writes are accepted and kept in
+    ``writes`` but do not change the replayed state.
+    """
+
+    def __init__(
+        self,
+        capture_path: Path,
+        speed: float = 1.0,
+        loop: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the replay (call ``async_open`` before use).
+
+        Args:
+            capture_path: Capture log written by ``RecordingRegisterBackend``.
+            speed: Replay speed multiplier; 0 advances one batch per read.
+            loop: Start over after the last batch instead of holding it.
+            clock: Monotonic clock in seconds (injectable for tests).
+        """
+        self._capture_path = capture_path
+        self._speed = speed
+        self._loop = loop
+        self._clock = clock
+        self._batches: list[_ReplayBatch] = []
+        self._times: list[int] = []
+        self._index = -1
+        # Range -> replayed registers of that range.
+        self._states: dict[tuple[str, int], dict[str, str]] = {}
+        # Range -> index of its latest applied batch.
+        self._latest: dict[tuple[str, int], int] = {}
+        self._start_wall: float | None = None
+        self.writes: list[tuple[str, str]] = []
+
+    async def async_open(self) -> None:
+        """Load the capture log (executor)."""
+        self._batches = await asyncio.get_running_loop().run_in_executor(
+            None, load_capture, self._capture_path
+        )
+        if not self._batches:
+            raise ValueError(f"{self._capture_path} contains no register batches")
+        self._times = [batch.time_ms for batch in self._batches]
+
+    @property
+    def batch_count(self) -> int:
+        """Number of recorded batches."""
+        return len(self._batches)
+
+    def _target_index(self) -> int:
+        """Index of the batch to serve at the current replay position."""
+        if self._speed <= 0:
+            target = self._index + 1
+        else:
+            now = self._clock()
+            if self._start_wall is None:
+                self._start_wall = now
+            first_ms = self._batches[0].time_ms
+            replay_ms = first_ms + (now - self._start_wall) * self._speed * 1000
+            span_ms = self._batches[-1].time_ms - first_ms
+            if self._loop and span_ms > 0 and replay_ms > self._batches[-1].time_ms:
+                replay_ms = first_ms + (replay_ms - first_ms) % span_ms
+            target = max(0, bisect.bisect_right(self._times, replay_ms) - 1)
+        if target >= len(self._batches):
+            target = 0 if self._loop else len(self._batches) - 1
+        return target
+
+    def _seek(self, target: int) -> _ReplayBatch:
+        """Apply deltas up to ``target`` (restarting when moving backwards)."""
+        if target < self._index:
+            self._index = -1
+            self._states = {}
+            self._latest = {}
+        for index in range(self._index + 1, target + 1):
+            batch = self._batches[index]
+            if index > 0 and batch.session != self._batches[index - 1].session:
+                self._states = {}
+                self._latest = {}
+            self._latest[batch.range] = index
+            if batch.error is None:
+                state = self._states.setdefault(batch.range, {})
+                for register in batch.missing:
+                    state.pop(register, None)
+                state.update(batch.delta)
+        self._index = target
+        return self._batches[target]
+
+    def _next_of_range(self, range_: tuple[str, int]) -> int:
+        """Step mode: index of the next batch of ``range_`` (or the current)."""
+        for index in range(self._index + 1, len(self._batches)):
+            if self._batches[index].range == range_:
+                return index
+        if self._loop:
+            for index in range(self._index + 1):
+                if self._batches[index].range == range_:
+                    return index
+        return self._index
+
+    def _merged_state(self) -> dict[str, str]:
+        """All replayed registers, the most recently read range winning."""
+        merged: dict[str, str] = {}
+        for _, state in sorted(
+            self._states.items(), key=lambda item: self._latest.get(item[0], -1)
+        ):
+            merged.update(state)
+        return merged
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Return the recorded batch of the range at the current position."""
+        range_ = (start_register, count)
+        if self._speed <= 0:
+            target = max(self._next_of_range(range_), 0)
+        else:
+            target = self._target_index()
+        self._seek(target)
+        index = self._latest.get(range_)
+        if index is None:
+            # Not recorded with this range: answer from what was read.
+            start = reg_address_to_int(start_register)
+            return {
+                register: value
+                for register, value in self._merged_state().items()
+                if register[:2] == start_register[:2]
+                and start <= reg_address_to_int(register) < start + count
+            }
+        batch = self._batches[index]
+        if batch.error is not None:
+            raise _REPLAYED_ERRORS.get(batch.error, KospelError)(
+                f"[replay] {batch.error}: {batch.message}"
+            )
+        return dict(self._states.get(range_, {}))
+
+    async def read_register(self, register: str) -> str:
+        """Return a register from the replayed state."""
+        if self._index < 0:
+            self._seek(self._target_index())
+        state = self._merged_state()
+        if register not in state:
+            raise RegisterReadError(f"[replay] register {register} not in capture")
+        return state[register]
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Accept a write (kept in ``writes``; the replayed state is unchanged)."""
+        self.writes.append((register, hex_value))
+        _LOGGER.debug("[replay] ignoring write %s=%s", register, hex_value)
+
+    async def aclose(self) -> None:
+        """No resources to release."""
@@ -0,0 +1,216 @@
+"""Rolling-window min/max/mean of polled values, maintained per refresh.
+
+Each window is split into ``ROLLING_BUCKETS`` time buckets holding the sum,
+count, min and max of the samples that fell into them. A new sample updates
+the newest bucket, expired buckets are dropped from the front, the mean comes
+from a running sum and count, and min/max from monotonic deques of bucket
+extremes, so every sample costs amortized constant time regardless of the
+window length. Window edges move in bucket steps (window / 60).
+
+Only the buckets are persisted (a few hundred short lists per heater), in a
+per-entry ``Store``; the deques and sums are rebuilt on load.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ROLLING_STORAGE_VERSION = 1
+# Debounce for Store writes; samples arrive on every refresh.
+ROLLING_SAVE_DELAY = 120.0
+ROLLING_BUCKETS = 60
+
+# Window key -> length in seconds.
+ROLLING_WINDOWS: dict[str, float] = {
+    "15m": 15 * 60.0,
+    "1h": 3600.0,
+    "24h": 24 * 3600.0,
+}
+ROLLING_STATISTICS = ("min", "max", "mean")
+# Quantities sampled from the controller on every refresh.
+ROLLING_QUANTITIES = ("room_temperature", "water_temperature", "pressure", "power")
+
+
+def rolling_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the Store holding the rolling windows of one config entry."""
+    return Store(hass, ROLLING_STORAGE_VERSION, f"{DOMAIN}.rolling.{entry_id}")
+
+
+class RollingWindow:
+    """Min, max and mean of the samples within a sliding time window."""
+
+    def __init__(self, window_seconds: float, buckets: int = ROLLING_BUCKETS) -> None:
+        """Initialize an empty window.
+
+        Args:
+            window_seconds: Window length.
+            buckets: Number of time buckets the window is split into.
+        """
+        self._bucket_count = buckets
+        self._bucket_seconds = window_seconds / buckets
+        # [bucket index, sum, count, min, max], oldest first.
+        self._buckets: deque[list[float]] = deque()
+        self._sum = 0.0
+        self._count = 0
+        # (bucket index, value); values increasing / decreasing from the front.
+        self._minima: deque[tuple[int, float]] = deque()
+        self._maxima: deque[tuple[int, float]] = deque()
+
+    @property
+    def minimum(self) -> float | None:
+        """Smallest sample in the window."""
+        return self._minima[0][1] if self._minima else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Largest sample in the window."""
+        return self._maxima[0][1] if self._maxima else None
+
+    @property
+    def mean(self) -> float | None:
+        """Arithmetic mean of the samples in the window."""
+        return self._sum / self._count if self._count else None
+
+    def statistic(self, name: str) -> float | None:
+        """Return ``min``, ``max`` or ``mean``."""
+        if name == "min":
+            return self.minimum
+        if name == "max":
+            return self.maximum
+        return self.mean
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add a sample taken at ``timestamp`` (epoch seconds)."""
+        index = int(timestamp // self._bucket_seconds)
+        self._expire(index)
+        newest = self._buckets[-1] if self._buckets else None
+        if newest is not None and newest[0] >= index:
+            # Same bucket (or clock stepped back): fold into the newest one.
+            index = int(newest[0])
+            newest[1] += value
+            newest[2] += 1
+            newest[3] = min(newest[3], value)
+            newest[4] = max(newest[4], value)
+        else:
+            self._buckets.append([index, value, 1, value, value])
+        self._sum += value
+        self._count += 1
+        self._push_extremes(index, value, value)
+
+    def _push_extremes(self, index: int, low: float, high: float) -> None:
+        """Push a bucket's extremes onto the monotonic deques."""
+        while self._minima and self._minima[-1][1] >= low:
+            self._minima.pop()
+        self._minima.append((index, low))
+        while self._maxima and self._maxima[-1][1] <= high:
+            self._maxima.pop()
+        self._maxima.append((index, high))
+
+    def _expire(self, now_index: int) -> None:
+        """Drop buckets that fell out of the window ending at ``now_index``."""
+        oldest = now_index - self._bucket_count + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            bucket = self._buckets.popleft()
+            self._sum -= bucket[1]
+            self._count -= int(bucket[2])
+        if not self._buckets:
+            self._sum = 0.0
+            self._count = 0
+        while self._minima and self._minima[0][0] < oldest:
+            self._minima.popleft()
+        while self._maxima and self._maxima[0][0] < oldest:
+            self._maxima.popleft()
+
+    def to_list(self) -> list[list[float]]:
+        """Serialize the buckets."""
+        return [list(bucket) for bucket in self._buckets]
+
+    def load_list(self, buckets: list[list[float]]) -> None:
+        """Rebuild the window from serialized buckets (oldest first)."""
+        self._buckets.clear()
+        self._minima.clear()
+        self._maxima.clear()
+        self._sum = 0.0
+        self._count = 0
+        for raw in buckets:
+            index, total, count, low, high = raw
+            bucket = [int(index), float(total), int(count), float(low), float(high)]
+            self._buckets.append(bucket)
+            self._sum += bucket[1]
+            self._count += bucket[2]
+            self._push_extremes(bucket[0], bucket[3], bucket[4])
+
+
+class RollingStatistics:
+    """Rolling windows for several named quantities, persisted per entry."""
+
+    def __init__(
+        self,
+        store: Store,
+        quantities: tuple[str, ...],
+        windows: dict[str, float] = ROLLING_WINDOWS,
+    ) -> None:
+        """Initialize empty windows for each quantity and window length.
+
+        Args:
+            store: Home Assistant Store used for persistence.
+            quantities: Names of the sampled quantities.
+            windows: Window key -> window length in seconds.
+        """
+        self._store = store
+        self._windows: dict[str, dict[str, RollingWindow]] = {
+            quantity: {key: RollingWindow(seconds) for key, seconds in windows.items()}
+            for quantity in quantities
+        }
+
+    def window(self, quantity: str, window_key: str) -> RollingWindow:
+        """Return the window of ``quantity`` with length ``window_key``."""
+        return self._windows[quantity][window_key]
+
+    async def async_load(self) -> None:
+        """Restore persisted buckets; malformed windows start empty."""
+        data = await self._store.async_load()
+        for quantity, windows in ((data or {}).get("windows") or {}).items():
+            for key, buckets in (windows or {}).items():
+                window = self._windows.get(quantity, {}).get(key)
+                if window is None:
+                    continue
+                try:
+                    window.load_list(buckets)
+                except (TypeError, ValueError):
+                    _LOGGER.debug("Dropping malformed rolling window %s/%s", quantity, key)
+                    window.load_list([])
+
+    @callback
+    def async_add_samples(
+        self, samples: dict[str, float | None], timestamp: float
+    ) -> None:
+        """Add one sample per quantity (None values are skipped); schedule a save."""
+        for quantity, value in samples.items():
+            if value is None or quantity not in self._windows:
+                continue
+            for window in self._windows[quantity].values():
+                window.add(float(value), timestamp)
+        self._store.async_delay_save(self._data_to_save, ROLLING_SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        """Write the windows now (on unload)."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize the buckets of all windows for the Store."""
+        return {
+            "windows": {
+                quantity: {key: window.to_list() for key, window in windows.items()}
+                for quantity, windows in self._windows.items()
+            }
+        }
@@ -0,0 +1,151 @@
+"""Runtime counters and duty cycles from polled heater states.
+
+The coordinator passes the state of each tracked dimension (CH status, DHW
+status, valve position, heater mode) on every refresh. The interval since the
+previous refresh is credited to the states seen at that refresh, so each
+counter holds the cumulative time spent in one state. Duty cycles are
+exponentially weighted time shares (``DUTY_CYCLE_TIME_CONSTANT_SECONDS``,
+roughly the last day), updated in the same pass, so reading either costs a
+dictionary lookup.
+
+Intervals longer than ``RUNTIME_MAX_GAP_SECONDS`` (heater unreachable, Home
+Assistant stopped) are not credited to any state. Counters persist in a
+per-entry ``Store`` with batched (debounced) saves.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+RUNTIME_STORAGE_VERSION = 1
+# Debounce for Store writes; counters change on every refresh.
+RUNTIME_SAVE_DELAY = 300.0
+# Longer intervals between refreshes are not credited to any state.
+RUNTIME_MAX_GAP_SECONDS = 300.0
+DUTY_CYCLE_TIME_CONSTANT_SECONDS = 24 * 3600.0
+
+# Tracked dimensions.
+RUNTIME_CH = "ch"
+RUNTIME_DHW = "dhw"
+RUNTIME_VALVE = "valve"
+RUNTIME_MODE = "mode"
+
+
+def runtime_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the Store holding the runtime counters of one config entry."""
+    return Store(hass, RUNTIME_STORAGE_VERSION, f"{DOMAIN}.runtime.{entry_id}")
+
+
+class RuntimeCounters:
+    """Cumulative time and duty cycle per (dimension, state)."""
+
+    def __init__(
+        self,
+        store: Store,
+        max_gap_seconds: float = RUNTIME_MAX_GAP_SECONDS,
+        duty_time_constant: float = DUTY_CYCLE_TIME_CONSTANT_SECONDS,
+    ) -> None:
+        """Initialize empty counters backed by ``store``.
+
+        Args:
+            store: Home Assistant Store used for persistence.
+            max_gap_seconds: Refresh intervals longer than this are not credited.
+            duty_time_constant: Time constant of the duty-cycle average.
+        """
+        self._store = store
+        self._max_gap_seconds = max_gap_seconds
+        self._duty_time_constant = duty_time_constant
+        # dimension -> state -> seconds / duty fraction (0..1)
+        self._seconds: dict[str, dict[str, float]] = {}
+        self._duty: dict[str, dict[str, float]] = {}
+        self._states: dict[str, str] = {}
+        self._last_timestamp: float | None = None
+
+    def runtime_seconds(self, dimension: str, state: str) -> float:
+        """Total seconds spent in ``state``."""
+        return self._seconds.get(dimension, {}).get(state, 0.0)
+
+    def duty_cycle(self, dimension: str, state: str) -> float:
+        """Recent share of time spent in ``state`` (0..1)."""
+        return self._duty.get(dimension, {}).get(state, 0.0)
+
+    async def async_load(self) -> None:
+        """Restore persisted counters; malformed data starts from zero."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        try:
+            self._seconds = {
+                dimension: {state: float(value) for state, value in states.items()}
+                for dimension, states in data["seconds"].items()
+            }
+            self._duty = {
+                dimension: {state: float(value) for state, value in states.items()}
+                for dimension, states in data["duty"].items()
+            }
+            self._states = {
+                str(dimension): str(state)
+                for dimension, state in data.get("states", {}).items()
+            }
+            last = data.get("last_timestamp")
+            self._last_timestamp = float(last) if last is not None else None
+        except (AttributeError, KeyError, TypeError, ValueError):
+            _LOGGER.warning("Discarding malformed runtime counters")
+            self._seconds = {}
+            self._duty = {}
+            self._states = {}
+            self._last_timestamp = None
+
+    @callback
+    def async_update(self, states: dict[str, str | None], timestamp: float) -> None:
+        """Credit the interval since the last refresh, then record new states.
+
+        Args:
+            states: Dimension -> current state (None when unknown).
+            timestamp: Refresh time in epoch seconds.
+        """
+        last = self._last_timestamp
+        if last is not None:
+            elapsed = timestamp - last
+            if 0 < elapsed <= self._max_gap_seconds:
+                self._credit(elapsed)
+        self._last_timestamp = timestamp
+        self._states = {
+            dimension: state for dimension, state in states.items() if state is not None
+        }
+        self._store.async_delay_save(self._data_to_save, RUNTIME_SAVE_DELAY)
+
+    def _credit(self, elapsed: float) -> None:
+        """Add ``elapsed`` to the current states and decay the duty cycles."""
+        weight = math.exp(-elapsed / self._duty_time_constant)
+        for dimension, current in self._states.items():
+            seconds = self._seconds.setdefault(dimension, {})
+            seconds[current] = seconds.get(current, 0.0) + elapsed
+            duty = self._duty.setdefault(dimension, {})
+            duty.setdefault(current, 0.0)
+            for state, share in duty.items():
+                duty[state] = share * weight + (
+                    1.0 - weight if state == current else 0.0
+                )
+
+    async def async_flush(self) -> None:
+        """Write the counters now (on unload)."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Serialize the counters for the Store."""
+        return {
+            "seconds": self._seconds,
+            "duty": self._duty,
+            "states": self._states,
+            "last_timestamp": self._last_timestamp,
+        }
@@ -0,0 +1,196 @@
+"""Per-host request scheduling for heater modules.
+
+The CMI module's HTTP server handles requests one at a time; a write racing a
+256-register poll makes both slow. ``RequestScheduler`` keeps at most one
+request in flight per module host and runs queued requests by priority:
+writes before reads, otherwise in order of arrival. A read identical to one
+still waiting in the queue (the same target, range) joins it instead of
+queueing again, so a post-write refresh supersedes a poll queued before it.
+
+``ScheduledRegisterBackend`` routes a backend's calls through the scheduler
+of its host; every entry on the same module shares that scheduler.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import weakref
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_WRITE = 0
+PRIORITY_READ = 1
+
+# host -> scheduler, alive while any backend of the host uses it.
+_SCHEDULERS: weakref.WeakValueDictionary[str, RequestScheduler] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def request_scheduler(host: str) -> RequestScheduler:
+    """Return the scheduler shared by all backends talking to ``host``."""
+    scheduler = _SCHEDULERS.get(host)
+    if scheduler is None:
+        scheduler = _SCHEDULERS[host] = RequestScheduler(host)
+    return scheduler
+
+
+@dataclass(order=True)
+class _Request:
+    """One queued request; ordered by priority, then arrival."""
+
+    priority: int
+    seq: int
+    call: Callable[[], Awaitable[Any]] = field(compare=False)
+    key: Hashable | None = field(compare=False)
+    future: asyncio.Future[Any] = field(compare=False)
+    waiters: int = field(default=0, compare=False)
+    started: bool = field(default=False, compare=False)
+
+
+class RequestScheduler:
+    """Priority queue running one request at a time for one module."""
+
+    def __init__(self, host: str) -> None:
+        """Initialize an idle scheduler for ``host``."""
+        self._host = host
+        self._queue: list[_Request] = []
+        self._queued_by_key: dict[Hashable, _Request] = {}
+        self._seq = itertools.count()
+        self._worker: asyncio.Future[None] | None = None
+        self.coalesced = 0
+
+    @property
+    def host(self) -> str:
+        """Module host the scheduler serves."""
+        return self._host
+
+    @property
+    def queue_length(self) -> int:
+        """Requests waiting for their turn (not counting the one in flight)."""
+        return len(self._queue)
+
+    async def submit(
+        self,
+        priority: int,
+        call: Callable[[], Awaitable[Any]],
+        key: Hashable | None = None,
+    ) -> Any:
+        """Queue ``call`` and return its result once it ran.
+
+        Args:
+            priority: ``PRIORITY_WRITE`` or ``PRIORITY_READ`` (lower runs first).
+            call: Starts the request when invoked.
+            key: Identical queued requests with the same key share one run.
+        """
+        request = self._queued_by_key.get(key) if key is not None else None
+        if request is None or request.future.done():
+            request = _Request(
+                priority,
+                next(self._seq),
+                call,
+                key,
+                asyncio.get_running_loop().create_future(),
+            )
+            heapq.heappush(self._queue, request)
+            if key is not None:
+                self._queued_by_key[key] = request
+            if self._worker is None or self._worker.done():
+                self._worker = asyncio.ensure_future(self._async_run())
+        else:
+            self.coalesced += 1
+            _LOGGER.debug("Joining queued request %s on %s", key, self._host)
+        request.waiters += 1
+        try:
+            return await asyncio.shield(request.future)
+        except asyncio.CancelledError:
+            request.waiters -= 1
+            if not request.waiters and not request.started:
+                # Nobody waits any more: skip it when its turn comes, and do
+                # not let a later identical request join it.
+                request.future.cancel()
+                if self._queued_by_key.get(key) is request:
+                    del self._queued_by_key[key]
+            raise
+
+    async def _async_run(self) -> None:
+        """Run queued requests one by one until the queue is empty."""
+        while self._queue:
+            request = heapq.heappop(self._queue)
+            if request.key is not None and (
+                self._queued_by_key.get(request.key) is request
+            ):
+                del self._queued_by_key[request.key]
+            if request.future.done():
+                continue
+            request.started = True
+            try:
+                result = await request.call()
+            except Exception as err:  # noqa: BLE001 - handed to the waiters
+                if request.waiters:
+                    request.future.set_exception(err)
+                else:
+                    request.future.cancel()
+            else:
+                request.future.set_result(result)
+
+
+class ScheduledRegisterBackend:
+    """Register backend whose calls go through a host's ``RequestScheduler``."""
+
+    def __init__(
+        self, backend: Any, scheduler: RequestScheduler, target: str | None = None
+    ) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            backend: Backend doing the actual requests.
+            scheduler: Scheduler of the backend's host (see ``request_scheduler``).
+            target: What the backend talks to, keying identical reads (the
+                device API URL when several devices share the module);
+                defaults to the scheduler's host.
+        """
+        self._backend = backend
+        self._scheduler = scheduler
+        self._target = target or scheduler.host
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """Scheduler shared with the other backends of the host."""
+        return self._scheduler
+
+    async def read_register(self, register: str) -> str:
+        """Read one register when the module is free."""
+        return await self._scheduler.submit(
+            PRIORITY_READ,
+            lambda: self._backend.read_register(register),
+            key=(self._target, register),
+        )
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Batch-read when the module is free (joins an identical queued read)."""
+        registers = await self._scheduler.submit(
+            PRIORITY_READ,
+            lambda: self._backend.read_registers(start_register, count),
+            key=(self._target, start_register, count),
+        )
+        # Callers sharing one read must not share (and mutate) one dict.
+        return dict(registers)
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Write ahead of queued reads."""
+        await self._scheduler.submit(
+            PRIORITY_WRITE, lambda: self._backend.write_register(register, hex_value)
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped backend."""
+        aclose = getattr(self._backend, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -1,6 +1,5 @@
 """Select entities for Kospel integration (boiler max power index)."""
 
-import asyncio
 import logging
 
 from homeassistant.components.select import SelectEntity
@@ -11,11 +10,16 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from kospel_cmi import KospelError
 from kospel_cmi.controller.device import EkcoM3
 from kospel_cmi.registers.enums import BoilerMaxPowerIndex
 
-from .const import DOMAIN, get_device_info, get_device_identifier, get_refresh_delay_after_set
+from .const import (
+    ATTR_DATA_AGE,
+    DOMAIN,
+    get_device_info,
+    get_device_identifier,
+    property_registers,
+)
 from .coordinator import KospelDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,6 +63,8 @@ class KospelBoilerMaxPowerSelectEntity(
     _attr_translation_key = "boiler_max_power"
     _attr_entity_category = EntityCategory.CONFIG
     _attr_options = [_OPTION_FOR_INDEX[idx] for idx in _BOILER_MAX_POWER_ORDER]
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
+    _registers = property_registers("boiler_max_power_index")
 
     def __init__(
         self,
@@ -87,25 +93,34 @@ class KospelBoilerMaxPowerSelectEntity(
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.communication_ok
+        """Return if the entity's registers are fresh."""
+        return self.coordinator.registers_available(self._registers)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the age of the entity's registers in seconds."""
+        age = self.coordinator.data_age(self._registers)
+        return {ATTR_DATA_AGE: round(age)} if age is not None else {}
 
     async def async_select_option(self, option: str) -> None:
-        """Write the selected power step to the heater and refresh coordinator data."""
+        """Write the selected power step to the heater and refresh coordinator data.
+
+        Skipped entirely when the heater already uses that step.
+        """
         chosen = _INDEX_FOR_OPTION.get(option)
         if chosen is None:
             raise ValueError(f"Invalid option: {option}")
 
-        controller: EkcoM3 = self.coordinator.data
-        try:
-            await controller.set_boiler_max_power_index(chosen)
-        except KospelError as err:
-            _LOGGER.error("Failed to set boiler max power: %s", err)
-            raise HomeAssistantError(
-                f"Failed to set boiler max power: {err}"
-            ) from err
+        transaction = self.coordinator.transaction()
+        transaction.set_boiler_max_power_index(chosen)
+        result = await self.coordinator.async_commit(transaction)
+        if not result.writes:
+            return
         self.async_write_ha_state()
-        await asyncio.sleep(get_refresh_delay_after_set(self.coordinator.entry))
+        if not result.complete:
+            _LOGGER.error("Failed to set boiler max power: %s", result)
+            raise HomeAssistantError(f"Failed to set boiler max power: {result}")
+        self.coordinator.async_boost_polling()
         await self.coordinator.async_request_refresh()
 
     def _handle_coordinator_update(self) -> None:
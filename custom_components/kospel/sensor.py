@@ -1,5 +1,6 @@
 """Sensor entities for Kospel integration."""
 
+import time
 from collections.abc import Callable
 
 from homeassistant.components.sensor import (
@@ -8,14 +9,33 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfPower, UnitOfPressure, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfPressure,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, get_device_info, get_device_identifier
+from .const import (
+    ATTR_DATA_AGE,
+    ATTR_GAP_COUNT,
+    ATTR_GAP_SECONDS,
+    DOMAIN,
+    get_device_info,
+    get_device_identifier,
+    property_registers,
+)
 from .coordinator import KospelDataUpdateCoordinator
+from .rolling import ROLLING_QUANTITIES, ROLLING_STATISTICS, ROLLING_WINDOWS
+from .runtime import RUNTIME_CH, RUNTIME_DHW, RUNTIME_MODE, RUNTIME_VALVE
+
+from kospel_cmi.registers.enums import HeaterMode, HeatingStatus, ValvePosition
 
 from kospel_cmi.controller.device import EkcoM3
 
@@ -44,6 +64,7 @@ async def async_setup_entry(
                 entry,
                 unique_id_suffix,
                 lambda c, name=attr_name: getattr(c, name, None),
+                registers=property_registers(attr_name),
             )
         )
 
@@ -53,6 +74,38 @@ async def async_setup_entry(
     # Power sensor
     entities.append(KospelPowerSensor(coordinator, entry))
 
+    # Energy integrated from power at every refresh (Energy dashboard)
+    entities.append(KospelEnergySensor(coordinator, entry))
+
+    # Runtime and duty cycle: (dimension, state, unique_id prefix, enabled by default)
+    runtime_counters = [
+        (RUNTIME_CH, HeatingStatus.RUNNING.value, "ch", True),
+        (RUNTIME_DHW, HeatingStatus.RUNNING.value, "dhw", True),
+    ]
+    runtime_counters.extend(
+        (RUNTIME_VALVE, position.value, f"valve_{position.value.lower()}", False)
+        for position in ValvePosition
+    )
+    runtime_counters.extend(
+        (RUNTIME_MODE, mode.value, f"mode_{mode.value}", False) for mode in HeaterMode
+    )
+    for dimension, state, prefix, enabled in runtime_counters:
+        entities.append(
+            KospelRuntimeSensor(coordinator, entry, dimension, state, prefix, enabled)
+        )
+        entities.append(
+            KospelDutyCycleSensor(coordinator, entry, dimension, state, prefix, enabled)
+        )
+
+    # Optional rolling-window statistics (options flow)
+    if coordinator.rolling is not None:
+        entities.extend(
+            KospelRollingStatisticSensor(coordinator, entry, quantity, window, statistic)
+            for quantity in ROLLING_QUANTITIES
+            for window in ROLLING_WINDOWS
+            for statistic in ROLLING_STATISTICS
+        )
+
     # Configured max boiler power limit (kW from device, exposed as W)
     entities.append(KospelMaxPowerLimitSensor(coordinator, entry))
 
@@ -71,9 +124,16 @@ async def async_setup_entry(
 
 
 class KospelSensorEntity(CoordinatorEntity[KospelDataUpdateCoordinator], SensorEntity):
-    """Base class for Kospel sensor entities."""
+    """Base class for Kospel sensor entities.
+
+    ``_registers`` lists the registers behind the value; availability and the
+    ``data_age`` attribute follow them. Derived sensors (energy, runtime,
+    statistics) leave it empty and follow ``communication_ok``.
+    """
 
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
+    _registers: tuple[str, ...] = ()
 
     def __init__(
         self,
@@ -88,11 +148,35 @@ class KospelSensorEntity(CoordinatorEntity[KospelDataUpdateCoordinator], SensorE
         self._attr_unique_id = f"{device_id}_{unique_id_suffix}"
         self._attr_translation_key = translation_key
         self._attr_device_info = get_device_info(entry)
+        self._last_state_write: float | None = None
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.communication_ok
+        """Return if the entity's registers are fresh."""
+        return self.coordinator.registers_available(self._registers)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int]:
+        """Return the age of the entity's registers in seconds."""
+        age = self.coordinator.data_age(self._registers)
+        return {ATTR_DATA_AGE: round(age)} if age is not None else {}
+
+    def _async_write_throttled_state(self) -> None:
+        """Write state at most every ``coordinator.state_write_interval`` seconds.
+
+        Used by telemetry sensors, whose history can come from long-term
+        statistics instead of one recorder row per refresh.
+        """
+        interval = self.coordinator.state_write_interval
+        now = time.monotonic()
+        if (
+            interval > 0
+            and self._last_state_write is not None
+            and now - self._last_state_write < interval
+        ):
+            return
+        self._last_state_write = now
+        self.async_write_ha_state()
 
 
 class KospelTemperatureSensor(KospelSensorEntity):
@@ -108,10 +192,12 @@ class KospelTemperatureSensor(KospelSensorEntity):
         entry: ConfigEntry,
         unique_id_suffix: str,
         value_getter: Callable[[EkcoM3], float | None],
+        registers: tuple[str, ...] = (),
     ) -> None:
         """Initialize the temperature sensor."""
         super().__init__(coordinator, entry, unique_id_suffix, unique_id_suffix)
         self._value_getter = value_getter
+        self._registers = registers
 
     @property
     def native_value(self) -> float | None:
@@ -120,8 +206,8 @@ class KospelTemperatureSensor(KospelSensorEntity):
         return self._value_getter(controller)
 
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Handle updated data from the coordinator (throttled)."""
+        self._async_write_throttled_state()
 
 
 class KospelPressureSensor(KospelSensorEntity):
@@ -130,6 +216,7 @@ class KospelPressureSensor(KospelSensorEntity):
     _attr_device_class = SensorDeviceClass.PRESSURE
     _attr_native_unit_of_measurement = UnitOfPressure.BAR
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _registers = property_registers("pressure")
 
     def __init__(
         self,
@@ -146,8 +233,8 @@ class KospelPressureSensor(KospelSensorEntity):
         return controller.pressure
 
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Handle updated data from the coordinator (throttled)."""
+        self._async_write_throttled_state()
 
 
 class KospelPowerSensor(KospelSensorEntity):
@@ -160,6 +247,7 @@ class KospelPowerSensor(KospelSensorEntity):
     _attr_device_class = SensorDeviceClass.POWER
     _attr_native_unit_of_measurement = UnitOfPower.WATT
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _registers = property_registers("power")
 
     def __init__(
         self,
@@ -178,6 +266,177 @@ class KospelPowerSensor(KospelSensorEntity):
             return None
         return power_kw * 1000.0
 
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator (throttled)."""
+        self._async_write_throttled_state()
+
+
+class KospelEnergySensor(KospelSensorEntity):
+    """Heating energy in kWh, integrated from power by the coordinator.
+
+    See ``EnergyIntegrator``: trapezoidal rule over refresh samples, gaps
+    longer than ``ENERGY_MAX_GAP_SECONDS`` are skipped and reported as
+    attributes.
+    """
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 2
+    _unrecorded_attributes = frozenset(
+        {ATTR_DATA_AGE, ATTR_GAP_COUNT, ATTR_GAP_SECONDS}
+    )
+
+    def __init__(
+        self,
+        coordinator: KospelDataUpdateCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        """Initialize the energy sensor."""
+        super().__init__(coordinator, entry, "energy", "energy")
+
+    @property
+    def native_value(self) -> float:
+        """Return the integrated energy in kWh."""
+        return round(self.coordinator.energy.total_kwh, 4)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, float | int]:
+        """Return how much time could not be integrated."""
+        energy = self.coordinator.energy
+        return {
+            ATTR_GAP_COUNT: energy.gap_count,
+            ATTR_GAP_SECONDS: round(energy.gap_seconds),
+        }
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
+
+
+class KospelRuntimeSensor(KospelSensorEntity):
+    """Cumulative hours a circuit, valve position or heater mode was active.
+
+    Read from the coordinator's ``RuntimeCounters`` (credited on every refresh).
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        coordinator: KospelDataUpdateCoordinator,
+        entry: ConfigEntry,
+        dimension: str,
+        state: str,
+        prefix: str,
+        enabled_default: bool,
+    ) -> None:
+        """Initialize the runtime sensor."""
+        super().__init__(coordinator, entry, f"{prefix}_runtime", f"{prefix}_runtime")
+        self._dimension = dimension
+        self._state = state
+        self._attr_entity_registry_enabled_default = enabled_default
+
+    @property
+    def native_value(self) -> float:
+        """Return the cumulative runtime in hours."""
+        seconds = self.coordinator.runtime.runtime_seconds(self._dimension, self._state)
+        return round(seconds / 3600.0, 3)
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
+
+
+class KospelDutyCycleSensor(KospelSensorEntity):
+    """Recent share of time (about a day) a circuit, valve or mode was active."""
+
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        coordinator: KospelDataUpdateCoordinator,
+        entry: ConfigEntry,
+        dimension: str,
+        state: str,
+        prefix: str,
+        enabled_default: bool,
+    ) -> None:
+        """Initialize the duty cycle sensor."""
+        super().__init__(
+            coordinator, entry, f"{prefix}_duty_cycle", f"{prefix}_duty_cycle"
+        )
+        self._dimension = dimension
+        self._state = state
+        self._attr_entity_registry_enabled_default = enabled_default
+
+    @property
+    def native_value(self) -> float:
+        """Return the duty cycle in percent."""
+        share = self.coordinator.runtime.duty_cycle(self._dimension, self._state)
+        return round(share * 100.0, 2)
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state()
+
+
+class KospelRollingStatisticSensor(KospelSensorEntity):
+    """Min, max or mean of a polled quantity over a rolling window.
+
+    Values come from the coordinator's ``RollingStatistics`` (updated on every
+    refresh), not from recorder queries.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    _QUANTITY_UNITS: dict[str, tuple[SensorDeviceClass, str]] = {
+        "room_temperature": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+        "water_temperature": (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+        "pressure": (SensorDeviceClass.PRESSURE, UnitOfPressure.BAR),
+        "power": (SensorDeviceClass.POWER, UnitOfPower.WATT),
+    }
+    _WINDOW_LABELS = {"15m": "15 min", "1h": "1 h", "24h": "24 h"}
+
+    def __init__(
+        self,
+        coordinator: KospelDataUpdateCoordinator,
+        entry: ConfigEntry,
+        quantity: str,
+        window: str,
+        statistic: str,
+    ) -> None:
+        """Initialize the rolling statistic sensor."""
+        super().__init__(
+            coordinator,
+            entry,
+            f"{quantity}_{statistic}_{window}",
+            f"{quantity}_{statistic}",
+        )
+        self._quantity = quantity
+        self._window = window
+        self._statistic = statistic
+        self._attr_device_class, self._attr_native_unit_of_measurement = (
+            self._QUANTITY_UNITS[quantity]
+        )
+        self._attr_translation_placeholders = {
+            "window": self._WINDOW_LABELS.get(window, window)
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the statistic over the window."""
+        value = self.coordinator.rolling.window(
+            self._quantity, self._window
+        ).statistic(self._statistic)
+        return round(value, 3) if value is not None else None
+
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self.async_write_ha_state()
@@ -195,6 +454,7 @@ class KospelMaxPowerLimitSensor(KospelSensorEntity):
     _attr_native_unit_of_measurement = UnitOfPower.WATT
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _registers = property_registers("boiler_max_power_kw")
 
     def __init__(
         self,
@@ -231,6 +491,7 @@ class KospelHeatingStatusSensor(KospelSensorEntity):
         """Initialize the heating status sensor."""
         super().__init__(coordinator, entry, unique_id_suffix, unique_id_suffix)
         self._setting_name = setting_name
+        self._registers = property_registers(setting_name)
 
     @property
     def native_value(self) -> str | None:
@@ -251,6 +512,8 @@ class KospelHeatingStatusSensor(KospelSensorEntity):
 class KospelValvePositionSensor(KospelSensorEntity):
     """Representation of a Kospel valve position sensor."""
 
+    _registers = property_registers("valve_position")
+
     def __init__(
         self,
         coordinator: KospelDataUpdateCoordinator,
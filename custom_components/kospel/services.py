@@ -0,0 +1,311 @@
+"""Services of the Kospel integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from kospel_cmi.registers.enums import BoilerMaxPowerIndex, HeaterMode
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import service as service_helper
+
+from .const import (
+    BURST_DEFAULT_DURATION_MINUTES,
+    BURST_DEFAULT_INTERVAL_SECONDS,
+    BURST_DEFAULT_REGISTERS,
+    BURST_DURATION_MAX_MINUTES,
+    BURST_INTERVAL_MAX_SECONDS,
+    BURST_INTERVAL_MIN_SECONDS,
+    BULK_SET_HOST_PARALLEL,
+    BULK_SET_MAX_PARALLEL,
+    CONF_HEATER_IP,
+    DOMAIN,
+    MANUAL_TEMP_MAX,
+    MANUAL_TEMP_MIN,
+    ROOM_PRESET_TEMP_MAX,
+    ROOM_PRESET_TEMP_MIN,
+)
+from .coordinator import KospelDataUpdateCoordinator
+from .transaction import RegisterTransaction, TransactionResult
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_START_BURST = "start_burst"
+SERVICE_BULK_SET = "bulk_set"
+
+ATTR_REGISTERS = "registers"
+ATTR_INTERVAL = "interval"
+ATTR_DURATION = "duration"
+ATTR_HEATER_MODE = "heater_mode"
+ATTR_MANUAL_TEMPERATURE = "manual_temperature"
+ATTR_MAX_POWER = "max_power"
+
+# bulk_set field -> room preset setter (see RegisterTransaction.set_room_preset).
+_ROOM_PRESET_FIELDS: dict[str, str] = {
+    "room_temperature_economy": "set_room_temperature_economy",
+    "room_temperature_comfort": "set_room_temperature_comfort",
+    "room_temperature_comfort_plus": "set_room_temperature_comfort_plus",
+    "room_temperature_comfort_minus": "set_room_temperature_comfort_minus",
+}
+# bulk_set max power (kW) -> power step index, as the select entity offers.
+_MAX_POWER_INDEX: dict[int, BoilerMaxPowerIndex] = {
+    2: BoilerMaxPowerIndex.KW_2,
+    4: BoilerMaxPowerIndex.KW_4,
+    6: BoilerMaxPowerIndex.KW_6,
+    8: BoilerMaxPowerIndex.KW_8,
+}
+
+REGISTER_ADDRESS = vol.All(cv.string, vol.Lower, vol.Match(r"^0b[0-9a-f]{2}$"))
+
+# Targets like bulk_set (see async_target_heaters).
+START_BURST_SCHEMA = vol.Schema(
+    {
+        **cv.TARGET_SERVICE_FIELDS,
+        vol.Optional(
+            ATTR_REGISTERS, default=list(BURST_DEFAULT_REGISTERS)
+        ): vol.All(cv.ensure_list, [REGISTER_ADDRESS], vol.Length(min=1)),
+        vol.Optional(ATTR_INTERVAL, default=BURST_DEFAULT_INTERVAL_SECONDS): vol.All(
+            vol.Coerce(float),
+            vol.Range(min=BURST_INTERVAL_MIN_SECONDS, max=BURST_INTERVAL_MAX_SECONDS),
+        ),
+        vol.Optional(ATTR_DURATION, default=BURST_DEFAULT_DURATION_MINUTES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BURST_DURATION_MAX_MINUTES)
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+_PRESET_TEMPERATURE = vol.All(
+    vol.Coerce(float), vol.Range(min=ROOM_PRESET_TEMP_MIN, max=ROOM_PRESET_TEMP_MAX)
+)
+
+# Targets: devices, entities, areas, floors or labels (see async_target_heaters).
+BULK_SET_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **cv.TARGET_SERVICE_FIELDS,
+            vol.Optional(ATTR_HEATER_MODE): vol.In([mode.value for mode in HeaterMode]),
+            vol.Optional(ATTR_MANUAL_TEMPERATURE): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=MANUAL_TEMP_MIN, max=MANUAL_TEMP_MAX),
+            ),
+            **{vol.Optional(field): _PRESET_TEMPERATURE for field in _ROOM_PRESET_FIELDS},
+            vol.Optional(ATTR_MAX_POWER): vol.All(
+                vol.Coerce(int), vol.In(list(_MAX_POWER_INDEX))
+            ),
+        },
+        extra=vol.ALLOW_EXTRA,
+    ),
+    cv.has_at_least_one_key(
+        ATTR_HEATER_MODE, ATTR_MANUAL_TEMPERATURE, *_ROOM_PRESET_FIELDS, ATTR_MAX_POWER
+    ),
+)
+
+
+@callback
+def async_coordinators_for_devices(
+    hass: HomeAssistant, device_ids: list[str]
+) -> list[KospelDataUpdateCoordinator]:
+    """Return the coordinators of the loaded heaters behind ``device_ids``.
+
+    Raises:
+        ServiceValidationError: A device is unknown or not a loaded Kospel heater.
+    """
+    registry = dr.async_get(hass)
+    loaded: dict[str, KospelDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    coordinators: list[KospelDataUpdateCoordinator] = []
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        coordinator = next(
+            (
+                loaded[entry_id]
+                for entry_id in (device.config_entries if device else ())
+                if entry_id in loaded
+            ),
+            None,
+        )
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"Device {device_id} is not a loaded Kospel heater"
+            )
+        if coordinator not in coordinators:
+            coordinators.append(coordinator)
+    return coordinators
+
+
+@callback
+def async_target_heaters(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, KospelDataUpdateCoordinator]:
+    """Return the loaded heaters targeted by ``call``, by device id.
+
+    Devices named in ``device_id`` must be loaded Kospel heaters. Entities,
+    areas, floors and labels select the Kospel heaters among their devices.
+
+    Raises:
+        ServiceValidationError: A named device is not a loaded Kospel heater,
+            or the target holds no Kospel heater at all.
+    """
+    named = list(call.data.get(ATTR_DEVICE_ID, []))
+    targets = {
+        device_id: async_coordinators_for_devices(hass, [device_id])[0]
+        for device_id in named
+    }
+    selected = service_helper.async_extract_referenced_entity_ids(hass, call)
+    entity_registry = er.async_get(hass)
+    device_ids = set(selected.referenced_devices)
+    for entity_id in selected.referenced | selected.indirectly_referenced:
+        entity = entity_registry.async_get(entity_id)
+        if entity is not None and entity.device_id is not None:
+            device_ids.add(entity.device_id)
+    for device_id in sorted(device_ids - set(named)):
+        try:
+            targets[device_id] = async_coordinators_for_devices(hass, [device_id])[0]
+        except ServiceValidationError:
+            continue
+    if not targets:
+        raise ServiceValidationError("The target holds no loaded Kospel heater")
+    return targets
+
+
+def plan_bulk_settings(transaction: RegisterTransaction, settings: dict[str, Any]) -> None:
+    """Plan the ``bulk_set`` settings present in ``settings``.
+
+    Raises:
+        ValueError: A setting cannot be encoded for this heater.
+    """
+    if ATTR_HEATER_MODE in settings:
+        transaction.set_heater_mode(HeaterMode(settings[ATTR_HEATER_MODE]))
+    if ATTR_MANUAL_TEMPERATURE in settings:
+        transaction.set_manual_temperature(settings[ATTR_MANUAL_TEMPERATURE])
+    for field, setter_name in _ROOM_PRESET_FIELDS.items():
+        if field in settings:
+            transaction.set_room_preset(setter_name, settings[field])
+    if ATTR_MAX_POWER in settings:
+        transaction.set_boiler_max_power_index(_MAX_POWER_INDEX[settings[ATTR_MAX_POWER]])
+
+
+def _bulk_result(result: TransactionResult) -> dict[str, Any]:
+    """Service response entry of one heater."""
+    if not result.writes:
+        status = "unchanged"
+    elif result.complete:
+        status = "applied"
+    elif result.applied:
+        status = "partial"
+    else:
+        status = "failed"
+    return {
+        "status": status,
+        "applied": list(result.applied),
+        "not_applied": list(result.not_applied),
+        "unchanged": list(result.elided),
+        "verified": result.verified,
+        "error": str(result.error) if result.error is not None else None,
+    }
+
+
+async def async_bulk_set(
+    targets: dict[str, KospelDataUpdateCoordinator],
+    settings: dict[str, Any],
+    max_parallel: int = BULK_SET_MAX_PARALLEL,
+    host_parallel: int = BULK_SET_HOST_PARALLEL,
+) -> dict[str, dict[str, Any]]:
+    """Write ``settings`` to all target heaters at once; results per device.
+
+    Each heater gets one transaction. At most ``max_parallel`` heaters are
+    written at a time, and ``host_parallel`` per CMI module so heaters on a
+    shared module do not interleave their writes. Heaters that changed show
+    the read-back values right away and refresh in the background.
+    """
+    limit = asyncio.Semaphore(max_parallel)
+    host_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def _async_apply(coordinator: KospelDataUpdateCoordinator) -> dict[str, Any]:
+        entry = coordinator.entry
+        host = entry.data.get(CONF_HEATER_IP) or entry.entry_id
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(host_parallel))
+        # Wait for the module first so a busy module does not hold a global slot.
+        async with host_limit, limit:
+            transaction = coordinator.transaction()
+            try:
+                plan_bulk_settings(transaction, settings)
+                result = await coordinator.async_commit(transaction)
+            except ValueError as err:
+                return {"status": "failed", "error": str(err)}
+        if result.sent:
+            coordinator.async_update_listeners()
+            coordinator.async_boost_polling()
+            entry.async_create_background_task(
+                coordinator.hass,
+                coordinator.async_request_refresh(),
+                name=f"{DOMAIN} bulk_set refresh {entry.entry_id}",
+            )
+        return _bulk_result(result)
+
+    # A heater targeted through several devices is written once.
+    coordinators = list(dict.fromkeys(targets.values()))
+    outcomes = await asyncio.gather(*(_async_apply(c) for c in coordinators))
+    by_coordinator = dict(zip(coordinators, outcomes))
+    return {device_id: by_coordinator[c] for device_id, c in targets.items()}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_start_burst(call: ServiceCall) -> None:
+        """Start burst polling on the targeted heaters."""
+        duration = timedelta(minutes=call.data[ATTR_DURATION])
+        for coordinator in async_target_heaters(hass, call).values():
+            try:
+                coordinator.async_start_burst(
+                    call.data[ATTR_REGISTERS], call.data[ATTR_INTERVAL], duration
+                )
+            except ValueError as err:
+                raise ServiceValidationError(str(err)) from err
+
+    async def async_bulk_set_handler(call: ServiceCall) -> ServiceResponse:
+        """Write the same settings to all targeted heaters."""
+        results = await async_bulk_set(
+            async_target_heaters(hass, call), dict(call.data)
+        )
+        if call.return_response:
+            return {"results": results}
+        failed = [
+            device_id
+            for device_id, result in results.items()
+            if result["status"] in ("failed", "partial")
+        ]
+        if failed:
+            raise HomeAssistantError(
+                f"Settings not fully applied on {', '.join(failed)}"
+            )
+        return None
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_START_BURST, async_start_burst, schema=START_BURST_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_SET,
+        async_bulk_set_handler,
+        schema=BULK_SET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,347 @@
+"""Accelerated-time thermal simulation of an EKCO.M3 heater.
+
+``SimulatedHeaterBackend`` wraps a register store (any register backend, e.g.
+the per-entry YAML backend) and evolves the measured registers from the
+written modes and setpoints:
+
+- 0b4b room temperature and 0b4a DHW tank temperature (lumped thermal model),
+- 0b46 heating power and 0b51 circuit/valve flags (hysteresis controller with
+  DHW priority, limited by the max power in 0b34),
+- 0b31 room and 0b2f DHW setpoints derived from mode and presets,
+- 0b4c outside temperature (daily sine) and 0b34 from the 0b62 power step.
+
+The model is advanced lazily on every read and write by the wall-clock time
+elapsed since the previous call times ``time_multiplier``, so no background
+task is needed and a week of heater behaviour fits into minutes. Each step
+solves the first-order model exactly and ends where a heated circuit switches
+off; steps grow beyond ``step_seconds`` so that one call never takes more than
+``SIMULATION_MAX_STEPS`` of them (a coarser controller at high multipliers
+instead of blocking the event loop).
+
+The module only imports the standard library and kospel_cmi.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from kospel_cmi.registers.decoders import decode_heater_mode
+from kospel_cmi.registers.enums import CwuMode, HeaterMode
+from kospel_cmi.registers.utils import int_to_reg, reg_to_int
+
+_LOGGER = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+# Steps per advance; bounds the time one read or write spends simulating.
+SIMULATION_MAX_STEPS = 500
+
+# Written when the store is blank: winter mode with DHW enabled, 8 kW step.
+DEFAULT_SIMULATION_REGISTERS: dict[str, int] = {
+    "0b55": (1 << 5) | (1 << 4),
+    "0b30": CwuMode.COMFORT,
+    "0b62": 3,
+    "0b4b": 190,
+    "0b4a": 450,
+    "0b4e": 150,
+    "0b68": 180,
+    "0b69": 200,
+    "0b6a": 210,
+    "0b6b": 220,
+    "0b66": 400,
+    "0b67": 500,
+    "0b8d": 220,
+}
+
+_VALVE_CO_BIT = 2
+_CO_ACTIVE_BIT = 7
+_CWU_ACTIVE_BIT = 8
+_WATER_HEATER_BIT = 4
+
+
+@dataclass(frozen=True)
+class ThermalModelParams:
+    """Physical constants of the simulated house and DHW tank."""
+
+    # ~10 kWh/K building mass, 150 W/K losses (time constant ~67 h).
+    room_heat_capacity_j_per_k: float = 36e6
+    room_loss_w_per_k: float = 150.0
+    # 140 l tank, 2 W/K standby losses to the room.
+    water_heat_capacity_j_per_k: float = 586e3
+    water_loss_w_per_k: float = 2.0
+    # Outside temperature: daily sine, coldest at 03:00.
+    outside_mean_c: float = 2.0
+    outside_swing_c: float = 4.0
+    room_hysteresis_c: float = 0.3
+    water_hysteresis_c: float = 3.0
+    anti_freeze_water_c: float = 10.0
+    step_seconds: float = 10.0
+
+
+@dataclass
+class _ModelState:
+    """Continuous state between steps (registers only keep 0.1 °C)."""
+
+    room_c: float
+    water_c: float
+    sim_seconds: float
+    ch_on: bool = False
+    dhw_on: bool = False
+    valve_co: bool = True
+
+
+def _scaled(registers: dict[str, str], register: str) -> float:
+    """Decode a ×10 register from the store."""
+    return reg_to_int(registers.get(register, "0000")) / 10.0
+
+
+def _scaled_hex(value: float) -> str:
+    """Encode a value as ×10 register hex."""
+    return int_to_reg(int(round(value * 10)))
+
+
+def _time_to_reach(value: float, steady: float, rate: float, target: float) -> float:
+    """Seconds until ``value`` relaxing towards ``steady`` reaches ``target``."""
+    if steady <= target:
+        return math.inf
+    return math.log((steady - value) / (steady - target)) / rate
+
+
+class SimulatedHeaterBackend:
+    """Register backend simulating EKCO.M3 dynamics on top of a register store."""
+
+    def __init__(
+        self,
+        store: Any,
+        time_multiplier: float = 1.0,
+        params: ThermalModelParams | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the simulation.
+
+        Args:
+            store: Register backend holding the state (reads/writes pass through).
+            time_multiplier: Simulated seconds per wall-clock second.
+            params: Model constants; defaults to ``ThermalModelParams()``.
+            clock: Wall-clock source in seconds (injectable for tests).
+        """
+        self._store = store
+        self._time_multiplier = time_multiplier
+        self._params = params or ThermalModelParams()
+        self._clock = clock
+        self._state: _ModelState | None = None
+        self._last_wall: float | None = None
+
+    @property
+    def simulated_seconds(self) -> float:
+        """Simulated time elapsed since the first access."""
+        return self._state.sim_seconds if self._state is not None else 0.0
+
+    async def read_register(self, register: str) -> str:
+        """Advance the model, then read from the store."""
+        await self.async_advance()
+        return await self._store.read_register(register)
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Advance the model, then batch-read from the store."""
+        await self.async_advance()
+        return await self._store.read_registers(start_register, count)
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Advance the model to now, then apply the write (and firmware reaction)."""
+        await self.async_advance()
+        await self._store.write_register(register, hex_value)
+        if register == "0b62":
+            # Firmware reflects the selected power step in 0b34 (kW ×10).
+            step = max(0, min(3, reg_to_int(hex_value)))
+            await self._store.write_register("0b34", _scaled_hex((step + 1) * 2.0))
+
+    async def aclose(self) -> None:
+        """Close the underlying store."""
+        aclose = getattr(self._store, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    async def async_advance(self, sim_seconds: float | None = None) -> None:
+        """Advance the model by elapsed wall time × multiplier (or ``sim_seconds``)."""
+        now = self._clock()
+        registers = await self._store.read_registers("0b00", 256)
+        if self._state is None:
+            registers = await self._async_initialize(registers)
+            self._last_wall = now
+            if sim_seconds is None:
+                await self._async_write_outputs(registers)
+                return
+        if sim_seconds is None:
+            assert self._last_wall is not None
+            sim_seconds = max(0.0, now - self._last_wall) * self._time_multiplier
+        self._last_wall = now
+        if sim_seconds <= 0:
+            return
+
+        assert self._state is not None
+        step = max(self._params.step_seconds, sim_seconds / SIMULATION_MAX_STEPS)
+        remaining = sim_seconds
+        while remaining > 0:
+            remaining -= self._step(registers, min(step, remaining))
+        await self._async_write_outputs(registers)
+
+    async def _async_initialize(self, registers: dict[str, str]) -> dict[str, str]:
+        """Seed a blank store and load the continuous state from registers."""
+        blank = all(
+            registers.get(register, "0000") == "0000" for register in ("0b55", "0b4b")
+        )
+        if blank:
+            _LOGGER.info("Seeding blank simulation state with default registers")
+            for register, value in DEFAULT_SIMULATION_REGISTERS.items():
+                await self._store.write_register(register, int_to_reg(int(value)))
+            registers = await self._store.read_registers("0b00", 256)
+        self._state = _ModelState(
+            room_c=_scaled(registers, "0b4b"),
+            water_c=_scaled(registers, "0b4a"),
+            sim_seconds=0.0,
+            valve_co=bool(
+                reg_to_int(registers.get("0b51", "0000")) >> _VALVE_CO_BIT & 1
+            ),
+        )
+        return registers
+
+    def _targets(self, registers: dict[str, str]) -> tuple[float | None, float | None]:
+        """Return (room target, DHW target) in °C from mode and presets."""
+        flags = reg_to_int(registers.get("0b55", "0000"))
+        mode = decode_heater_mode(registers.get("0b55", "0000"))
+        room_target = {
+            HeaterMode.MANUAL: "0b8d",
+            HeaterMode.WINTER: "0b6a",
+            HeaterMode.PARTY: "0b6b",
+            HeaterMode.VACATION: "0b68",
+        }.get(mode)
+        room = _scaled(registers, room_target) if room_target else None
+
+        water: float | None = None
+        if mode not in (None, HeaterMode.OFF) and flags >> _WATER_HEATER_BIT & 1:
+            cwu_mode = reg_to_int(registers.get("0b30", "0000"))
+            if cwu_mode == CwuMode.ECONOMY:
+                water = _scaled(registers, "0b66")
+            elif cwu_mode == CwuMode.COMFORT:
+                water = _scaled(registers, "0b67")
+            else:
+                water = self._params.anti_freeze_water_c
+        return room, water
+
+    def _max_power_kw(self, registers: dict[str, str]) -> float:
+        """Max heating power from 0b34 (falls back to the 0b62 step)."""
+        limit = _scaled(registers, "0b34")
+        if limit > 0:
+            return limit
+        step = max(0, min(3, reg_to_int(registers.get("0b62", "0000"))))
+        return (step + 1) * 2.0
+
+    def _outside_c(self, sim_seconds: float) -> float:
+        """Outside temperature at a simulated time (coldest at 03:00)."""
+        phase = sim_seconds / SECONDS_PER_DAY - 9.0 / 24.0
+        return self._params.outside_mean_c + self._params.outside_swing_c * math.sin(
+            2 * math.pi * phase
+        )
+
+    def _step(self, registers: dict[str, str], dt: float) -> float:
+        """Advance the continuous state by up to ``dt`` simulated seconds.
+
+        Power and outside temperature are held for the step, so room and tank
+        relax exponentially towards their steady temperatures. The step ends
+        early when a heated circuit reaches its switch-off temperature.
+
+        Returns:
+            Simulated seconds actually advanced.
+        """
+        state = self._state
+        assert state is not None
+        params = self._params
+        room_target, water_target = self._targets(registers)
+
+        if water_target is None:
+            state.dhw_on = False
+        elif state.dhw_on:
+            state.dhw_on = state.water_c < water_target
+        else:
+            state.dhw_on = state.water_c < water_target - params.water_hysteresis_c
+
+        if room_target is None:
+            state.ch_on = False
+        elif state.ch_on:
+            state.ch_on = state.room_c < room_target + params.room_hysteresis_c
+        else:
+            state.ch_on = state.room_c < room_target - params.room_hysteresis_c
+
+        power_w = self._max_power_kw(registers) * 1000.0
+        dhw_power_w = power_w if state.dhw_on else 0.0
+        # DHW has priority: the valve serves one circuit at a time.
+        ch_power_w = power_w if state.ch_on and not state.dhw_on else 0.0
+        if state.dhw_on:
+            state.valve_co = False
+        elif state.ch_on:
+            state.valve_co = True
+
+        outside_c = self._outside_c(state.sim_seconds)
+        room_steady = outside_c + ch_power_w / params.room_loss_w_per_k
+        room_rate = params.room_loss_w_per_k / params.room_heat_capacity_j_per_k
+        water_steady = state.room_c + dhw_power_w / params.water_loss_w_per_k
+        water_rate = params.water_loss_w_per_k / params.water_heat_capacity_j_per_k
+
+        room_off = water_off = None
+        if ch_power_w and room_target is not None:
+            room_off = room_target + params.room_hysteresis_c
+            dt = min(dt, _time_to_reach(state.room_c, room_steady, room_rate, room_off))
+        if dhw_power_w and water_target is not None:
+            water_off = water_target
+            dt = min(
+                dt, _time_to_reach(state.water_c, water_steady, water_rate, water_off)
+            )
+
+        state.room_c = room_steady + (state.room_c - room_steady) * math.exp(
+            -room_rate * dt
+        )
+        state.water_c = water_steady + (state.water_c - water_steady) * math.exp(
+            -water_rate * dt
+        )
+        # Land exactly on a reached threshold so the next step switches off.
+        if room_off is not None and state.room_c >= room_off - 1e-9:
+            state.room_c = max(state.room_c, room_off)
+        if water_off is not None and state.water_c >= water_off - 1e-9:
+            state.water_c = max(state.water_c, water_off)
+        state.sim_seconds += dt
+        return dt
+
+    async def _async_write_outputs(self, registers: dict[str, str]) -> None:
+        """Write simulated registers that changed to the store."""
+        state = self._state
+        assert state is not None
+        room_target, water_target = self._targets(registers)
+        active = state.dhw_on or (state.ch_on and not state.dhw_on)
+        power_kw = self._max_power_kw(registers) if active else 0.0
+
+        flags = reg_to_int(registers.get("0b51", "0000"))
+        for bit, value in (
+            (_VALVE_CO_BIT, state.valve_co),
+            (_CO_ACTIVE_BIT, state.ch_on and not state.dhw_on),
+            (_CWU_ACTIVE_BIT, state.dhw_on),
+        ):
+            flags = flags | (1 << bit) if value else flags & ~(1 << bit)
+
+        outputs = {
+            "0b4b": _scaled_hex(state.room_c),
+            "0b4a": _scaled_hex(state.water_c),
+            "0b4c": _scaled_hex(self._outside_c(state.sim_seconds)),
+            "0b46": _scaled_hex(power_kw),
+            "0b51": int_to_reg(flags),
+            "0b31": _scaled_hex(room_target or 0.0),
+            "0b2f": _scaled_hex(water_target or 0.0),
+            "0b34": _scaled_hex(self._max_power_kw(registers)),
+        }
+        for register, value in outputs.items():
+            if registers.get(register) != value:
+                await self._store.write_register(register, value)
@@ -0,0 +1,268 @@
+"""Transactional multi-register writes.
+
+``EkcoM3`` setters write one register each and update the controller cache as
+they go: when ``set_manual_heating`` fails after the heater mode was written,
+nobody knows which of 0b55, 0b32 and 0b8d reached the device.
+
+A ``RegisterTransaction`` plans all register writes of an operation up front,
+encoding them against the last confirmed registers (setters mirror the
+``EkcoM3`` ones). Writes to the same register are merged into one. The module
+API only takes one register per request, so committing sends the planned
+writes in order, one request each, and stops at the first failure. Then,
+after a settle delay (the device needs time to persist writes; read too
+early, it still returns the old values), it reads the written range back once
+(one batch read per register page) and reports which registers hold their
+planned value. A failed write may still have been applied; the read-back
+tells. Only the bits a setter changes are compared (the mode bits of 0b55),
+since the heater updates other flags of that register on its own.
+
+Writes whose encoded value the device is confirmed to hold already are
+elided when planned: re-asserting a preset costs no request, no flash write
+and no refresh.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from kospel_cmi.exceptions import KospelError
+from kospel_cmi.registers.encoders import (
+    encode_heater_mode,
+    encode_raw_int,
+    encode_scaled_x10,
+)
+from kospel_cmi.registers.enums import (
+    ROOM_MODE_MANUAL,
+    BoilerMaxPowerIndex,
+    HeaterMode,
+)
+from kospel_cmi.registers.utils import (
+    int_to_reg_address,
+    reg_address_to_int,
+    reg_to_int,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+REGISTER_HEATER_MODE = "0b55"
+REGISTER_ROOM_MODE = "0b32"
+REGISTER_MANUAL_TEMPERATURE = "0b8d"
+REGISTER_BOILER_MAX_POWER = "0b62"
+# Room preset setter (as on EkcoM3) -> register.
+ROOM_PRESET_REGISTERS: dict[str, str] = {
+    "set_room_temperature_economy": "0b68",
+    "set_room_temperature_comfort_minus": "0b69",
+    "set_room_temperature_comfort": "0b6a",
+    "set_room_temperature_comfort_plus": "0b6b",
+}
+
+_FULL_MASK = 0xFFFF
+# Bits 3, 5, 6, 7 and 9 of 0b55 (see encode_heater_mode).
+_HEATER_MODE_MASK = (1 << 3) | (1 << 5) | (1 << 6) | (1 << 7) | (1 << 9)
+
+
+@dataclass(frozen=True)
+class RegisterWrite:
+    """One planned register write; ``mask`` selects the bits verified."""
+
+    register: str
+    value: str
+    mask: int = _FULL_MASK
+
+    def matches(self, value: str | None) -> bool:
+        """True if ``value`` (read back) holds the planned bits."""
+        if value is None:
+            return False
+        return (reg_to_int(value) ^ reg_to_int(self.value)) & self.mask == 0
+
+
+@dataclass(frozen=True)
+class TransactionResult:
+    """Outcome of a committed transaction."""
+
+    writes: tuple[RegisterWrite, ...]
+    sent: tuple[str, ...]
+    applied: tuple[str, ...]
+    verified: bool
+    read_back: dict[str, str] = field(default_factory=dict)
+    error: KospelError | None = None
+    elided: tuple[str, ...] = ()
+
+    @property
+    def complete(self) -> bool:
+        """True if every planned register holds its value on the device."""
+        return len(self.applied) == len(self.writes)
+
+    @property
+    def not_applied(self) -> tuple[str, ...]:
+        """Planned registers not (known to be) applied, in plan order."""
+        return tuple(
+            write.register for write in self.writes if write.register not in self.applied
+        )
+
+    def __str__(self) -> str:
+        """Short summary for logs and error messages."""
+        parts = [f"applied {', '.join(self.applied) or 'nothing'}"]
+        if self.not_applied:
+            parts.append(f"not applied {', '.join(self.not_applied)}")
+        if not self.verified:
+            parts.append("unverified")
+        if self.error is not None:
+            parts.append(f"error: {self.error}")
+        return "; ".join(parts)
+
+
+class RegisterTransaction:
+    """Ordered register writes of one operation, committed together."""
+
+    def __init__(
+        self,
+        registers: Mapping[str, str],
+        confirmed: Mapping[str, str] | None = None,
+    ) -> None:
+        """Initialize an empty plan.
+
+        Args:
+            registers: Last read register values; read-modify-write setters
+                (heater mode) encode against them.
+            confirmed: Register values recent enough to trust; writes they
+                already hold are elided. None disables elision.
+        """
+        self._current = dict(registers)
+        self._confirmed = confirmed or {}
+        # register -> planned write; dict order is the send order.
+        self._writes: dict[str, RegisterWrite] = {}
+        # Registers left out because the device holds the value (ordered set).
+        self._elided: dict[str, None] = {}
+
+    @property
+    def writes(self) -> tuple[RegisterWrite, ...]:
+        """Planned writes in send order."""
+        return tuple(self._writes.values())
+
+    @property
+    def elided(self) -> tuple[str, ...]:
+        """Registers not written because the device already holds the value."""
+        return tuple(self._elided)
+
+    def _plan(self, register: str, value: str | None, mask: int = _FULL_MASK) -> None:
+        """Add (or merge) a write of ``value`` to ``register``."""
+        if value is None:
+            raise ValueError(f"Failed to encode value for {register}")
+        self._current[register] = value
+        previous = self._writes.get(register)
+        if previous is not None:
+            mask |= previous.mask
+        write = RegisterWrite(register, value, mask)
+        if previous is None and write.matches(self._confirmed.get(register)):
+            self._elided[register] = None
+            return
+        self._elided.pop(register, None)
+        self._writes[register] = write
+
+    def set_heater_mode(self, value: HeaterMode) -> None:
+        """Plan the heater mode (0b55); MANUAL also sets room mode 64 (0b32).
+
+        Raises:
+            ValueError: 0b55 was never read, so its other bits are unknown.
+        """
+        self._plan(
+            REGISTER_HEATER_MODE,
+            encode_heater_mode(
+                value, current_hex=self._current.get(REGISTER_HEATER_MODE)
+            ),
+            _HEATER_MODE_MASK,
+        )
+        if value == HeaterMode.MANUAL:
+            self.set_room_mode(ROOM_MODE_MANUAL)
+
+    def set_room_mode(self, value: int) -> None:
+        """Plan the room mode (0b32)."""
+        self._plan(REGISTER_ROOM_MODE, encode_raw_int(value, None))
+
+    def set_manual_temperature(self, value: float) -> None:
+        """Plan the manual target temperature (0b8d), °C."""
+        self._plan(REGISTER_MANUAL_TEMPERATURE, encode_scaled_x10(value, None))
+
+    def set_manual_heating(self, temperature: float) -> None:
+        """Plan MANUAL mode with a target temperature (0b55, 0b32, 0b8d)."""
+        self.set_heater_mode(HeaterMode.MANUAL)
+        self.set_manual_temperature(temperature)
+
+    def set_room_preset(self, setter_name: str, value: float) -> None:
+        """Plan a room preset temperature by its ``EkcoM3`` setter name, °C."""
+        self._plan(ROOM_PRESET_REGISTERS[setter_name], encode_scaled_x10(value, None))
+
+    def set_boiler_max_power_index(self, value: BoilerMaxPowerIndex | int) -> None:
+        """Plan the max boiler power step (0b62)."""
+        self._plan(
+            REGISTER_BOILER_MAX_POWER,
+            encode_raw_int(int(BoilerMaxPowerIndex(int(value))), None),
+        )
+
+    async def async_commit(
+        self, backend: Any, settle_delay: float = 0.0
+    ) -> TransactionResult:
+        """Send the planned writes in order, then verify them with one read.
+
+        Transport errors do not raise: they end the writes and are reported
+        in the result, together with what the device holds afterwards.
+
+        Args:
+            backend: Register backend to write to and read back from.
+            settle_delay: Seconds to wait after the writes before reading back.
+        """
+        writes = self.writes
+        if not writes:
+            return TransactionResult((), (), (), True, elided=self.elided)
+        sent: list[str] = []
+        error: KospelError | None = None
+        for write in writes:
+            try:
+                await backend.write_register(write.register, write.value)
+            except KospelError as err:
+                error = err
+                break
+            sent.append(write.register)
+
+        if sent and settle_delay > 0:
+            await asyncio.sleep(settle_delay)
+        read_back: dict[str, str] = {}
+        verified = True
+        try:
+            for start_register, count in _covering_spans(self._writes):
+                read_back.update(await backend.read_registers(start_register, count))
+        except KospelError as err:
+            _LOGGER.debug("Could not verify register writes: %s", err)
+            verified = False
+            error = error or err
+
+        if verified:
+            applied = tuple(
+                write.register for write in writes if write.matches(read_back.get(write.register))
+            )
+            read_back = {reg: read_back[reg] for reg in self._writes if reg in read_back}
+        else:
+            # Acknowledged by the module is the best we know.
+            applied = tuple(sent)
+            read_back = {}
+        result = TransactionResult(
+            writes, tuple(sent), applied, verified, read_back, error, self.elided
+        )
+        _LOGGER.debug("Register transaction: %s", result)
+        return result
+
+
+def _covering_spans(registers: Mapping[str, Any]) -> list[tuple[str, int]]:
+    """One (start register, count) read per page covering ``registers``."""
+    by_page: dict[str, list[int]] = {}
+    for register in registers:
+        by_page.setdefault(register[:2], []).append(reg_address_to_int(register))
+    return [
+        (int_to_reg_address(page, min(indexes)), max(indexes) - min(indexes) + 1)
+        for page, indexes in sorted(by_page.items())
+    ]
@@ -10,7 +10,13 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, get_device_info, get_device_identifier
+from .const import (
+    ATTR_DATA_AGE,
+    DOMAIN,
+    get_device_info,
+    get_device_identifier,
+    property_registers,
+)
 from .coordinator import KospelDataUpdateCoordinator
 
 from kospel_cmi.registers.enums import CwuMode, WaterHeaterEnabled
@@ -75,6 +81,13 @@ class KospelWaterHeaterEntity(
     _attr_supported_features = (
         WaterHeaterEntityFeature.OPERATION_MODE | WaterHeaterEntityFeature.TARGET_TEMPERATURE
     )
+    _unrecorded_attributes = frozenset({ATTR_DATA_AGE})
+    _registers = property_registers(
+        "water_current_temperature",
+        "supply_setpoint",
+        "is_water_heater_enabled",
+        "cwu_mode",
+    )
 
     def __init__(self, coordinator: KospelDataUpdateCoordinator) -> None:
         """Initialize the water heater entity."""
@@ -128,8 +141,14 @@ class KospelWaterHeaterEntity(
 
     @property
     def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.communication_ok
+        """Return if the entity's registers are fresh."""
+        return self.coordinator.registers_available(self._registers)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        """Return the age of the entity's registers in seconds."""
+        age = self.coordinator.data_age(self._registers)
+        return {ATTR_DATA_AGE: round(age)} if age is not None else {}
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
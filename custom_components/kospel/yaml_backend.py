@@ -0,0 +1,205 @@
+"""YAML register backend with in-memory state and write-behind persistence.
+
+Used for YAML (development) entries instead of the library's
+``YamlRegisterBackend``, which loads and rewrites the whole file from the event
+loop on every read and write. Here the file is loaded once per entry, reads and
+writes are served from memory, and the state is flushed to disk on the
+executor after a short debounce, atomically (temp file plus rename).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from homeassistant.core import HomeAssistant
+
+from kospel_cmi.registers.utils import int_to_reg_address, reg_address_to_int
+
+_LOGGER = logging.getLogger(__name__)
+
+# Writes arriving within this window (e.g. multi-register setters) share one flush.
+YAML_FLUSH_DELAY_SECONDS = 1.0
+
+DEFAULT_REGISTER_VALUE = "0000"
+
+
+class _QuotedDumper(yaml.SafeDumper):
+    """Dumper quoting every string, matching the library's state file format."""
+
+
+_QuotedDumper.add_representer(
+    str,
+    lambda dumper, data: dumper.represent_scalar(
+        "tag:yaml.org,2002:str", data, style='"'
+    ),
+)
+
+
+def load_state_file(path: Path) -> dict[str, str]:
+    """Load register state from a YAML file (blocking).
+
+    Returns an empty state when the file is missing or unreadable.
+    """
+    try:
+        with open(path, encoding="utf-8") as state_file:
+            data = yaml.safe_load(state_file) or {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, yaml.YAMLError) as err:
+        _LOGGER.warning("Could not load YAML state from %s: %s", path, err)
+        return {}
+    if not isinstance(data, dict):
+        _LOGGER.warning("Ignoring YAML state in %s: not a mapping", path)
+        return {}
+    return {str(register): str(value) for register, value in data.items()}
+
+
+def write_state_file(path: Path, registers: dict[str, str]) -> None:
+    """Write register state atomically: temp file in the same dir, then rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = yaml.dump(
+        registers,
+        Dumper=_QuotedDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=True,
+    )
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            tmp_file.write(content)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class CachedYamlRegisterBackend:
+    """Register backend serving a per-entry YAML state file from memory.
+
+    Call ``async_load`` once before use. Writes mark the state dirty and
+    schedule a debounced flush on the executor; ``aclose`` flushes pending
+    writes immediately.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        state_file: Path,
+        seed_file: Path | None = None,
+        flush_delay: float = YAML_FLUSH_DELAY_SECONDS,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            hass: Home Assistant instance (executor and event loop).
+            state_file: YAML file holding this entry's register state.
+            seed_file: File copied into memory when ``state_file`` does not
+                exist yet (the legacy shared ``state.yaml``).
+            flush_delay: Debounce for write-behind flushes, in seconds.
+        """
+        self._hass = hass
+        self._state_file = state_file
+        self._seed_file = seed_file
+        self._flush_delay = flush_delay
+        self._registers: dict[str, str] = {}
+        self._dirty = False
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def state_file(self) -> Path:
+        """Path of the YAML state file."""
+        return self._state_file
+
+    async def async_load(self) -> None:
+        """Load register state from disk (executor)."""
+        self._registers = await self._hass.async_add_executor_job(self._load)
+
+    def _load(self) -> dict[str, str]:
+        """Load the state file, seeding it from ``seed_file`` when missing."""
+        if (
+            not self._state_file.exists()
+            and self._seed_file is not None
+            and self._seed_file.exists()
+        ):
+            _LOGGER.info(
+                "Seeding YAML state %s from %s", self._state_file, self._seed_file
+            )
+            return load_state_file(self._seed_file)
+        return load_state_file(self._state_file)
+
+    async def read_register(self, register: str) -> str:
+        """Read a single register from memory."""
+        return self._registers.get(register, DEFAULT_REGISTER_VALUE)
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        """Read ``count`` consecutive registers from memory (missing ones as 0000)."""
+        start = reg_address_to_int(start_register)
+        prefix = start_register[:2]
+        result: dict[str, str] = {}
+        for offset in range(count):
+            register = int_to_reg_address(prefix, start + offset)
+            result[register] = self._registers.get(register, DEFAULT_REGISTER_VALUE)
+        return result
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        """Update a register in memory and schedule a flush."""
+        old_value = self._registers.get(register, DEFAULT_REGISTER_VALUE)
+        self._registers[register] = hex_value
+        _LOGGER.debug(
+            "[YAML] WRITE register %s: %s -> %s", register, old_value, hex_value
+        )
+        self._dirty = True
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                self._flush_delay, self._schedule_flush
+            )
+
+    def _schedule_flush(self) -> None:
+        """Timer callback: start the executor flush unless one is running."""
+        self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            # Running flush picks up the dirty flag when it finishes.
+            return
+        self._flush_task = self._hass.async_create_background_task(
+            self.async_flush(), f"kospel yaml flush {self._state_file.name}"
+        )
+
+    async def async_flush(self) -> None:
+        """Write pending changes to disk now (executor, atomic)."""
+        while self._dirty:
+            self._dirty = False
+            snapshot = dict(self._registers)
+            try:
+                await self._hass.async_add_executor_job(
+                    write_state_file, self._state_file, snapshot
+                )
+            except OSError as err:
+                self._dirty = True
+                _LOGGER.error(
+                    "Could not save YAML state to %s: %s", self._state_file, err
+                )
+                return
+
+    async def aclose(self) -> None:
+        """Cancel the pending timer and flush outstanding writes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.async_flush()
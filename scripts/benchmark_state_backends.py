@@ -0,0 +1,115 @@
+"""Benchmark file-backed register backends: library YAML vs binary image + journal.
+
+Runs the same workload against ``YamlRegisterBackend`` (kospel_cmi) and the
+integration's ``BinaryRegisterBackend``: N single-register writes followed by
+M batch reads of the full 0b00..0bff page, then prints wall time, per-op cost
+and on-disk size. Optionally exports the binary state as YAML.
+
+Usage:
+    python scripts/benchmark_state_backends.py --writes 2000 --reads 200
+    python scripts/benchmark_state_backends.py --export-yaml /tmp/state.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kospel_cmi.kospel.backend import YamlRegisterBackend
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BINARY_BACKEND_PATH = REPO_ROOT / "custom_components" / "kospel" / "binary_backend.py"
+
+
+def _load_binary_backend_module():
+    """Load binary_backend.py directly (the package __init__ needs Home Assistant)."""
+    spec = importlib.util.spec_from_file_location(
+        "kospel_binary_backend", BINARY_BACKEND_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _workload(writes: int, seed: int) -> list[tuple[str, str]]:
+    """Deterministic list of (register, hex value) writes in the 0b page."""
+    rng = random.Random(seed)
+    return [
+        (f"0b{rng.randrange(256):02x}", f"{rng.randrange(65536):04x}")
+        for _ in range(writes)
+    ]
+
+
+async def _run(
+    backend, workload: list[tuple[str, str]], reads: int
+) -> tuple[float, float]:
+    """Return (write seconds, read seconds) for the workload."""
+    start = time.perf_counter()
+    for register, value in workload:
+        await backend.write_register(register, value)
+    write_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        await backend.read_registers("0b00", 256)
+    read_seconds = time.perf_counter() - start
+    return write_seconds, read_seconds
+
+
+def _report(
+    name: str, writes: int, reads: int, timings: tuple[float, float], size: int
+) -> None:
+    """Print one result line."""
+    write_seconds, read_seconds = timings
+    write_us = write_seconds / max(writes, 1) * 1e6
+    read_us = read_seconds / max(reads, 1) * 1e6
+    print(
+        f"{name:<8} writes: {write_seconds:8.3f} s ({write_us:9.1f} us/op)  "
+        f"reads: {read_seconds:8.3f} s ({read_us:9.1f} us/op)  "
+        f"size: {size} B"
+    )
+
+
+async def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--export-yaml", type=Path, default=None)
+    args = parser.parse_args()
+
+    binary_backend = _load_binary_backend_module()
+    workload = _workload(args.writes, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+
+        yaml_file = tmp_dir / "state.yaml"
+        yaml_backend = YamlRegisterBackend(state_file=str(yaml_file))
+        timings = await _run(yaml_backend, workload, args.reads)
+        _report("yaml", args.writes, args.reads, timings, yaml_file.stat().st_size)
+
+        backend = binary_backend.BinaryRegisterBackend(tmp_dir / "state.bin")
+        await backend.async_open()
+        timings = await _run(backend, workload, args.reads)
+        await backend.aclose()
+        size = backend.image_path.stat().st_size + backend.journal_path.stat().st_size
+        _report("binary", args.writes, args.reads, timings, size)
+
+        if args.export_yaml is not None:
+            await backend.async_open()
+            await backend.async_export_yaml(args.export_yaml)
+            await backend.aclose()
+            print(f"Exported binary state to {args.export_yaml}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+"""Tests for streaming anomaly detection."""
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.anomaly import (  # noqa: E402
+    ANOMALY_PRESSURE_DROP,
+    ANOMALY_ROOM_NOT_HEATING,
+    ANOMALY_WATER_NOT_HEATING,
+    AnomalyDetector,
+    Welford,
+)
+
+
+def _feed(detector, samples, start=0.0, step=15.0):
+    """Feed (pressure, room, room_running, water, water_running) tuples."""
+    changes = []
+    for index, (pressure, room, room_on, water, water_on) in enumerate(samples):
+        changes.extend(
+            detector.update(
+                start + index * step,
+                pressure=pressure,
+                room_temperature=room,
+                room_heating=room_on,
+                water_temperature=water,
+                water_heating=water_on,
+            )
+        )
+    return changes
+
+
+class TestWelford:
+    """Tests for the running variance."""
+
+    def test_matches_sample_variance(self) -> None:
+        """Mean and standard deviation match the two-pass formulas."""
+        stats = Welford()
+        for value in (1.0, 2.0, 4.0, 7.0):
+            stats.add(value)
+
+        assert stats.mean == pytest.approx(3.5)
+        assert stats.std == pytest.approx(2.6457513)
+
+
+class TestPressureDrop:
+    """Tests for the pressure drop detector."""
+
+    def test_sudden_drop_is_flagged_and_clears_on_recovery(self) -> None:
+        """A drop well below the baseline raises, recovery clears."""
+        detector = AnomalyDetector()
+        noise = [1.50, 1.51, 1.49, 1.50, 1.52, 1.48] * 5
+        changes = _feed(detector, [(p, None, False, None, False) for p in noise])
+        assert changes == []
+
+        changes = _feed(detector, [(1.0, None, False, None, False)])
+        assert [(c.anomaly, c.active) for c in changes] == [
+            (ANOMALY_PRESSURE_DROP, True)
+        ]
+        assert detector.is_active(ANOMALY_PRESSURE_DROP)
+
+        # Staying low keeps the anomaly; refilling clears it.
+        assert _feed(detector, [(1.02, None, False, None, False)]) == []
+        changes = _feed(detector, [(1.45, None, False, None, False)])
+        assert [(c.anomaly, c.active) for c in changes] == [
+            (ANOMALY_PRESSURE_DROP, False)
+        ]
+
+    def test_no_flag_during_warmup(self) -> None:
+        """The first samples only build the baseline."""
+        detector = AnomalyDetector()
+        changes = _feed(
+            detector, [(p, None, False, None, False) for p in (1.5, 1.5, 0.9)]
+        )
+
+        assert changes == []
+
+
+class TestHeatingStagnation:
+    """Tests for the not-heating detectors."""
+
+    def test_room_flat_while_running_is_flagged(self) -> None:
+        """CH running for the whole window without warming raises the anomaly."""
+        detector = AnomalyDetector()
+        samples = [(None, 19.0, True, None, False)] * 200  # 50 min at 15 s
+
+        changes = _feed(detector, samples)
+
+        assert [(c.anomaly, c.active) for c in changes] == [
+            (ANOMALY_ROOM_NOT_HEATING, True)
+        ]
+        changes = _feed(detector, [(None, 19.0, False, None, False)], start=3000.0)
+        assert [(c.anomaly, c.active) for c in changes] == [
+            (ANOMALY_ROOM_NOT_HEATING, False)
+        ]
+
+    def test_warming_room_is_not_flagged(self) -> None:
+        """A room rising steadily while CH runs is healthy."""
+        detector = AnomalyDetector()
+        samples = [
+            (None, 19.0 + index * 0.01, True, None, False) for index in range(400)
+        ]
+
+        assert _feed(detector, samples) == []
+
+    def test_water_stagnation_flagged_only_while_running(self) -> None:
+        """A flat DHW tank is flagged only with the DHW circuit running."""
+        detector = AnomalyDetector()
+        idle = [(None, None, False, 45.0, False)] * 200
+        assert _feed(detector, idle) == []
+
+        running = [(None, None, False, 45.0, True)] * 100  # 25 min
+        changes = _feed(detector, running, start=3000.0)
+
+        assert [(c.anomaly, c.active) for c in changes] == [
+            (ANOMALY_WATER_NOT_HEATING, True)
+        ]
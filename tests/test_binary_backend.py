@@ -0,0 +1,136 @@
+"""Tests for the memory-mapped binary register backend and its journal."""
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi.controller.device import EkcoM3  # noqa: E402
+from kospel_cmi.exceptions import KospelWriteError  # noqa: E402
+from kospel_cmi.registers.enums import HeaterMode  # noqa: E402
+
+from custom_components.kospel.binary_backend import (  # noqa: E402
+    IMAGE_SIZE,
+    JOURNAL_RECORD,
+    BinaryRegisterBackend,
+)
+
+
+async def _open(tmp_path, **kwargs) -> BinaryRegisterBackend:
+    backend = BinaryRegisterBackend(tmp_path / "state.bin", **kwargs)
+    await backend.async_open()
+    return backend
+
+
+class TestBinaryRegisterBackend:
+    """Tests for image layout, journal recovery, compaction and export."""
+
+    @pytest.mark.asyncio
+    async def test_new_image_is_zeroed_and_fixed_size(self, tmp_path) -> None:
+        """A fresh image has 512 bytes and reads 0000 everywhere."""
+        backend = await _open(tmp_path)
+
+        registers = await backend.read_registers("0b00", 256)
+
+        assert backend.image_path.stat().st_size == IMAGE_SIZE
+        assert set(registers.values()) == {"0000"}
+        assert len(registers) == 256
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_state_survives_reopen(self, tmp_path) -> None:
+        """Controller writes are visible after closing and reopening."""
+        backend = await _open(tmp_path)
+        controller = EkcoM3(backend=backend)
+        await controller.refresh()
+        await controller.set_heater_mode(HeaterMode.WINTER)
+        await controller.aclose()
+
+        reopened = await _open(tmp_path)
+        controller = EkcoM3(backend=reopened, strict_refresh=True)
+        await controller.refresh()
+
+        assert controller.heater_mode == HeaterMode.WINTER
+        assert reopened.journal_path.stat().st_size == 0
+        await reopened.aclose()
+
+    @pytest.mark.asyncio
+    async def test_journal_replayed_and_torn_tail_dropped(self, tmp_path) -> None:
+        """Flushed records are recovered without compaction; a torn tail is cut."""
+        backend = await _open(tmp_path)
+        await backend.write_register("0b55", "2000")
+        await backend.write_register("0b8d", "fa00")
+        await backend.async_flush()
+        # Simulate a crash: image never synced, half a record appended.
+        with open(backend.journal_path, "ab") as journal:
+            journal.write(b"\x10\x01")
+
+        recovered = BinaryRegisterBackend(tmp_path / "state.bin")
+        await recovered.async_open()
+
+        assert await recovered.read_register("0b55") == "2000"
+        assert await recovered.read_register("0b8d") == "fa00"
+        assert recovered.journal_path.stat().st_size == 2 * JOURNAL_RECORD.size
+        await recovered.aclose()
+
+    @pytest.mark.asyncio
+    async def test_compaction_truncates_journal(self, tmp_path) -> None:
+        """Reaching the threshold syncs the image and empties the journal."""
+        backend = await _open(tmp_path, compact_threshold=3)
+        for index in range(3):
+            await backend.write_register(f"0b0{index}", "0100")
+        await backend.async_flush()
+
+        assert backend.journal_path.stat().st_size == 0
+        assert backend.image_path.read_bytes()[:6] == b"\x01\x00" * 3
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_rejects_registers_outside_image(self, tmp_path) -> None:
+        """Writes outside 0b00..0bff raise KospelWriteError; reads return 0000."""
+        backend = await _open(tmp_path)
+
+        with pytest.raises(KospelWriteError):
+            await backend.write_register("0c10", "0100")
+        assert await backend.read_register("0c10") == "0000"
+        await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_exports_yaml(self, tmp_path) -> None:
+        """YAML export lists every image register as a hex string."""
+        backend = await _open(tmp_path)
+        await backend.write_register("0b55", "2000")
+        export = tmp_path / "export.yaml"
+
+        await backend.async_export_yaml(export)
+
+        exported = yaml.safe_load(export.read_text())
+        assert exported["0b55"] == "2000"
+        assert exported["0b00"] == "0000"
+        assert len(exported) == 256
+        await backend.aclose()
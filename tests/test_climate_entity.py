@@ -2,7 +2,7 @@
 
 import sys
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -25,7 +25,10 @@ sys.modules["homeassistant.components.sensor"] = MagicMock()
 sys.modules["homeassistant.components.switch"] = MagicMock()
 sys.modules["homeassistant.components.water_heater"] = MagicMock()
 sys.modules["homeassistant.const"] = MagicMock()
-sys.modules["homeassistant.core"] = MagicMock()
+_ha_core_mock = MagicMock()
+# Real identity decorator so @callback methods (e.g. discovery cache) stay callable.
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
 
 
 class _FakeHomeAssistantError(Exception):
@@ -39,11 +42,13 @@ class _FakeConfigEntryNotReady(_FakeHomeAssistantError):
 sys.modules["homeassistant.exceptions"] = SimpleNamespace(
     HomeAssistantError=_FakeHomeAssistantError,
     ConfigEntryNotReady=_FakeConfigEntryNotReady,
+    ServiceValidationError=_FakeHomeAssistantError,
 )
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 
 
 def _device_info(**kwargs):
@@ -96,7 +101,9 @@ climate_mock.HVACAction = MagicMock()
 sys.modules["homeassistant.components.climate"] = climate_mock
 
 # Import after mocks
+from kospel_cmi import KospelConnectionError
 from custom_components.kospel.climate import KospelClimateEntity
+from custom_components.kospel.transaction import RegisterTransaction, TransactionResult
 
 ClimateEntityFeature = _ClimateEntityFeature
 HVACAction = climate_mock.HVACAction
@@ -115,9 +122,24 @@ def mock_coordinator():
     coordinator.entry.entry_id = "test-entry-id"
     coordinator.last_update_success = True
     coordinator.communication_ok = True
+    coordinator.transaction = lambda: RegisterTransaction({"0b55": "0000"})
+    coordinator.async_commit = AsyncMock(side_effect=_commit_all)
+    coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
 
+async def _commit_all(transaction: RegisterTransaction) -> TransactionResult:
+    """Stand-in for a commit where every write was applied."""
+    registers = tuple(write.register for write in transaction.writes)
+    return TransactionResult(transaction.writes, registers, registers, True)
+
+
+def _planned(coordinator) -> list[tuple[str, str]]:
+    """Register writes of the committed transaction, in send order."""
+    transaction = coordinator.async_commit.call_args.args[0]
+    return [(write.register, write.value) for write in transaction.writes]
+
+
 @pytest.fixture
 def climate_entity(mock_coordinator):
     """Create KospelClimateEntity with mocked coordinator."""
@@ -214,7 +236,7 @@ class TestClimateHvacModeAndPreset:
 
 
 class TestClimateSetTemperature:
-    """Tests for async_set_temperature (delegates to set_manual_heating on the device)."""
+    """Tests for async_set_temperature (manual heating as one transaction)."""
 
     @pytest.mark.asyncio
     async def test_set_temperature_raises_when_not_manual(
@@ -223,83 +245,79 @@ class TestClimateSetTemperature:
         """async_set_temperature raises when the device is not in MANUAL."""
         mock_controller = MagicMock()
         mock_controller.heater_mode = HeaterMode.WINTER
-        mock_controller.set_manual_heating = AsyncMock(return_value=True)
         mock_coordinator.data = mock_controller
 
         with pytest.raises(HomeAssistantError, match="Heat \\(manual\\)"):
             await climate_entity.async_set_temperature(temperature=25.0)
 
-        mock_controller.set_manual_heating.assert_not_called()
+        mock_coordinator.async_commit.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_set_temperature_calls_set_manual_heating_when_manual(
+    async def test_set_temperature_commits_manual_heating_when_manual(
         self, climate_entity, mock_coordinator
     ) -> None:
-        """async_set_temperature calls set_manual_heating when in MANUAL."""
+        """Mode, room mode and temperature are written in one transaction."""
         mock_controller = MagicMock()
         mock_controller.heater_mode = HeaterMode.MANUAL
-        mock_controller.set_manual_heating = AsyncMock(return_value=True)
-        mock_coordinator.async_request_refresh = AsyncMock()
         mock_coordinator.data = mock_controller
         climate_entity.async_write_ha_state = MagicMock()
 
-        with patch("custom_components.kospel.climate.asyncio.sleep", new_callable=AsyncMock):
-            await climate_entity.async_set_temperature(temperature=25.0)
+        await climate_entity.async_set_temperature(temperature=25.0)
 
-        mock_controller.set_manual_heating.assert_called_once_with(25.0)
+        assert _planned(mock_coordinator) == [
+            ("0b55", "2002"),
+            ("0b32", "4000"),
+            ("0b8d", "fa00"),
+        ]
         mock_coordinator.async_request_refresh.assert_called_once()
 
-
-class TestClimateSetHvacMode:
-    """Tests for async_set_hvac_mode device mapping."""
-
     @pytest.mark.asyncio
-    async def test_set_hvac_off_sets_heater_off(
+    async def test_incomplete_transaction_raises_without_refresh(
         self, climate_entity, mock_coordinator
     ) -> None:
-        """HVAC OFF sets HeaterMode.OFF."""
+        """A partly applied write shows the device state and raises."""
         mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
+        mock_controller.heater_mode = HeaterMode.MANUAL
         mock_coordinator.data = mock_controller
         climate_entity.async_write_ha_state = MagicMock()
 
-        with patch("custom_components.kospel.climate.asyncio.sleep", new_callable=AsyncMock):
-            await climate_entity.async_set_hvac_mode(HVACMode.OFF)
+        async def _partial(transaction: RegisterTransaction) -> TransactionResult:
+            writes = transaction.writes
+            return TransactionResult(
+                writes, ("0b55",), ("0b55",), True, error=KospelConnectionError("reset")
+            )
 
-        mock_controller.set_heater_mode.assert_called_once_with(HeaterMode.OFF)
+        mock_coordinator.async_commit = AsyncMock(side_effect=_partial)
 
-    @pytest.mark.asyncio
-    async def test_set_hvac_heat_sets_manual(
-        self, climate_entity, mock_coordinator
-    ) -> None:
-        """HVAC HEAT sets HeaterMode.MANUAL."""
-        mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
-        mock_coordinator.data = mock_controller
-        climate_entity.async_write_ha_state = MagicMock()
+        with pytest.raises(HomeAssistantError, match="not applied 0b32, 0b8d"):
+            await climate_entity.async_set_temperature(temperature=25.0)
 
-        with patch("custom_components.kospel.climate.asyncio.sleep", new_callable=AsyncMock):
-            await climate_entity.async_set_hvac_mode(HVACMode.HEAT)
+        climate_entity.async_write_ha_state.assert_called_once()
+        mock_coordinator.async_request_refresh.assert_not_called()
 
-        mock_controller.set_heater_mode.assert_called_once_with(HeaterMode.MANUAL)
+
+class TestClimateSetHvacMode:
+    """Tests for async_set_hvac_mode device mapping."""
 
     @pytest.mark.asyncio
-    async def test_set_hvac_auto_sets_winter_default(
-        self, climate_entity, mock_coordinator
+    @pytest.mark.parametrize(
+        ("hvac_mode", "planned"),
+        [
+            ("off", [("0b55", "0000")]),
+            ("heat", [("0b55", "2002"), ("0b32", "4000")]),
+            ("auto", [("0b55", "2000")]),
+        ],
+    )
+    async def test_set_hvac_mode_writes_heater_mode(
+        self, climate_entity, mock_coordinator, hvac_mode, planned
     ) -> None:
-        """HVAC AUTO defaults to HeaterMode.WINTER."""
-        mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
-        mock_coordinator.data = mock_controller
+        """OFF, HEAT (manual, with room mode) and AUTO (winter) map to 0b55 writes."""
         climate_entity.async_write_ha_state = MagicMock()
 
-        with patch("custom_components.kospel.climate.asyncio.sleep", new_callable=AsyncMock):
-            await climate_entity.async_set_hvac_mode(HVACMode.AUTO)
+        await climate_entity.async_set_hvac_mode(hvac_mode)
 
-        mock_controller.set_heater_mode.assert_called_once_with(HeaterMode.WINTER)
+        assert _planned(mock_coordinator) == planned
+        mock_coordinator.async_request_refresh.assert_called_once()
 
 
 class TestClimateSetPresetMode:
@@ -309,44 +327,45 @@ class TestClimateSetPresetMode:
     async def test_set_preset_none_is_noop(
         self, climate_entity, mock_coordinator
     ) -> None:
-        """Preset 'none' does not call the controller."""
-        mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.data = mock_controller
-
+        """Preset 'none' does not write."""
         await climate_entity.async_set_preset_mode(PRESET_NONE)
 
-        mock_controller.set_heater_mode.assert_not_called()
+        mock_coordinator.async_commit.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_set_preset_summer_calls_controller(
+    async def test_set_preset_summer_writes_summer_mode(
         self, climate_entity, mock_coordinator
     ) -> None:
         """Setting summer preset writes HeaterMode.SUMMER."""
-        mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.async_request_refresh = AsyncMock()
-        mock_coordinator.data = mock_controller
         climate_entity.async_write_ha_state = MagicMock()
 
-        with patch("custom_components.kospel.climate.asyncio.sleep", new_callable=AsyncMock):
-            await climate_entity.async_set_preset_mode(HeaterMode.SUMMER.value)
+        await climate_entity.async_set_preset_mode(HeaterMode.SUMMER.value)
 
-        mock_controller.set_heater_mode.assert_called_once_with(HeaterMode.SUMMER)
+        assert _planned(mock_coordinator) == [("0b55", "0800")]
+
+    @pytest.mark.asyncio
+    async def test_set_current_preset_is_not_written(
+        self, climate_entity, mock_coordinator
+    ) -> None:
+        """Re-selecting the active program skips write and refresh."""
+        mock_coordinator.transaction = lambda: RegisterTransaction(
+            {"0b55": "2000"}, {"0b55": "2000"}
+        )
+
+        await climate_entity.async_set_preset_mode(HeaterMode.WINTER.value)
+
+        assert _planned(mock_coordinator) == []
+        mock_coordinator.async_request_refresh.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_set_preset_invalid_raises(
         self, climate_entity, mock_coordinator
     ) -> None:
         """Unknown preset raises HomeAssistantError."""
-        mock_controller = MagicMock()
-        mock_controller.set_heater_mode = AsyncMock()
-        mock_coordinator.data = mock_controller
-
         with pytest.raises(HomeAssistantError, match="Unsupported preset"):
             await climate_entity.async_set_preset_mode("not_a_mode")
 
-        mock_controller.set_heater_mode.assert_not_called()
+        mock_coordinator.async_commit.assert_not_called()
 
 
 class TestClimateHvacAction:
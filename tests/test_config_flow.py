@@ -5,6 +5,7 @@ since homeassistant has strict dependency constraints that conflict with
 the project's aiohttp version.
 """
 
+import asyncio
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -42,8 +43,13 @@ class _OptionsFlowWithConfigEntryBase:
     def async_create_entry(self, title, data):
         return {"type": "create_entry", "data": data}
 
-    def async_show_form(self, step_id, data_schema):
-        return {"type": "show_form", "step_id": step_id, "data_schema": data_schema}
+    def async_show_form(self, step_id, data_schema, errors=None):
+        return {
+            "type": "show_form",
+            "step_id": step_id,
+            "data_schema": data_schema,
+            "errors": errors or {},
+        }
 
 
 _config_entries_mock = MagicMock()
@@ -65,6 +71,7 @@ sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
 
 # DeviceInfo is typically a TypedDict - use a simple dict-like
@@ -76,6 +83,8 @@ sys.modules["homeassistant.helpers.entity"].DeviceInfo = _device_info
 
 from custom_components.kospel.const import (
     CONF_DEVICE_ID,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
     CONF_REFRESH_DELAY_AFTER_SET,
     CONF_SERIAL_NUMBER,
     DEFAULT_REFRESH_DELAY_AFTER_SET,
@@ -87,7 +96,10 @@ from custom_components.kospel.const import (
 )
 from custom_components.kospel.config_flow import (
     CannotConnect,
+    KEEP_SCANNING_OPTION,
     KospelConfigFlowHandler,
+    _DhcpCandidateRegistry,
+    _DiscoveryProgress,
     KospelOptionsFlowHandler,
     validate_http_input,
     _DHCP_CANDIDATE_HOSTS,
@@ -96,9 +108,19 @@ from custom_components.kospel.config_flow import (
     _get_subnets_to_scan,
     _is_kospel_mac,
     _normalize_mac,
+    _prioritize_neighbor_hosts,
+    _read_neighbor_table,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_probe_state():
+    """Probe results and DHCP candidates are module-level; isolate tests."""
+    _DHCP_CANDIDATE_HOSTS.clear()
+    yield
+    _DHCP_CANDIDATE_HOSTS.clear()
+
+
 class TestMakeUniqueId:
     """Tests for make_unique_id."""
 
@@ -214,6 +236,48 @@ class TestValidateHttpInput:
                 )
 
 
+    @pytest.mark.asyncio
+    async def test_reuses_fresh_probe_result(self) -> None:
+        """A fresh result listing the device_id skips the probe."""
+        mock_info = MagicMock()
+        mock_info.device_ids = [65, 66]
+        mock_info.serial_number = "mi01_001"
+        _DHCP_CANDIDATE_HOSTS.record("192.168.1.100", mock_info)
+
+        with patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+        ) as mock_probe:
+            result = await validate_http_input(
+                MagicMock(),
+                {"heater_ip": "192.168.1.100", "device_id": 66},
+            )
+
+        mock_probe.assert_not_awaited()
+        assert result["serial_number"] == "mi01_001"
+
+    @pytest.mark.asyncio
+    async def test_reuses_dhcp_probe_result(self) -> None:
+        """A DHCP candidate probe serves the validation from the same cache."""
+        mock_info = MagicMock()
+        mock_info.device_ids = [65]
+        mock_info.serial_number = "mi01_001"
+
+        with patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=mock_info,
+        ) as mock_probe:
+            await _DHCP_CANDIDATE_HOSTS.async_probe(MagicMock(), "192.168.1.100")
+            result = await validate_http_input(
+                MagicMock(),
+                {"heater_ip": "192.168.1.100", "device_id": 65},
+            )
+
+        mock_probe.assert_awaited_once()
+        assert result["serial_number"] == "mi01_001"
+
+
 class TestGetSubnetsToScan:
     """Tests for _get_subnets_to_scan."""
 
@@ -308,19 +372,109 @@ class TestDiscoverByKospelMac:
         """_discover_by_kospel_mac probes DHCP hosts and expands device IDs."""
         _DHCP_CANDIDATE_HOSTS.clear()
         _DHCP_CANDIDATE_HOSTS.update({"192.168.1.10"})
-        session = MagicMock()
+        hass = MagicMock()
         discovered = MagicMock()
         discovered.device_ids = [65, 66]
 
+        with (
+            patch(
+                "custom_components.kospel.config_flow.probe_device",
+                new_callable=AsyncMock,
+                return_value=discovered,
+            ) as mock_probe,
+            patch(
+                "custom_components.kospel.config_flow.aiohttp_client"
+            ) as aiohttp_client,
+        ):
+            result = await _discover_by_kospel_mac(hass)
+
+        aiohttp_client.async_get_clientsession.assert_called_once_with(hass)
+        mock_probe.assert_awaited_once_with(
+            aiohttp_client.async_get_clientsession.return_value, "192.168.1.10"
+        )
+        assert result == [(discovered, 65), (discovered, 66)]
+
+
+class TestDhcpCandidateRegistry:
+    """Tests for bounded DHCP candidates and deduplicated probes."""
+
+    def test_evicts_oldest_above_size_bound(self) -> None:
+        """Adding beyond max_hosts drops the least recently seen host."""
+        registry = _DhcpCandidateRegistry(max_hosts=2)
+        registry.update(["10.0.0.1", "10.0.0.2"])
+        registry.add("10.0.0.1")
+        registry.add("10.0.0.3")
+        assert sorted(registry) == ["10.0.0.1", "10.0.0.3"]
+
+    def test_expires_hosts_after_ttl(self) -> None:
+        """Hosts older than the TTL are no longer candidates."""
+        registry = _DhcpCandidateRegistry(ttl_seconds=60.0)
+        clock = "custom_components.kospel.config_flow.time.monotonic"
+        with patch(clock, return_value=0.0):
+            registry.add("10.0.0.1")
+        with patch(clock, return_value=61.0):
+            assert "10.0.0.1" not in registry
+            assert not registry
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_request(self) -> None:
+        """Parallel probes of one host await a single probe_device call."""
+        registry = _DhcpCandidateRegistry()
+        info = MagicMock()
+        release = asyncio.Event()
+
+        async def _probe(session, host):
+            await release.wait()
+            return info
+
         with patch(
             "custom_components.kospel.config_flow.probe_device",
-            new_callable=AsyncMock,
-            return_value=discovered,
+            AsyncMock(side_effect=_probe),
         ) as mock_probe:
-            result = await _discover_by_kospel_mac(session)
+            first = asyncio.ensure_future(registry.async_probe(MagicMock(), "10.0.0.1"))
+            second = asyncio.ensure_future(
+                registry.async_probe(MagicMock(), "10.0.0.1")
+            )
+            await asyncio.sleep(0)
+            release.set()
+            assert await first is info
+            assert await second is info
+            assert await registry.async_probe(MagicMock(), "10.0.0.1") is info
 
-        mock_probe.assert_awaited_once_with(session, "192.168.1.10")
-        assert result == [(discovered, 65), (discovered, 66)]
+        assert mock_probe.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_probe_outlives_the_first_caller(self) -> None:
+        """The shared probe uses the shared session, not the first caller's."""
+        registry = _DhcpCandidateRegistry()
+        info = MagicMock()
+        release = asyncio.Event()
+        hass = MagicMock()
+
+        async def _probe(session, host):
+            await release.wait()
+            return info
+
+        with (
+            patch(
+                "custom_components.kospel.config_flow.probe_device",
+                AsyncMock(side_effect=_probe),
+            ) as mock_probe,
+            patch(
+                "custom_components.kospel.config_flow.aiohttp_client"
+            ) as aiohttp_client,
+        ):
+            first = asyncio.ensure_future(registry.async_probe(hass, "10.0.0.1"))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(registry.async_probe(hass, "10.0.0.1"))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+            assert await second is info
+
+        mock_probe.assert_awaited_once_with(
+            aiohttp_client.async_get_clientsession.return_value, "10.0.0.1"
+        )
 
 
 class TestConfigFlowDiscoveryFallback:
@@ -408,6 +562,154 @@ class TestConfigFlowDiscoveryFallback:
         mock_auto.assert_awaited_once()
 
 
+class TestIncrementalDiscovery:
+    """Tests for streamed discovery results and early stop."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_devices_found_so_far(self) -> None:
+        """Devices streamed before the deadline survive a discovery timeout."""
+        handler = KospelConfigFlowHandler()
+        handler.hass = MagicMock()
+        handler._discovery_method = "network_scan"
+        found = MagicMock()
+        found.device_ids = [65]
+        found.serial_number = "mi01_123"
+
+        async def _slow_scan(hass, session, progress):
+            progress.host_probed(found)
+            await asyncio.sleep(10)
+
+        with patch(
+            "custom_components.kospel.config_flow._discover_by_network_scan",
+            side_effect=_slow_scan,
+        ), patch(
+            "custom_components.kospel.config_flow.DISCOVERY_TIMEOUT_SECONDS", 0.01
+        ):
+            await handler._async_run_discovery()
+
+        assert handler._discovered_devices == [(found, 65)]
+        assert handler._discovery.finished
+
+    def test_progress_ignores_duplicate_devices(self) -> None:
+        """The same serial/device pair is only offered once."""
+        progress = _DiscoveryProgress()
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+        progress.add_hosts(2)
+        progress.host_probed(info)
+        progress.host_probed(info)
+        assert progress.devices == [(info, 65)]
+        assert progress.fraction == 1.0
+
+    @pytest.mark.asyncio
+    async def test_result_offers_keep_scanning_while_scan_runs(self) -> None:
+        """Device list includes keep-scanning option until the scan finishes."""
+        handler = KospelConfigFlowHandler()
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+        info.host = "192.168.1.10"
+        info.devices = []
+        handler._discovery.add_devices([(info, 65)])
+        handler._scan_task = MagicMock()
+        handler._scan_task.done.return_value = False
+        handler.async_show_form = lambda step_id, data_schema, errors=None: {
+            "type": "show_form",
+            "step_id": step_id,
+            "data_schema": data_schema,
+        }
+
+        result = await handler.async_step_discover_result()
+
+        assert result["step_id"] == "select_device"
+        options = result["data_schema"].schema["device"].container
+        assert KEEP_SCANNING_OPTION in options
+        assert "mi01_123_65" in options
+        assert handler._shown_device_count == 1
+
+    @pytest.mark.asyncio
+    async def test_selecting_device_stops_running_scan(self) -> None:
+        """Choosing a device cancels the background scan and creates the entry."""
+        handler = KospelConfigFlowHandler()
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+        info.host = "192.168.1.10"
+        handler._discovered_devices = [(info, 65)]
+        scan_task = MagicMock()
+        scan_task.done.return_value = False
+        handler._scan_task = scan_task
+        handler.async_set_unique_id = AsyncMock()
+        handler._abort_if_unique_id_configured = MagicMock()
+        handler.async_create_entry = lambda title, data: {
+            "type": "create_entry",
+            "data": data,
+        }
+        _DHCP_CANDIDATE_HOSTS.record(info.host, info)
+
+        with patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+        ) as mock_probe:
+            result = await handler.async_step_select_device({"device": "mi01_123_65"})
+
+        scan_task.cancel.assert_called_once()
+        mock_probe.assert_not_awaited()
+        assert result["type"] == "create_entry"
+
+    @pytest.mark.asyncio
+    async def test_select_device_confirms_stale_result_once(self) -> None:
+        """Without a fresh probe, one confirmation probe runs before creation."""
+        handler = KospelConfigFlowHandler()
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+        info.host = "192.168.1.10"
+        handler._discovered_devices = [(info, 65)]
+        handler.async_set_unique_id = AsyncMock()
+        handler._abort_if_unique_id_configured = MagicMock()
+        handler.async_abort = lambda reason: {"type": "abort", "reason": reason}
+        handler.async_create_entry = lambda title, data: {"type": "create_entry"}
+
+        with patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=info,
+        ) as mock_probe:
+            result = await handler.async_step_select_device({"device": "mi01_123_65"})
+        assert mock_probe.await_count == 1
+        assert result["type"] == "create_entry"
+
+        moved = MagicMock()
+        moved.device_ids = [65]
+        moved.serial_number = "other"
+        _DHCP_CANDIDATE_HOSTS.clear()
+        with patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=moved,
+        ):
+            result = await handler.async_step_select_device({"device": "mi01_123_65"})
+        assert result == {"type": "abort", "reason": "cannot_connect"}
+
+    @pytest.mark.asyncio
+    async def test_keep_scanning_returns_to_progress_step(self) -> None:
+        """Keep-scanning option resumes the discover progress step."""
+        handler = KospelConfigFlowHandler()
+        with patch.object(
+            handler,
+            "async_step_discover",
+            new_callable=AsyncMock,
+            return_value={"type": "progress"},
+        ) as mock_step:
+            result = await handler.async_step_select_device(
+                {"device": KEEP_SCANNING_OPTION}
+            )
+        mock_step.assert_awaited_once()
+        assert result == {"type": "progress"}
+
+
 class TestDhcpDiscoveryStep:
     """Tests for Home Assistant DHCP discovery flow step."""
 
@@ -425,6 +727,7 @@ class TestDhcpDiscoveryStep:
     async def test_dhcp_creates_entry_for_single_device(self) -> None:
         """async_step_dhcp probes host and creates entry for single device ID."""
         handler = KospelConfigFlowHandler()
+        handler.hass = MagicMock()
         _DHCP_CANDIDATE_HOSTS.clear()
         info = MagicMock()
         info.device_ids = [65]
@@ -475,14 +778,192 @@ class TestDiscoverByNetworkScan:
             new_callable=AsyncMock,
             return_value=["192.168.1.0/24", "10.0.0.0/24"],
         ), patch(
-            "custom_components.kospel.config_flow.discover_devices",
+            "custom_components.kospel.config_flow._async_get_neighbor_table",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "custom_components.kospel.config_flow._probe_hosts",
             new_callable=AsyncMock,
             side_effect=[[info], []],
-        ) as mock_discover:
+        ) as mock_sweep:
             result = await _discover_by_network_scan(MagicMock(), MagicMock())
-        assert mock_discover.await_count == 2
+        assert mock_sweep.await_count == 2
         assert result == [(info, 65), (info, 66)]
 
+    @pytest.mark.asyncio
+    async def test_cached_module_validated_before_neighbors(self) -> None:
+        """A cached host confirmed by one probe ends discovery immediately."""
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+        info.host = "192.168.1.40"
+        cached = MagicMock()
+        cached.serial_number = "mi01_123"
+        cached.host = "192.168.1.40"
+        cached.device_ids = [65]
+        cache = MagicMock()
+        cache.modules.return_value = [cached]
+        hass = MagicMock()
+        hass.config_entries.async_entries.return_value = []
+
+        with patch(
+            "custom_components.kospel.config_flow._get_subnets_to_scan",
+            new_callable=AsyncMock,
+            return_value=["192.168.1.0/24"],
+        ), patch(
+            "custom_components.kospel.config_flow.async_get_discovery_cache",
+            new_callable=AsyncMock,
+            return_value=cache,
+        ), patch(
+            "custom_components.kospel.config_flow._async_get_neighbor_table",
+            new_callable=AsyncMock,
+        ) as mock_neighbors, patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=info,
+        ) as mock_probe:
+            result = await _discover_by_network_scan(hass, MagicMock())
+
+        assert result == [(info, 65)]
+        mock_probe.assert_awaited_once()
+        mock_neighbors.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_configured_cached_module_is_not_short_circuit(self) -> None:
+        """Cached modules that are fully configured do not end discovery early."""
+        cached = MagicMock()
+        cached.serial_number = "mi01_123"
+        cached.host = "192.168.1.40"
+        cached.device_ids = [65]
+        cache = MagicMock()
+        cache.modules.return_value = [cached]
+        hass = MagicMock()
+        entry = MagicMock()
+        entry.unique_id = "mi01_123_65"
+        hass.config_entries.async_entries.return_value = [entry]
+
+        with patch(
+            "custom_components.kospel.config_flow._get_subnets_to_scan",
+            new_callable=AsyncMock,
+            return_value=["10.0.0.0/30"],
+        ), patch(
+            "custom_components.kospel.config_flow.async_get_discovery_cache",
+            new_callable=AsyncMock,
+            return_value=cache,
+        ), patch(
+            "custom_components.kospel.config_flow._async_get_neighbor_table",
+            new_callable=AsyncMock,
+            return_value=[],
+        ), patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=None,
+        ) as mock_probe:
+            result = await _discover_by_network_scan(hass, MagicMock())
+
+        assert result == []
+        probed_hosts = [call.args[1] for call in mock_probe.await_args_list]
+        assert "192.168.1.40" not in probed_hosts
+
+    @pytest.mark.asyncio
+    async def test_neighbor_kospel_mac_hosts_probed_before_sweep(self) -> None:
+        """Kospel-MAC neighbors are probed first and skip the subnet sweep."""
+        info = MagicMock()
+        info.device_ids = [65]
+        neighbors = [
+            ("192.168.1.5", "aa:bb:cc:dd:ee:ff"),
+            ("192.168.1.20", "70:b3:d5:24:9a:01"),
+        ]
+        with patch(
+            "custom_components.kospel.config_flow._get_subnets_to_scan",
+            new_callable=AsyncMock,
+            return_value=["192.168.1.0/24"],
+        ), patch(
+            "custom_components.kospel.config_flow._async_get_neighbor_table",
+            new_callable=AsyncMock,
+            return_value=neighbors,
+        ), patch(
+            "custom_components.kospel.config_flow.probe_device",
+            new_callable=AsyncMock,
+            return_value=info,
+        ) as mock_probe:
+            session = MagicMock()
+            result = await _discover_by_network_scan(MagicMock(), session)
+
+        assert result == [(info, 65)]
+        mock_probe.assert_awaited_once()
+        assert mock_probe.await_args.args == (session, "192.168.1.20")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sweep_when_neighbors_are_not_kospel(self) -> None:
+        """Subnet sweep still runs when no neighbor answers the probe."""
+        info = MagicMock()
+        info.device_ids = [65]
+        info.serial_number = "mi01_123"
+
+        async def _probe(session, host, timeout=5.0):
+            return info if host == "192.168.1.30" else None
+
+        progress = _DiscoveryProgress()
+        with patch(
+            "custom_components.kospel.config_flow._get_subnets_to_scan",
+            new_callable=AsyncMock,
+            return_value=["192.168.1.0/24"],
+        ), patch(
+            "custom_components.kospel.config_flow._async_get_neighbor_table",
+            new_callable=AsyncMock,
+            return_value=[("192.168.1.5", "aa:bb:cc:dd:ee:ff")],
+        ), patch(
+            "custom_components.kospel.config_flow.probe_device",
+            side_effect=_probe,
+        ):
+            result = await _discover_by_network_scan(
+                MagicMock(), MagicMock(), progress
+            )
+
+        assert result == [(info, 65)]
+        # One neighbor probe plus the 254-host sweep, all streamed to progress.
+        assert progress.probed_hosts == progress.total_hosts == 255
+        assert progress.devices == [(info, 65)]
+
+
+class TestNeighborTable:
+    """Tests for neighbor (ARP) table parsing and host prioritization."""
+
+    def test_read_neighbor_table_skips_incomplete_entries(self, tmp_path) -> None:
+        """_read_neighbor_table returns resolved entries only."""
+        arp = tmp_path / "arp"
+        arp.write_text(
+            "IP address       HW type     Flags       HW address            Mask     Device\n"
+            "192.168.1.20     0x1         0x2         70:b3:d5:24:9a:01     *        eth0\n"
+            "192.168.1.21     0x1         0x0         00:00:00:00:00:00     *        eth0\n"
+            "192.168.1.22     0x1         0x2         aa:bb:cc:dd:ee:ff     *        eth0\n"
+        )
+        assert _read_neighbor_table(str(arp)) == [
+            ("192.168.1.20", "70:b3:d5:24:9a:01"),
+            ("192.168.1.22", "aa:bb:cc:dd:ee:ff"),
+        ]
+
+    def test_read_neighbor_table_missing_file_returns_empty(self, tmp_path) -> None:
+        """_read_neighbor_table returns empty list when the table is unavailable."""
+        assert _read_neighbor_table(str(tmp_path / "missing")) == []
+
+    def test_prioritize_neighbor_hosts_orders_kospel_first(self) -> None:
+        """Kospel MACs form the first tier; hosts outside subnets are dropped."""
+        from ipaddress import ip_network
+
+        kospel, other = _prioritize_neighbor_hosts(
+            [
+                ("192.168.1.5", "aa:bb:cc:dd:ee:ff"),
+                ("192.168.1.20", "70:b3:d5:24:9a:01"),
+                ("10.1.1.1", "70:b3:d5:24:9a:02"),
+                ("192.168.1.5", "aa:bb:cc:dd:ee:ff"),
+            ],
+            [ip_network("192.168.1.0/24")],
+        )
+        assert kospel == ["192.168.1.20"]
+        assert other == ["192.168.1.5"]
+
 
 class TestHttpMethodSelection:
     """Tests for explicit HTTP connection method selection."""
@@ -566,6 +1047,20 @@ class TestKospelOptionsFlowHandler:
         assert result["step_id"] == "init"
         assert handler.options.get(CONF_REFRESH_DELAY_AFTER_SET) == 2.5
 
+    @pytest.mark.asyncio
+    async def test_init_form_rejects_min_interval_above_max(self) -> None:
+        """A minimum polling interval above the maximum is reported, not saved."""
+        config_entry = MagicMock()
+        config_entry.options = {}
+        handler = KospelOptionsFlowHandler(config_entry)
+
+        result = await handler.async_step_init(
+            user_input={CONF_MIN_UPDATE_INTERVAL: 90.0, CONF_MAX_UPDATE_INTERVAL: 30.0}
+        )
+
+        assert result["type"] == "show_form"
+        assert result["errors"] == {"base": "invalid_update_interval_bounds"}
+
     def test_async_get_options_flow_returns_handler(self) -> None:
         """async_get_options_flow returns KospelOptionsFlowHandler instance."""
         config_entry = MagicMock()
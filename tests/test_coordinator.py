@@ -0,0 +1,498 @@
+"""Tests for coordinator polling (adaptive interval, burst reads)."""
+
+import asyncio
+import importlib.util
+import sys
+import types
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from kospel_cmi import IncompleteRegisterRefreshError, KospelConnectionError
+from kospel_cmi.controller.device import EkcoM3
+from kospel_cmi.registers.enums import HeaterMode, HeatingStatus
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+import custom_components.kospel  # noqa: E402,F401
+from custom_components.kospel.const import (  # noqa: E402
+    DEFAULT_REFRESH_DELAY_AFTER_SET,
+    PROPERTY_REGISTERS,
+)
+from custom_components.kospel.scheduler import (  # noqa: E402
+    RequestScheduler,
+    ScheduledRegisterBackend,
+)
+
+
+class _StubDataUpdateCoordinator:
+    """Minimal real base class so coordinator methods can run."""
+
+    def __init__(self, hass, logger, *, config_entry, name, update_interval, always_update):
+        self.hass = hass
+        self.update_interval = update_interval
+        self.last_update_success = True
+        self.published = 0
+        self.async_request_refresh = AsyncMock()
+
+    def __class_getitem__(cls, item):
+        return cls
+
+    def async_set_updated_data(self, data) -> None:
+        self.published += 1
+
+
+def _load_coordinator_module() -> types.ModuleType:
+    """Load coordinator.py against the stub base under a private module name."""
+    stub = types.ModuleType("homeassistant.helpers.update_coordinator")
+    stub.DataUpdateCoordinator = _StubDataUpdateCoordinator
+    stub.UpdateFailed = type("UpdateFailed", (Exception,), {})
+    saved = sys.modules["homeassistant.helpers.update_coordinator"]
+    sys.modules["homeassistant.helpers.update_coordinator"] = stub
+    try:
+        path = (
+            Path(__file__).resolve().parent.parent
+            / "custom_components"
+            / "kospel"
+            / "coordinator.py"
+        )
+        spec = importlib.util.spec_from_file_location(
+            "custom_components.kospel._coordinator_under_test", path
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.modules["homeassistant.helpers.update_coordinator"] = saved
+    return module
+
+
+_coordinator = _load_coordinator_module()
+
+
+def _make_coordinator(backend) -> "_coordinator.KospelDataUpdateCoordinator":
+    """Coordinator on a mock entry whose background tasks run on the loop."""
+    entry = MagicMock()
+    entry.entry_id = "entry"
+    entry.options = {}
+    entry.async_create_background_task = lambda hass, coro, name: asyncio.create_task(
+        coro
+    )
+    controller = MagicMock()
+    controller.refresh = AsyncMock()
+    coordinator = _coordinator.KospelDataUpdateCoordinator(
+        MagicMock(), entry, controller, backend=backend
+    )
+    coordinator._async_record_samples = MagicMock()
+    return coordinator
+
+
+def _full_batch() -> dict[str, str]:
+    """Batch response holding every required register."""
+    return {register: "0000" for register in EkcoM3.REQUIRED_REGISTERS}
+
+
+class TestRegisterSpans:
+    """Tests for grouping registers into batch reads."""
+
+    def test_close_registers_share_a_read(self) -> None:
+        """Registers within the gap are read together; far ones split."""
+        assert _coordinator.register_spans(["0b4c", "0b46", "0b4a", "0b4b"]) == [
+            ("0b46", 7)
+        ]
+        assert _coordinator.register_spans(["0b46", "0b8d", "0b4a"]) == [
+            ("0b46", 5),
+            ("0b8d", 1),
+        ]
+
+
+class TestAdaptivePolling:
+    """Tests for the state-driven polling interval."""
+
+    MIN = timedelta(seconds=5)
+    MAX = timedelta(seconds=60)
+
+    def test_interval_follows_state(self) -> None:
+        """Heating polls fast, idle off/summer slow, anything else at the default."""
+        interval = _coordinator.adaptive_update_interval
+        assert (
+            interval(
+                HeatingStatus.IDLE,
+                HeatingStatus.RUNNING,
+                HeaterMode.SUMMER,
+                self.MIN,
+                self.MAX,
+            )
+            == self.MIN
+        )
+        assert (
+            interval(
+                HeatingStatus.DISABLED,
+                HeatingStatus.IDLE,
+                HeaterMode.OFF,
+                self.MIN,
+                self.MAX,
+            )
+            == self.MAX
+        )
+        assert interval(
+            HeatingStatus.IDLE, HeatingStatus.IDLE, HeaterMode.WINTER, self.MIN, self.MAX
+        ) == timedelta(seconds=15)
+        # Unknown states are not treated as quiet.
+        assert interval(None, None, None, self.MIN, self.MAX) == timedelta(seconds=15)
+
+    def test_refresh_adapts_and_writes_boost(self) -> None:
+        """Refreshes pick the state interval; writes and mode changes force the minimum."""
+        coordinator = _make_coordinator(MagicMock())
+        controller = coordinator.heater_controller
+        controller.co_heating_status = HeatingStatus.IDLE
+        controller.cwu_heating_status = HeatingStatus.IDLE
+        controller.heater_mode = HeaterMode.SUMMER
+
+        coordinator._async_adapt_update_interval()
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+        coordinator.async_boost_polling()
+        assert coordinator.update_interval == timedelta(seconds=5)
+        coordinator._async_adapt_update_interval()
+        assert coordinator.update_interval == timedelta(seconds=5)
+
+        coordinator._boost_until = 0.0
+        coordinator._async_adapt_update_interval()
+        assert coordinator.update_interval == timedelta(seconds=60)
+
+        controller.heater_mode = HeaterMode.OFF
+        coordinator._async_adapt_update_interval()
+        assert coordinator.update_interval == timedelta(seconds=5)
+
+    def test_degraded_latency_stretches_interval(self) -> None:
+        """Polling slows by the module's latency load factor."""
+        coordinator = _make_coordinator(MagicMock())
+        coordinator.latency = MagicMock(load_factor=2.0)
+        controller = coordinator.heater_controller
+        controller.co_heating_status = HeatingStatus.RUNNING
+        controller.cwu_heating_status = HeatingStatus.IDLE
+        controller.heater_mode = HeaterMode.WINTER
+
+        coordinator._async_adapt_update_interval()
+
+        assert coordinator.update_interval == timedelta(seconds=10)
+
+    def test_degraded_latency_stays_within_max_interval(self) -> None:
+        """The stretched interval is still capped at the configured maximum."""
+        coordinator = _make_coordinator(MagicMock())
+        coordinator.latency = MagicMock(load_factor=4.0)
+        controller = coordinator.heater_controller
+        controller.co_heating_status = HeatingStatus.DISABLED
+        controller.cwu_heating_status = HeatingStatus.IDLE
+        controller.heater_mode = HeaterMode.OFF
+
+        coordinator._async_adapt_update_interval()
+
+        assert coordinator.update_interval == coordinator.max_update_interval
+
+
+class TestRegisterFreshness:
+    """Tests for per-register timestamps and entity availability."""
+
+    def test_property_registers_cover_library_reads(self) -> None:
+        """Every mapped property decodes from its mapped registers alone."""
+        for name, registers in PROPERTY_REGISTERS.items():
+            controller = EkcoM3(MagicMock())
+            controller.from_registers({register: "0000" for register in registers})
+            getattr(controller, name)
+
+    def test_availability_follows_register_age(self) -> None:
+        """Fresh registers are available; stale or unread ones are not."""
+        coordinator = _make_coordinator(MagicMock())
+        coordinator._async_mark_fresh(["0b46", "0b55"])
+
+        assert coordinator.registers_available(("0b46",))
+        assert not coordinator.registers_available(("0b46", "0b62"))
+        assert coordinator.data_age(("0b62",)) is None
+        assert coordinator.registers_available(())
+
+        coordinator._register_updated["0b55"] -= coordinator.stale_after + 1
+        assert not coordinator.registers_available(("0b55",))
+        assert coordinator.registers_available(("0b46",))
+        assert coordinator.data_age(("0b46", "0b55")) > coordinator.stale_after
+
+    def test_stale_after_scales_with_slow_polling(self) -> None:
+        """At long intervals registers stay valid for several polls."""
+        coordinator = _make_coordinator(MagicMock())
+        coordinator.update_interval = timedelta(seconds=5)
+        assert coordinator.stale_after == 90.0
+        coordinator.update_interval = timedelta(seconds=60)
+        assert coordinator.stale_after == 360.0
+
+
+class TestRefreshRead:
+    """Tests for the batch read with re-fetch, in-cycle retry and hedging."""
+
+    @pytest.mark.asyncio
+    async def test_missing_registers_are_refetched_and_merged(self) -> None:
+        """Registers missing from the batch are read in spans and merged."""
+        batch = _full_batch()
+        del batch["0b46"], batch["0b4a"]
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(
+            side_effect=[batch, {"0b46": "0a00", "0b48": "ffff", "0b4a": "a401"}]
+        )
+        coordinator = _make_coordinator(backend)
+
+        await coordinator._async_refresh_controller()
+
+        backend.read_registers.assert_awaited_with("0b46", 5)
+        loaded = coordinator.heater_controller.from_registers.call_args.args[0]
+        assert loaded == {**_full_batch(), "0b46": "0a00", "0b4a": "a401"}
+
+    @pytest.mark.asyncio
+    async def test_still_missing_registers_refuse_the_snapshot(self) -> None:
+        """A register missing after the re-fetch fails without touching the cache."""
+        batch = _full_batch()
+        del batch["0b55"]
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(side_effect=[batch, {}])
+        coordinator = _make_coordinator(backend)
+
+        with pytest.raises(IncompleteRegisterRefreshError) as err:
+            await coordinator._async_refresh_controller()
+
+        assert err.value.missing_registers == frozenset({"0b55"})
+        assert backend.read_registers.await_count == 2
+        coordinator.heater_controller.from_registers.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_error_is_retried_once(self) -> None:
+        """One connection error is absorbed; a second one fails the cycle."""
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(
+            side_effect=[KospelConnectionError("reset"), _full_batch()]
+        )
+        coordinator = _make_coordinator(backend)
+
+        await coordinator._async_refresh_controller()
+        assert backend.read_registers.await_count == 2
+        coordinator.heater_controller.from_registers.assert_called_once()
+
+        backend.read_registers = AsyncMock(side_effect=KospelConnectionError("reset"))
+        with pytest.raises(KospelConnectionError):
+            await coordinator._async_refresh_controller()
+        assert backend.read_registers.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hedged_read_wins_over_slow_one(self) -> None:
+        """A slow first read is hedged after p95; the loser is cancelled."""
+        coordinator = _make_coordinator(MagicMock())
+        coordinator.hedged_reads = True
+        coordinator.latency = MagicMock(sample_count=100)
+        coordinator.latency.percentile.return_value = 0.01
+        calls = 0
+        cancelled = asyncio.Event()
+
+        async def _read_registers(start_register: str, count: int) -> dict[str, str]:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return _full_batch()
+
+        coordinator.backend.read_registers = _read_registers
+        coordinator.hedge_backend = coordinator.backend
+
+        await asyncio.wait_for(coordinator._async_refresh_controller(), 1)
+        await asyncio.sleep(0)
+
+        assert calls == 2
+        assert cancelled.is_set()
+        coordinator.heater_controller.from_registers.assert_called_once_with(
+            _full_batch()
+        )
+
+    @pytest.mark.asyncio
+    async def test_hedged_read_runs_next_to_the_scheduled_one(self) -> None:
+        """The hedge bypasses the one-at-a-time module queue."""
+        in_flight = 0
+        max_in_flight = 0
+        calls = 0
+
+        async def _read_registers(start_register: str, count: int) -> dict[str, str]:
+            nonlocal in_flight, max_in_flight, calls
+            calls += 1
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                await asyncio.sleep(10 if calls == 1 else 0.01)
+            finally:
+                in_flight -= 1
+            return _full_batch()
+
+        module = MagicMock()
+        module.read_registers = _read_registers
+        coordinator = _make_coordinator(
+            ScheduledRegisterBackend(module, RequestScheduler("10.0.0.5"))
+        )
+        coordinator.hedge_backend = module
+        coordinator.hedged_reads = True
+        coordinator.latency = MagicMock(sample_count=100)
+        coordinator.latency.percentile.return_value = 0.01
+
+        await asyncio.wait_for(coordinator._async_refresh_controller(), 1)
+
+        assert calls == 2
+        assert max_in_flight == 2
+
+
+class TestIpRecovery:
+    """Tests for rediscovering a heater that changed address."""
+
+    @pytest.mark.asyncio
+    async def test_recovery_updates_entry_once_per_cooldown(self) -> None:
+        """The new address goes into entry data; attempts are kept on hass."""
+        hass = MagicMock()
+        hass.data = {}
+        entry = MagicMock()
+        entry.entry_id = "entry"
+        entry.data = {
+            _coordinator.CONF_HEATER_IP: "10.0.0.5",
+            _coordinator.CONF_SERIAL_NUMBER: "mi01_00006047",
+        }
+        rediscover = AsyncMock(return_value=MagicMock(host="10.0.0.9"))
+
+        with (
+            patch.object(_coordinator, "async_rediscover_module", rediscover),
+            patch.object(_coordinator.aiohttp, "ClientSession", MagicMock()),
+        ):
+            assert await _coordinator.async_recover_heater_address(hass, entry)
+            assert not await _coordinator.async_recover_heater_address(hass, entry)
+
+        rediscover.assert_awaited_once()
+        hass.config_entries.async_update_entry.assert_called_once_with(
+            entry, data={**entry.data, _coordinator.CONF_HEATER_IP: "10.0.0.9"}
+        )
+        # The entry's update listener reloads it; nothing else does.
+        hass.config_entries.async_reload.assert_not_called()
+        assert "entry" in hass.data[_coordinator.DATA_IP_RECOVERY_ATTEMPTS]
+
+
+class TestRegisterTransactions:
+    """Tests for committing register writes through the coordinator."""
+
+    @pytest.mark.asyncio
+    async def test_commit_loads_verified_registers(self) -> None:
+        """Read-back values replace the snapshot before the next refresh."""
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(return_value=_full_batch())
+        coordinator = _make_coordinator(backend)
+        await coordinator._async_refresh_controller()
+        backend.write_register = AsyncMock()
+        backend.read_registers = AsyncMock(return_value={"0b62": "0200"})
+
+        transaction = coordinator.transaction()
+        transaction.set_boiler_max_power_index(2)
+        with patch(
+            "custom_components.kospel.transaction.asyncio.sleep", new_callable=AsyncMock
+        ) as sleep:
+            result = await coordinator.async_commit(transaction)
+
+        # The read back waits until the device persisted the write.
+        sleep.assert_awaited_once_with(DEFAULT_REFRESH_DELAY_AFTER_SET)
+        assert result.complete
+        backend.write_register.assert_awaited_once_with("0b62", "0200")
+        assert coordinator.registers == {**_full_batch(), "0b62": "0200"}
+        coordinator.heater_controller.from_registers.assert_called_with(
+            coordinator.registers
+        )
+        assert coordinator.data_age(("0b62",)) is not None
+
+
+    @pytest.mark.asyncio
+    async def test_only_fresh_registers_elide_writes(self) -> None:
+        """A value read too long ago is written even if it looks unchanged."""
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(return_value=_full_batch())
+        coordinator = _make_coordinator(backend)
+        await coordinator._async_refresh_controller()
+        coordinator._register_updated["0b68"] -= coordinator.stale_after + 1
+        backend.write_register = AsyncMock()
+
+        transaction = coordinator.transaction()
+        transaction.set_boiler_max_power_index(0)
+        transaction.set_room_preset("set_room_temperature_economy", 0.0)
+        with patch(
+            "custom_components.kospel.transaction.asyncio.sleep", new_callable=AsyncMock
+        ):
+            await coordinator.async_commit(transaction)
+
+        backend.write_register.assert_awaited_once_with("0b68", "0000")
+        assert coordinator.elided_writes == 1
+
+
+class TestBurstPolling:
+    """Tests for the burst loop."""
+
+    @pytest.mark.asyncio
+    async def test_burst_merges_wanted_registers_and_resumes(self) -> None:
+        """Only requested registers are merged; the schedule resumes afterwards."""
+        backend = MagicMock()
+        backend.read_registers = AsyncMock(
+            side_effect=[
+                {**_full_batch(), "0b47": "1111"},
+                {"0b46": "0a00", "0b47": "ffff"},
+                {"0b46": "1400", "0b47": "ffff"},
+            ]
+            + [{"0b46": "1400", "0b47": "ffff"}] * 50
+        )
+        coordinator = _make_coordinator(backend)
+        interval = coordinator.update_interval
+
+        coordinator.async_start_burst(["0b46"], 0.01, timedelta(seconds=0.05))
+        assert coordinator.update_interval is None
+        assert coordinator.burst_active
+        await coordinator._burst_task
+
+        backend.read_registers.assert_any_await("0b00", 256)
+        backend.read_registers.assert_any_await("0b46", 1)
+        merged = coordinator.heater_controller.from_registers.call_args.args[0]
+        assert merged == {**_full_batch(), "0b46": "1400", "0b47": "1111"}
+        assert coordinator._async_record_samples.call_count >= 2
+        # Entity state is published at most every BURST_PUBLISH_INTERVAL.
+        assert coordinator.published == 1
+        assert coordinator.update_interval == interval
+        assert not coordinator.burst_active
+        coordinator.async_request_refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_burst_needs_backend(self) -> None:
+        """Without direct backend access bursts are refused."""
+        coordinator = _make_coordinator(None)
+
+        with pytest.raises(ValueError):
+            coordinator.async_start_burst(["0b46"], 1.0, timedelta(minutes=1))
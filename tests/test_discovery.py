@@ -0,0 +1,205 @@
+"""Tests for the persistent discovery cache (serial number -> host)."""
+
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.discovery import (  # noqa: E402
+    DATA_DISCOVERY_CACHE,
+    KospelDiscoveryCache,
+    async_get_discovery_cache,
+    async_rediscover_module,
+    hosts_near,
+)
+
+
+def _info(serial: str, host: str, device_ids: list[int]) -> MagicMock:
+    """Build a probe result stand-in (KospelDeviceInfo)."""
+    info = MagicMock()
+    info.serial_number = serial
+    info.host = host
+    info.device_ids = device_ids
+    return info
+
+
+@pytest.fixture
+def store() -> MagicMock:
+    """Store stand-in with async load and delayed save."""
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=None)
+    return store
+
+
+class TestKospelDiscoveryCache:
+    """Tests for recording, persistence and TTL eviction."""
+
+    def test_record_stores_module_and_schedules_save(self, store) -> None:
+        """async_record keeps host and device IDs keyed by serial number."""
+        cache = KospelDiscoveryCache(store)
+        cache.async_record(_info("mi01_1", "192.168.1.10", [65, 66]))
+
+        module = cache.get("mi01_1")
+        assert module is not None
+        assert module.host == "192.168.1.10"
+        assert module.device_ids == [65, 66]
+        store.async_delay_save.assert_called_once()
+        data = store.async_delay_save.call_args.args[0]()
+        assert data["modules"]["mi01_1"]["host"] == "192.168.1.10"
+
+    @pytest.mark.asyncio
+    async def test_load_drops_expired_and_malformed_entries(self, store) -> None:
+        """async_load keeps fresh entries only."""
+        now = time.time()
+        store.async_load.return_value = {
+            "modules": {
+                "fresh": {"host": "10.0.0.2", "device_ids": [65], "last_seen": now},
+                "stale": {"host": "10.0.0.3", "device_ids": [65], "last_seen": 0},
+                "broken": {"host": "10.0.0.4"},
+            }
+        }
+        cache = KospelDiscoveryCache(store, ttl_seconds=3600)
+        await cache.async_load()
+
+        assert [module.serial_number for module in cache.modules()] == ["fresh"]
+
+    def test_modules_ordered_most_recent_first(self, store) -> None:
+        """modules() returns the most recently seen module first."""
+        cache = KospelDiscoveryCache(store)
+        cache.async_record(_info("old", "10.0.0.2", [65]))
+        cache.async_record(_info("new", "10.0.0.3", [65]))
+        cache.get("old").last_seen -= 100
+
+        assert [module.serial_number for module in cache.modules()] == ["new", "old"]
+
+    def test_forget_removes_module(self, store) -> None:
+        """async_forget drops a module and schedules a save."""
+        cache = KospelDiscoveryCache(store)
+        cache.async_record(_info("mi01_1", "10.0.0.2", [65]))
+        cache.async_forget("mi01_1")
+        assert cache.get("mi01_1") is None
+        assert store.async_delay_save.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_discovery_cache_is_shared(self) -> None:
+        """async_get_discovery_cache loads once and reuses the instance."""
+        hass = MagicMock()
+        hass.data = {}
+        store = MagicMock()
+        store.async_load = AsyncMock(return_value=None)
+        with patch(
+            "custom_components.kospel.discovery.Store", return_value=store
+        ) as mock_store:
+            first = await async_get_discovery_cache(hass)
+            second = await async_get_discovery_cache(hass)
+        mock_store.assert_called_once()
+        assert first is second
+        assert hass.data[DATA_DISCOVERY_CACHE] is first
+
+
+class TestHostsNear:
+    """Tests for nearest-first candidate ordering."""
+
+    def test_orders_by_distance_and_excludes_old_host(self) -> None:
+        """Neighbours of the old address come first; the address itself is skipped."""
+        assert hosts_near("192.168.1.50", 4) == [
+            "192.168.1.49",
+            "192.168.1.51",
+            "192.168.1.48",
+            "192.168.1.52",
+        ]
+
+    def test_keeps_port_suffix(self) -> None:
+        """An explicit port from the entry is kept on every candidate."""
+        assert hosts_near("10.0.0.1:8080", 2) == ["10.0.0.2:8080", "10.0.0.3:8080"]
+
+    def test_hostname_yields_no_candidates(self) -> None:
+        """Hostnames cannot be swept."""
+        assert hosts_near("heater.local", 10) == []
+
+
+class TestAsyncRediscoverModule:
+    """Tests for serial-matched rediscovery after an IP change."""
+
+    @pytest.mark.asyncio
+    async def test_prefers_cached_host(self, store) -> None:
+        """A cached new address is probed and returned without a sweep."""
+        cache = KospelDiscoveryCache(store)
+        cache.async_record(_info("SN1", "192.168.1.77", [65]))
+        hass = MagicMock()
+        hass.data = {DATA_DISCOVERY_CACHE: cache}
+        probed: list[str] = []
+
+        async def _probe(session, host, timeout):
+            probed.append(host)
+            return _info("SN1", host, [65]) if host == "192.168.1.77" else None
+
+        with patch("custom_components.kospel.discovery.probe_device", _probe):
+            info = await async_rediscover_module(
+                hass, MagicMock(), "SN1", "192.168.1.50", probe_budget=1
+            )
+
+        assert info.host == "192.168.1.77"
+        assert probed == ["192.168.1.77"]
+
+    @pytest.mark.asyncio
+    async def test_ignores_other_serials_and_records_match(self, store) -> None:
+        """Only the configured serial matches; the new host is cached."""
+        cache = KospelDiscoveryCache(store)
+        hass = MagicMock()
+        hass.data = {DATA_DISCOVERY_CACHE: cache}
+
+        async def _probe(session, host, timeout):
+            if host == "192.168.1.49":
+                return _info("OTHER", host, [65])
+            if host == "192.168.1.52":
+                return _info("SN1", host, [65])
+            return None
+
+        with patch("custom_components.kospel.discovery.probe_device", _probe):
+            info = await async_rediscover_module(
+                hass, MagicMock(), "SN1", "192.168.1.50", probe_budget=8
+            )
+
+        assert info.host == "192.168.1.52"
+        assert cache.get("SN1").host == "192.168.1.52"
+
+    @pytest.mark.asyncio
+    async def test_returns_none_when_not_found(self, store) -> None:
+        """No match within the budget returns None."""
+        hass = MagicMock()
+        hass.data = {DATA_DISCOVERY_CACHE: KospelDiscoveryCache(store)}
+
+        with patch(
+            "custom_components.kospel.discovery.probe_device",
+            AsyncMock(return_value=None),
+        ):
+            info = await async_rediscover_module(
+                hass, MagicMock(), "SN1", "192.168.1.50", probe_budget=4
+            )
+
+        assert info is None
@@ -0,0 +1,105 @@
+"""Tests for the energy meter integrating polled power."""
+
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.energy import EnergyIntegrator  # noqa: E402
+
+
+def _store(data=None) -> MagicMock:
+    """Store stand-in returning ``data`` from async_load."""
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=data)
+    store.async_save = AsyncMock()
+    return store
+
+
+class TestEnergyIntegrator:
+    """Tests for trapezoidal integration, gaps and persistence."""
+
+    def test_trapezoidal_integration(self) -> None:
+        """Energy is the mean of neighbouring samples times the interval."""
+        meter = EnergyIntegrator(_store(), max_gap_seconds=7200.0)
+
+        meter.async_add_sample(0.0, 0.0)
+        meter.async_add_sample(8000.0, 15.0)
+        meter.async_add_sample(8000.0, 3615.0)
+
+        # 15 s ramp at 4 kW mean, then one hour at 8 kW.
+        assert meter.total_kwh == pytest.approx(8.0 + 4.0 * 15 / 3600)
+        assert meter.gap_count == 0
+
+    def test_long_gap_and_missing_reading_are_not_integrated(self) -> None:
+        """Intervals over the limit and missing power end the segment."""
+        meter = EnergyIntegrator(_store(), max_gap_seconds=60.0)
+
+        meter.async_add_sample(6000.0, 0.0)
+        meter.async_add_sample(6000.0, 600.0)
+        meter.async_add_sample(None, 615.0)
+        meter.async_add_sample(6000.0, 630.0)
+        meter.async_add_sample(6000.0, 660.0)
+
+        assert meter.total_kwh == pytest.approx(6.0 * 30 / 3600)
+        assert meter.gap_count == 2
+        assert meter.gap_seconds == 600.0
+
+    def test_samples_schedule_a_debounced_save(self) -> None:
+        """Each sample schedules a delayed save instead of writing."""
+        store = _store()
+        meter = EnergyIntegrator(store)
+
+        meter.async_add_sample(2000.0, 0.0)
+
+        store.async_delay_save.assert_called_once()
+        store.async_save.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_restored_meter_continues_from_last_sample(self) -> None:
+        """A quick restart integrates from the persisted last sample."""
+        store = _store()
+        meter = EnergyIntegrator(store)
+        meter.async_add_sample(4000.0, 0.0)
+        meter.async_add_sample(4000.0, 36.0)
+        await meter.async_flush()
+        saved = store.async_save.await_args.args[0]
+
+        restored = EnergyIntegrator(_store(saved))
+        await restored.async_load()
+        restored.async_add_sample(4000.0, 72.0)
+
+        assert restored.total_kwh == pytest.approx(0.08)
+
+    @pytest.mark.asyncio
+    async def test_malformed_store_starts_from_zero(self) -> None:
+        """Unreadable persisted data is discarded."""
+        meter = EnergyIntegrator(_store({"total_kwh": "x"}))
+
+        await meter.async_load()
+
+        assert meter.total_kwh == 0.0
@@ -0,0 +1,172 @@
+"""Tests for RTT statistics and the adaptive-timeout backend."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi import KospelConnectionError  # noqa: E402
+
+from custom_components.kospel.latency import (  # noqa: E402
+    LATENCY_TIMEOUT_MAX,
+    LatencyTracker,
+    TimedRegisterBackend,
+)
+
+
+def _store(data=None) -> MagicMock:
+    """Store stand-in returning ``data`` from async_load."""
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=data)
+    store.async_save = AsyncMock()
+    return store
+
+
+def _warm(tracker: LatencyTracker, rtt: float, count: int = 50) -> None:
+    """Feed ``count`` identical samples."""
+    for _ in range(count):
+        tracker.add_sample(rtt)
+
+
+class TestLatencyTracker:
+    """Tests for timeouts, backoff and persistence."""
+
+    def test_timeout_follows_observed_rtt(self) -> None:
+        """Library timeout until warmed up, then a few RTTs; timeouts double it."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        assert tracker.timeout == LATENCY_TIMEOUT_MAX
+
+        _warm(tracker, 0.04)
+        warmed = tracker.timeout
+        assert 0.05 <= warmed < 0.2
+
+        tracker.add_timeout()
+        assert tracker.timeout == pytest.approx(2 * warmed)
+        for _ in range(10):
+            tracker.add_timeout()
+        assert tracker.timeout == pytest.approx(16 * warmed)
+        tracker.add_sample(0.04)
+        assert tracker.timeout < 2 * warmed
+
+    def test_slow_module_gets_longer_timeout(self) -> None:
+        """Jittery RTT widens the timeout through variance and p99."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        for index in range(60):
+            tracker.add_sample(0.3 if index % 10 else 1.2)
+
+        assert tracker.timeout >= 1.5 * 1.2
+        assert tracker.percentile(0.5) == 0.3
+
+    def test_load_factor_rises_when_latency_degrades(self) -> None:
+        """A jump of the smoothed RTT above its baseline slows polling."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        _warm(tracker, 0.05, 200)
+        assert tracker.load_factor == 1.0
+
+        _warm(tracker, 0.2, 20)
+
+        assert 1.5 <= tracker.load_factor <= 4.0
+
+    @pytest.mark.asyncio
+    async def test_statistics_persist_per_host(self) -> None:
+        """Saved statistics restore for the same host only."""
+        source = LatencyTracker(_store(), "10.0.0.5")
+        _warm(source, 0.04)
+        saved = source._data_to_save()
+
+        same = LatencyTracker(_store(saved), "10.0.0.5")
+        await same.async_load()
+        moved = LatencyTracker(_store(saved), "10.0.0.9")
+        await moved.async_load()
+
+        assert same.timeout == pytest.approx(source.timeout)
+        assert moved.timeout == LATENCY_TIMEOUT_MAX
+
+
+class TestTimedRegisterBackend:
+    """Tests for timing and bounding reads."""
+
+    @pytest.mark.asyncio
+    async def test_reads_are_timed_and_bounded(self) -> None:
+        """Fast full reads feed the tracker; a hanging one fails quickly."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        _warm(tracker, 0.01)
+        inner = MagicMock()
+        inner.read_registers = AsyncMock(return_value={"0b00": "0000"})
+        backend = TimedRegisterBackend(inner, tracker)
+
+        assert await backend.read_registers("0b00", 256) == {"0b00": "0000"}
+        assert tracker.srtt is not None and tracker.srtt < 0.05
+
+        async def _hang(start_register: str, count: int) -> dict[str, str]:
+            await asyncio.sleep(10)
+            return {}
+
+        inner.read_registers = _hang
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(KospelConnectionError):
+            await backend.read_registers("0b00", 256)
+        assert loop.time() - started < 0.5
+        assert tracker.timeout > 0.05
+
+    @pytest.mark.asyncio
+    async def test_short_reads_do_not_tighten_the_full_read_timeout(self) -> None:
+        """A burst of fast span reads leaves room for a slow full read."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        _warm(tracker, 0.2)
+        timeout = tracker.timeout
+
+        async def _read(start_register: str, count: int) -> dict[str, str]:
+            await asyncio.sleep(0.001 if count < 256 else 0.25)
+            return {start_register: "0000"}
+
+        inner = MagicMock()
+        inner.read_registers = _read
+        inner.read_register = AsyncMock(return_value="0000")
+        backend = TimedRegisterBackend(inner, tracker)
+
+        for _ in range(50):
+            await backend.read_registers("0b46", 1)
+            await backend.read_register("0b55")
+        assert tracker.timeout == timeout
+
+        assert await backend.read_registers("0b00", 256) == {"0b00": "0000"}
+
+    @pytest.mark.asyncio
+    async def test_writes_pass_through(self) -> None:
+        """Writes are forwarded without affecting the statistics."""
+        tracker = LatencyTracker(_store(), "10.0.0.5")
+        inner = MagicMock()
+        inner.write_register = AsyncMock()
+        backend = TimedRegisterBackend(inner, tracker)
+
+        await backend.write_register("0b55", "0802")
+
+        inner.write_register.assert_awaited_once_with("0b55", "0802")
+        assert tracker.srtt is None
@@ -0,0 +1,103 @@
+"""Tests for the long-term statistics import."""
+
+import sys
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+_recorder_mock = MagicMock()
+sys.modules["homeassistant.components.recorder"] = _recorder_mock
+sys.modules["homeassistant.components.recorder.models"] = MagicMock()
+
+from custom_components.kospel.longterm import (  # noqa: E402
+    LongTermStatisticsWriter,
+    StatisticsAggregator,
+)
+
+HOUR = 1_700_002_800.0  # 2023-11-14 23:00:00 UTC, hour aligned
+
+
+class TestStatisticsAggregator:
+    """Tests for 5-minute buckets rolled up into hourly rows."""
+
+    def test_hour_is_emitted_once_the_next_hour_starts(self) -> None:
+        """Rows appear only after the hour is over, with bucket-weighted mean."""
+        aggregator = StatisticsAggregator()
+        # Bucket 1: three samples at 1000 W; bucket 2: one sample at 4000 W.
+        for offset, value in ((0, 1000.0), (5, 1000.0), (10, 1000.0), (300, 4000.0)):
+            assert aggregator.add({"power": value}, HOUR + offset) == {}
+
+        rows = aggregator.add({"power": 0.0}, HOUR + 3600.0)
+
+        assert rows == {
+            "power": [
+                {
+                    "start": datetime.fromtimestamp(HOUR, tz=UTC),
+                    "mean": 2500.0,
+                    "min": 1000.0,
+                    "max": 4000.0,
+                }
+            ]
+        }
+
+    def test_missing_values_and_skipped_hours(self) -> None:
+        """None samples are ignored; each hour with data gets its own row."""
+        aggregator = StatisticsAggregator()
+        aggregator.add({"pressure": 1.5, "power": None}, HOUR)
+        aggregator.add({"pressure": 1.6}, HOUR + 3600.0 + 60)
+
+        rows = aggregator.add({"pressure": 1.4}, HOUR + 3 * 3600.0)
+
+        assert [row["mean"] for row in rows["pressure"]] == [1.6]
+        assert "power" not in rows
+
+
+class TestLongTermStatisticsWriter:
+    """Tests for the recorder import."""
+
+    def test_finished_hour_is_imported_as_external_statistics(self) -> None:
+        """One import call per quantity with the heater's statistic id."""
+        entry = MagicMock()
+        entry.title = "Kospel Heater"
+        entry.entry_id = "01ABC"
+        entry.data = {"serial_number": "mi01_00006047", "device_id": 65}
+        add_external = _recorder_mock.statistics.async_add_external_statistics
+        add_external.reset_mock()
+        hass = MagicMock()
+        writer = LongTermStatisticsWriter(hass, entry)
+
+        writer.async_add_samples({"power": 2000.0, "pressure": 1.5}, HOUR)
+        writer.async_add_samples({"power": 0.0, "pressure": 1.5}, HOUR + 3600.0)
+
+        assert add_external.call_count == 2
+        imported = {
+            call.args[1]["statistic_id"]: call.args[2]
+            for call in add_external.call_args_list
+        }
+        power_id = "kospel:mi01_00006047_65_power"
+        assert imported[power_id][0]["mean"] == 2000.0
+        assert add_external.call_args_list[0].args[0] is hass
@@ -1,7 +1,7 @@
 """Tests for Kospel room preset number entities."""
 
 import sys
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -21,12 +21,16 @@ const_mock = MagicMock()
 const_mock.UnitOfTemperature = MagicMock()
 const_mock.UnitOfTemperature.CELSIUS = "°C"
 sys.modules["homeassistant.const"] = const_mock
-sys.modules["homeassistant.core"] = MagicMock()
+_ha_core_mock = MagicMock()
+# Real identity decorator so @callback methods (e.g. discovery cache) stay callable.
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
 sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 
 
 def _device_info(**kwargs):
@@ -88,6 +92,10 @@ from custom_components.kospel.number import (  # noqa: E402
     ROOM_PRESET_TEMP_MIN,
     ROOM_PRESET_TEMP_STEP,
 )
+from custom_components.kospel.transaction import (  # noqa: E402
+    RegisterTransaction,
+    TransactionResult,
+)
 
 
 @pytest.fixture
@@ -107,9 +115,28 @@ def mock_coordinator(mock_entry):
     coordinator.entry = mock_entry
     coordinator.last_update_success = True
     coordinator.communication_ok = True
+    coordinator.transaction = lambda: RegisterTransaction(_CONFIRMED, _CONFIRMED)
+    coordinator.async_commit = AsyncMock(side_effect=_commit_all)
+    coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
 
+# Economy preset currently 20.0 °C on the heater.
+_CONFIRMED = {"0b68": "c800"}
+
+
+async def _commit_all(transaction: RegisterTransaction) -> TransactionResult:
+    """Stand-in for a commit where every write was applied."""
+    registers = tuple(write.register for write in transaction.writes)
+    return TransactionResult(transaction.writes, registers, registers, True)
+
+
+def _planned(coordinator) -> list[tuple[str, str]]:
+    """Register writes of the committed transaction, in send order."""
+    transaction = coordinator.async_commit.call_args.args[0]
+    return [(write.register, write.value) for write in transaction.writes]
+
+
 class TestKospelRoomPresetNumberEntity:
     """Tests for native value, bounds, and async_set_native_value."""
 
@@ -170,16 +197,10 @@ class TestKospelRoomPresetNumberEntity:
         assert entity._attr_entity_category == "config"
 
     @pytest.mark.asyncio
-    async def test_async_set_native_value_calls_setter_and_refreshes(
+    async def test_async_set_native_value_writes_register_and_refreshes(
         self, mock_coordinator, mock_entry
     ) -> None:
-        """Setter on controller is awaited; coordinator refresh runs after delay."""
-        mock_controller = MagicMock()
-        mock_controller.room_temperature_economy = 20.0
-        mock_controller.set_room_temperature_economy = AsyncMock(return_value=True)
-        mock_coordinator.data = mock_controller
-        mock_coordinator.async_request_refresh = AsyncMock()
-
+        """The preset register is committed; coordinator refresh runs after delay."""
         entity = KospelRoomPresetNumberEntity(
             mock_coordinator,
             mock_entry,
@@ -187,51 +208,53 @@ class TestKospelRoomPresetNumberEntity:
             "set_room_temperature_economy",
         )
 
-        with patch(
-            "custom_components.kospel.number.asyncio.sleep", new_callable=AsyncMock
-        ):
-            await entity.async_set_native_value(21.5)
+        await entity.async_set_native_value(21.5)
 
-        mock_controller.set_room_temperature_economy.assert_awaited_once_with(21.5)
+        assert _planned(mock_coordinator) == [("0b68", "d700")]
         mock_coordinator.async_request_refresh.assert_awaited_once()
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
-        ("translation_key", "setter_name"),
+        ("translation_key", "setter_name", "register"),
         [
-            ("room_temperature_economy", "set_room_temperature_economy"),
-            ("room_temperature_comfort", "set_room_temperature_comfort"),
-            ("room_temperature_comfort_plus", "set_room_temperature_comfort_plus"),
-            ("room_temperature_comfort_minus", "set_room_temperature_comfort_minus"),
+            ("room_temperature_economy", "set_room_temperature_economy", "0b68"),
+            ("room_temperature_comfort", "set_room_temperature_comfort", "0b6a"),
+            ("room_temperature_comfort_plus", "set_room_temperature_comfort_plus", "0b6b"),
+            ("room_temperature_comfort_minus", "set_room_temperature_comfort_minus", "0b69"),
         ],
     )
-    async def test_each_preset_uses_matching_setter(
+    async def test_each_preset_writes_matching_register(
         self,
         mock_coordinator,
         mock_entry,
         translation_key: str,
         setter_name: str,
+        register: str,
     ) -> None:
-        """Each preset entity calls its corresponding EkcoM3 setter."""
-        mock_controller = MagicMock()
-        for _key, _setter in [
-            ("room_temperature_economy", "set_room_temperature_economy"),
-            ("room_temperature_comfort", "set_room_temperature_comfort"),
-            ("room_temperature_comfort_plus", "set_room_temperature_comfort_plus"),
-            ("room_temperature_comfort_minus", "set_room_temperature_comfort_minus"),
-        ]:
-            setattr(mock_controller, _setter, AsyncMock(return_value=True))
-        mock_coordinator.data = mock_controller
-        mock_coordinator.async_request_refresh = AsyncMock()
-
+        """Each preset entity writes the register of its EkcoM3 setter."""
         entity = KospelRoomPresetNumberEntity(
             mock_coordinator, mock_entry, translation_key, setter_name
         )
 
-        with patch(
-            "custom_components.kospel.number.asyncio.sleep", new_callable=AsyncMock
-        ):
-            await entity.async_set_native_value(22.0)
+        await entity.async_set_native_value(22.0)
+
+        assert _planned(mock_coordinator) == [(register, "dc00")]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_value_is_not_written(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Re-asserting the value the heater holds skips write and refresh."""
+        entity = KospelRoomPresetNumberEntity(
+            mock_coordinator,
+            mock_entry,
+            "room_temperature_economy",
+            "set_room_temperature_economy",
+        )
+        entity.async_write_ha_state = MagicMock()
+
+        await entity.async_set_native_value(20.0)
 
-        called = getattr(mock_controller, setter_name)
-        called.assert_awaited_once_with(22.0)
+        assert _planned(mock_coordinator) == []
+        entity.async_write_ha_state.assert_not_called()
+        mock_coordinator.async_request_refresh.assert_not_called()
@@ -0,0 +1,225 @@
+"""Tests for the traffic recorder and the replay backend."""
+
+import gzip
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi.exceptions import KospelConnectionError  # noqa: E402
+
+from custom_components.kospel.recording import (  # noqa: E402
+    RecordingRegisterBackend,
+    ReplayRegisterBackend,
+    load_capture,
+)
+
+
+class _ScriptedBackend:
+    """Backend returning scripted batch results (dicts or exceptions)."""
+
+    def __init__(self, batches: list) -> None:
+        self._batches = list(batches)
+        self.writes: list[tuple[str, str]] = []
+        self.closed = False
+
+    async def read_register(self, register: str) -> str:
+        return "0000"
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        result = self._batches.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return dict(result)
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        self.writes.append((register, hex_value))
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+BATCHES = [
+    {"0b4b": "d700", "0b4e": "9600", "0b55": "2000"},
+    {"0b4b": "d800", "0b4e": "9600", "0b55": "2000"},
+    KospelConnectionError("timeout"),
+    {"0b4b": "d800", "0b55": "2000"},
+]
+
+
+async def _record(path, batches=BATCHES, start: float = 1000.0) -> _ScriptedBackend:
+    """Record ``batches`` 15 s apart, with one write after the first batch."""
+    clock = _Clock(start)
+    inner = _ScriptedBackend(batches)
+    recorder = RecordingRegisterBackend(inner, path, flush_delay=60, clock=clock)
+    for index in range(len(batches)):
+        try:
+            await recorder.read_registers("0b00", 256)
+        except KospelConnectionError:
+            pass
+        if index == 0:
+            await recorder.write_register("0b8d", "dc00")
+        clock.now += 15
+    await recorder.aclose()
+    return inner
+
+
+class TestRecordingRegisterBackend:
+    """Tests for the delta-encoded capture log."""
+
+    @pytest.mark.asyncio
+    async def test_batches_are_delta_encoded(self, tmp_path) -> None:
+        """Only changed registers and removals are stored after the first batch."""
+        path = tmp_path / "capture.jsonl.gz"
+        inner = await _record(path)
+
+        batches = load_capture(path)
+
+        assert inner.writes == [("0b8d", "dc00")]
+        assert inner.closed
+        assert [batch.delta for batch in batches] == [
+            {"0b4b": "d700", "0b4e": "9600", "0b55": "2000"},
+            {"0b4b": "d800"},
+            {},
+            {},
+        ]
+        assert batches[2].error == "KospelConnectionError"
+        assert batches[3].missing == ["0b4e"]
+        assert [batch.time_ms for batch in batches] == [
+            1_000_000,
+            1_015_000,
+            1_030_000,
+            1_045_000,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sessions_append_to_existing_capture(self, tmp_path) -> None:
+        """A second recorder appends a new session to the same file."""
+        path = tmp_path / "capture.jsonl.gz"
+        await _record(path, BATCHES[:2])
+        await _record(path, [{"0b55": "0800"}], start=5000.0)
+
+        batches = load_capture(path)
+
+        assert [batch.session for batch in batches] == [0, 0, 1]
+        assert batches[2].delta == {"0b55": "0800"}
+
+
+class TestReplayRegisterBackend:
+    """Tests for replaying captures."""
+
+    @pytest.mark.asyncio
+    async def test_step_replay_reproduces_batches_and_errors(self, tmp_path) -> None:
+        """Speed 0 serves one recorded batch per read, re-raising failures."""
+        path = tmp_path / "capture.jsonl.gz"
+        await _record(path)
+        replay = ReplayRegisterBackend(path, speed=0)
+        await replay.async_open()
+
+        assert await replay.read_registers("0b00", 256) == BATCHES[0]
+        assert await replay.read_registers("0b00", 256) == BATCHES[1]
+        with pytest.raises(KospelConnectionError):
+            await replay.read_registers("0b00", 256)
+        assert await replay.read_registers("0b00", 256) == BATCHES[3]
+        # Without looping the last batch is held.
+        assert await replay.read_registers("0b00", 256) == BATCHES[3]
+
+    @pytest.mark.asyncio
+    async def test_timed_replay_follows_clock_and_loops(self, tmp_path) -> None:
+        """Replay position follows the clock times speed and wraps when looping."""
+        path = tmp_path / "capture.jsonl.gz"
+        await _record(path)
+        clock = _Clock(0.0)
+        replay = ReplayRegisterBackend(path, speed=3.0, loop=True, clock=clock)
+        await replay.async_open()
+
+        assert await replay.read_registers("0b00", 256) == BATCHES[0]
+        clock.now = 5.0
+        assert await replay.read_registers("0b00", 256) == BATCHES[1]
+        clock.now = 15.0
+        assert await replay.read_registers("0b00", 256) == BATCHES[3]
+        clock.now = 16.0
+        assert await replay.read_registers("0b00", 256) == BATCHES[0]
+        await replay.write_register("0b8d", "dc00")
+        assert replay.writes == [("0b8d", "dc00")]
+        assert await replay.read_register("0b4b") == "d700"
+
+    @pytest.mark.asyncio
+    async def test_span_reads_between_full_reads_replay_per_range(
+        self, tmp_path
+    ) -> None:
+        """Span reads keep their own delta baseline; each range replays intact."""
+        path = tmp_path / "capture.jsonl.gz"
+        full = {f"0b{index:02x}": "0000" for index in range(256)}
+        span = {f"0b{index:02x}": "0100" for index in range(0x32, 0x38)}
+        later = {**full, "0b4b": "d800"}
+        clock = _Clock()
+        recorder = RecordingRegisterBackend(
+            _ScriptedBackend([full, span, later]), path, flush_delay=60, clock=clock
+        )
+        await recorder.read_registers("0b00", 256)
+        clock.now += 5
+        await recorder.read_registers("0b32", 6)
+        clock.now += 5
+        await recorder.read_registers("0b00", 256)
+        await recorder.aclose()
+
+        batches = load_capture(path)
+        assert batches[1].missing == []
+        assert batches[2].delta == {"0b4b": "d800"}
+        assert batches[2].missing == []
+
+        replay = ReplayRegisterBackend(path, speed=0)
+        await replay.async_open()
+        assert await replay.read_registers("0b00", 256) == full
+        assert await replay.read_registers("0b32", 6) == span
+        assert await replay.read_registers("0b00", 256) == later
+        # A range never recorded is answered from the replayed registers.
+        assert await replay.read_registers("0b4a", 2) == {
+            "0b4a": "0000",
+            "0b4b": "d800",
+        }
+
+    @pytest.mark.asyncio
+    async def test_file_without_header_is_rejected(self, tmp_path) -> None:
+        """Files that are not capture logs raise ValueError."""
+        path = tmp_path / "bogus.jsonl.gz"
+        with gzip.open(path, "wt") as bogus:
+            bogus.write('{"op":"b","t":0,"d":{}}\n')
+
+        with pytest.raises(ValueError):
+            load_capture(path)
@@ -0,0 +1,122 @@
+"""Tests for rolling-window statistics."""
+
+import random
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.rolling import (  # noqa: E402
+    RollingStatistics,
+    RollingWindow,
+)
+
+
+def _store(data=None) -> MagicMock:
+    """Store stand-in returning ``data`` from async_load."""
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=data)
+    store.async_save = AsyncMock()
+    return store
+
+
+class TestRollingWindow:
+    """Tests for the bucketed window."""
+
+    def test_matches_brute_force_over_bucket_aligned_window(self) -> None:
+        """Min/max/mean equal a full scan of the samples in the live buckets."""
+        rng = random.Random(7)
+        window = RollingWindow(600.0, buckets=60)
+        samples: list[tuple[float, float]] = []
+        timestamp = 0.0
+        for _ in range(500):
+            timestamp += rng.choice((3.0, 10.0, 15.0, 120.0))
+            value = rng.uniform(-5.0, 30.0)
+            samples.append((timestamp, value))
+            window.add(value, timestamp)
+
+            oldest_bucket = int(timestamp // 10.0) - 59
+            live = [v for t, v in samples if int(t // 10.0) >= oldest_bucket]
+            assert window.minimum == min(live)
+            assert window.maximum == max(live)
+            assert window.mean == pytest.approx(sum(live) / len(live))
+
+    def test_window_empties_after_long_silence(self) -> None:
+        """Samples older than the window no longer count."""
+        window = RollingWindow(900.0)
+        window.add(50.0, 0.0)
+        window.add(20.0, 3600.0)
+
+        assert (window.minimum, window.maximum, window.mean) == (20.0, 20.0, 20.0)
+
+    def test_serialized_buckets_rebuild_the_same_statistics(self) -> None:
+        """Loading serialized buckets restores min, max and mean."""
+        window = RollingWindow(3600.0)
+        for step, value in enumerate((1.5, 1.7, 1.2, 1.9, 1.4)):
+            window.add(value, step * 15.0)
+
+        restored = RollingWindow(3600.0)
+        restored.load_list(window.to_list())
+
+        assert restored.minimum == 1.2
+        assert restored.maximum == 1.9
+        assert restored.mean == pytest.approx(window.mean)
+
+
+class TestRollingStatistics:
+    """Tests for the per-entry collection of windows."""
+
+    @pytest.mark.asyncio
+    async def test_samples_feed_all_windows_and_persist(self) -> None:
+        """Each quantity feeds every window; None samples are skipped."""
+        store = _store()
+        stats = RollingStatistics(store, ("pressure", "power"))
+        stats.async_add_samples({"pressure": 1.5, "power": None}, 100.0)
+        stats.async_add_samples({"pressure": 1.7, "power": 4000.0}, 115.0)
+        store.async_delay_save.assert_called()
+        await stats.async_flush()
+
+        restored = RollingStatistics(
+            _store(store.async_save.await_args.args[0]), ("pressure", "power")
+        )
+        await restored.async_load()
+
+        for key in ("15m", "1h", "24h"):
+            assert restored.window("pressure", key).mean == pytest.approx(1.6)
+            assert restored.window("power", key).maximum == 4000.0
+
+    @pytest.mark.asyncio
+    async def test_malformed_window_is_dropped(self) -> None:
+        """A malformed persisted window starts empty."""
+        stats = RollingStatistics(
+            _store({"windows": {"pressure": {"1h": [["x", 1, 1, 1, 1]]}}}),
+            ("pressure",),
+        )
+
+        await stats.async_load()
+
+        assert stats.window("pressure", "1h").mean is None
@@ -0,0 +1,97 @@
+"""Tests for runtime counters and duty cycles."""
+
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.runtime import RuntimeCounters  # noqa: E402
+
+
+def _store(data=None) -> MagicMock:
+    """Store stand-in returning ``data`` from async_load."""
+    store = MagicMock()
+    store.async_load = AsyncMock(return_value=data)
+    store.async_save = AsyncMock()
+    return store
+
+
+class TestRuntimeCounters:
+    """Tests for crediting intervals, duty cycles and persistence."""
+
+    def test_intervals_are_credited_to_previous_states(self) -> None:
+        """Time between refreshes goes to the states seen at the earlier one."""
+        counters = RuntimeCounters(_store())
+
+        counters.async_update({"ch": "running", "mode": "winter"}, 0.0)
+        counters.async_update({"ch": "idle", "mode": "winter"}, 60.0)
+        counters.async_update({"ch": "running", "mode": None}, 90.0)
+        counters.async_update({"ch": "running", "mode": "winter"}, 120.0)
+
+        assert counters.runtime_seconds("ch", "running") == 90.0
+        assert counters.runtime_seconds("ch", "idle") == 30.0
+        # Unknown mode between 90 and 120 s is not credited.
+        assert counters.runtime_seconds("mode", "winter") == 90.0
+
+    def test_long_gap_is_not_credited(self) -> None:
+        """Intervals over the limit do not count as runtime."""
+        counters = RuntimeCounters(_store(), max_gap_seconds=60.0)
+
+        counters.async_update({"ch": "running"}, 0.0)
+        counters.async_update({"ch": "running"}, 3600.0)
+        counters.async_update({"ch": "running"}, 3615.0)
+
+        assert counters.runtime_seconds("ch", "running") == 15.0
+
+    def test_duty_cycle_tracks_recent_share(self) -> None:
+        """The duty cycle converges to the running share of time."""
+        counters = RuntimeCounters(_store(), duty_time_constant=3600.0)
+        timestamp = 0.0
+        for step in range(2000):
+            state = "running" if step % 4 == 0 else "idle"
+            counters.async_update({"ch": state}, timestamp)
+            timestamp += 15.0
+
+        assert counters.duty_cycle("ch", "running") == pytest.approx(0.25, abs=0.02)
+        total = counters.duty_cycle("ch", "running") + counters.duty_cycle("ch", "idle")
+        assert total == pytest.approx(1.0, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_counters_survive_a_restart(self) -> None:
+        """Persisted counters continue from the stored state and timestamp."""
+        store = _store()
+        counters = RuntimeCounters(store)
+        counters.async_update({"dhw": "running"}, 0.0)
+        counters.async_update({"dhw": "running"}, 30.0)
+        store.async_delay_save.assert_called()
+        await counters.async_flush()
+
+        restored = RuntimeCounters(_store(store.async_save.await_args.args[0]))
+        await restored.async_load()
+        restored.async_update({"dhw": "idle"}, 45.0)
+
+        assert restored.runtime_seconds("dhw", "running") == 45.0
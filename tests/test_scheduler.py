@@ -0,0 +1,187 @@
+"""Tests for the per-host request scheduler."""
+
+import asyncio
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from custom_components.kospel.scheduler import (  # noqa: E402
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    RequestScheduler,
+    ScheduledRegisterBackend,
+    request_scheduler,
+)
+
+
+class _SlowBackend:
+    """Backend logging call order and concurrency; each call takes a tick."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, *record) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append(record)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        await self._call("read", start_register, count)
+        return {start_register: "0000"}
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        await self._call("write", register, hex_value)
+
+
+class TestRequestScheduler:
+    """Tests for ordering, priority and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_one_request_in_flight_and_writes_first(self) -> None:
+        """Queued writes overtake queued polls; the module never sees two at once."""
+        inner = _SlowBackend()
+        backend = ScheduledRegisterBackend(inner, RequestScheduler("10.0.0.5"))
+
+        poll = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.ensure_future(backend.read_registers("0b46", 1)),
+            asyncio.ensure_future(backend.write_register("0b55", "0802")),
+            asyncio.ensure_future(backend.write_register("0b32", "4000")),
+        ]
+        await asyncio.gather(poll, *queued)
+
+        assert inner.max_in_flight == 1
+        assert inner.calls == [
+            ("read", "0b00", 256),
+            ("write", "0b55", "0802"),
+            ("write", "0b32", "4000"),
+            ("read", "0b46", 1),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_identical_queued_polls_are_coalesced(self) -> None:
+        """A refresh queued behind an identical waiting poll shares its request."""
+        inner = _SlowBackend()
+        scheduler = RequestScheduler("10.0.0.5")
+        backend = ScheduledRegisterBackend(inner, scheduler)
+
+        write = asyncio.ensure_future(backend.write_register("0b8d", "d700"))
+        await asyncio.sleep(0)
+        first = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        second = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        await write
+        results = await asyncio.gather(first, second)
+
+        assert inner.calls.count(("read", "0b00", 256)) == 1
+        assert scheduler.coalesced == 1
+        assert results[0] == results[1]
+        assert results[0] is not results[1]
+
+    @pytest.mark.asyncio
+    async def test_coalescing_is_keyed_by_target(self) -> None:
+        """Reads of one target join across wrappers; other devices do not."""
+        inner = _SlowBackend()
+        scheduler = RequestScheduler("10.0.0.5")
+        url = "http://10.0.0.5/api/dev/65"
+        first = ScheduledRegisterBackend(inner, scheduler, target=url)
+        same = ScheduledRegisterBackend(inner, scheduler, target=url)
+        other = ScheduledRegisterBackend(
+            inner, scheduler, target="http://10.0.0.5/api/dev/66"
+        )
+
+        write = asyncio.ensure_future(first.write_register("0b8d", "d700"))
+        await asyncio.sleep(0)
+        reads = [
+            asyncio.ensure_future(backend.read_registers("0b00", 256))
+            for backend in (first, same, other)
+        ]
+        await asyncio.gather(write, *reads)
+
+        assert inner.calls.count(("read", "0b00", 256)) == 2
+        assert scheduler.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_queued_request_is_skipped(self) -> None:
+        """A request nobody waits for any more is never sent."""
+        inner = _SlowBackend()
+        scheduler = RequestScheduler("10.0.0.5")
+        backend = ScheduledRegisterBackend(inner, scheduler)
+
+        busy = asyncio.ensure_future(backend.write_register("0b55", "0802"))
+        await asyncio.sleep(0)
+        dropped = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        await asyncio.sleep(0)
+        dropped.cancel()
+        await busy
+        await asyncio.sleep(0.02)
+
+        assert inner.calls == [("write", "0b55", "0802")]
+        assert scheduler.queue_length == 0
+
+    @pytest.mark.asyncio
+    async def test_resubmit_after_cancel_is_not_cancelled(self) -> None:
+        """A new identical request does not join one whose caller gave up."""
+        inner = _SlowBackend()
+        scheduler = RequestScheduler("10.0.0.5")
+        backend = ScheduledRegisterBackend(inner, scheduler)
+
+        busy = asyncio.ensure_future(backend.write_register("0b55", "0802"))
+        await asyncio.sleep(0)
+        dropped = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        await asyncio.sleep(0)
+        dropped.cancel()
+        await asyncio.sleep(0)
+        resubmitted = asyncio.ensure_future(backend.read_registers("0b00", 256))
+        await busy
+
+        assert await resubmitted == {"0b00": "0000"}
+        assert scheduler.coalesced == 0
+        assert inner.calls == [("write", "0b55", "0802"), ("read", "0b00", 256)]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_the_caller(self) -> None:
+        """A failing request raises for its waiter and the queue keeps going."""
+        scheduler = RequestScheduler("10.0.0.5")
+        failing = AsyncMock(side_effect=OSError("reset"))
+
+        with pytest.raises(OSError):
+            await scheduler.submit(PRIORITY_WRITE, failing)
+        assert await scheduler.submit(PRIORITY_READ, AsyncMock(return_value=1)) == 1
+
+    def test_schedulers_are_shared_per_host(self) -> None:
+        """Backends of the same module host share one scheduler."""
+        scheduler = request_scheduler("10.0.0.5")
+
+        assert request_scheduler("10.0.0.5") is scheduler
+        assert request_scheduler("10.0.0.6") is not scheduler
+        assert ScheduledRegisterBackend(MagicMock(), scheduler).scheduler is scheduler
@@ -1,7 +1,7 @@
 """Tests for Kospel boiler max power select entity."""
 
 import sys
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -19,7 +19,10 @@ _ha = _HAModule()
 sys.modules["homeassistant"] = _ha
 sys.modules["homeassistant.config_entries"] = MagicMock()
 sys.modules["homeassistant.components"] = MagicMock()
-sys.modules["homeassistant.core"] = MagicMock()
+_ha_core_mock = MagicMock()
+# Real identity decorator so @callback methods (e.g. discovery cache) stay callable.
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
 sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
@@ -29,6 +32,7 @@ entity_mod.EntityCategory.CONFIG = "config"
 entity_mod.DeviceInfo = lambda **kwargs: kwargs
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 
 
 class _CoordinatorEntityBase:
@@ -65,6 +69,10 @@ sys.modules["homeassistant.helpers.update_coordinator"].CoordinatorEntity = (
 from custom_components.kospel.select import (  # noqa: E402
     KospelBoilerMaxPowerSelectEntity,
 )
+from custom_components.kospel.transaction import (  # noqa: E402
+    RegisterTransaction,
+    TransactionResult,
+)
 
 
 @pytest.fixture
@@ -84,9 +92,21 @@ def mock_coordinator(mock_entry):
     coordinator.entry = mock_entry
     coordinator.last_update_success = True
     coordinator.communication_ok = True
+    # Heater currently limited to 4 kW (index 1).
+    coordinator.transaction = lambda: RegisterTransaction(
+        {"0b62": "0100"}, {"0b62": "0100"}
+    )
+    coordinator.async_commit = AsyncMock(side_effect=_commit_all)
+    coordinator.async_request_refresh = AsyncMock()
     return coordinator
 
 
+async def _commit_all(transaction: RegisterTransaction) -> TransactionResult:
+    """Stand-in for a commit where every write was applied."""
+    registers = tuple(write.register for write in transaction.writes)
+    return TransactionResult(transaction.writes, registers, registers, True)
+
+
 class TestKospelBoilerMaxPowerSelectEntity:
     """Tests for options, current_option, and async_select_option."""
 
@@ -118,27 +138,32 @@ class TestKospelBoilerMaxPowerSelectEntity:
         assert entity.current_option is None
 
     @pytest.mark.asyncio
-    async def test_async_select_option_calls_setter_and_refreshes(
+    async def test_async_select_option_writes_register_and_refreshes(
         self, mock_coordinator, mock_entry
     ) -> None:
-        """set_boiler_max_power_index is awaited; coordinator refresh runs."""
-        mock_controller = MagicMock()
-        mock_controller.set_boiler_max_power_index = AsyncMock(return_value=True)
-        mock_coordinator.data = mock_controller
-        mock_coordinator.async_request_refresh = AsyncMock()
-
+        """The power step register is committed; coordinator refresh runs."""
         entity = KospelBoilerMaxPowerSelectEntity(mock_coordinator, mock_entry)
 
-        with patch(
-            "custom_components.kospel.select.asyncio.sleep", new_callable=AsyncMock
-        ):
-            await entity.async_select_option("4")
+        await entity.async_select_option("6")
 
-        mock_controller.set_boiler_max_power_index.assert_awaited_once()
-        call_arg = mock_controller.set_boiler_max_power_index.await_args[0][0]
-        assert call_arg == BoilerMaxPowerIndex.KW_4
+        transaction = mock_coordinator.async_commit.call_args.args[0]
+        assert [(w.register, w.value) for w in transaction.writes] == [("0b62", "0200")]
         mock_coordinator.async_request_refresh.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_current_option_is_not_written(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Selecting the step the heater uses skips write and refresh."""
+        entity = KospelBoilerMaxPowerSelectEntity(mock_coordinator, mock_entry)
+
+        await entity.async_select_option("4")
+
+        transaction = mock_coordinator.async_commit.call_args.args[0]
+        assert transaction.writes == ()
+        assert transaction.elided == ("0b62",)
+        mock_coordinator.async_request_refresh.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_async_select_option_invalid_raises(
         self, mock_coordinator, mock_entry
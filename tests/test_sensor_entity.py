@@ -24,12 +24,16 @@ const_mock.UnitOfPressure = MagicMock()
 const_mock.UnitOfPower = MagicMock()
 const_mock.UnitOfPower.WATT = "W"
 sys.modules["homeassistant.const"] = const_mock
-sys.modules["homeassistant.core"] = MagicMock()
+_ha_core_mock = MagicMock()
+# Real identity decorator so @callback methods (e.g. discovery cache) stay callable.
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
 sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 
 
 def _device_info(**kwargs):
@@ -74,7 +78,12 @@ sys.modules["homeassistant.helpers.update_coordinator"].CoordinatorEntity = (
 )
 
 from custom_components.kospel.sensor import (  # noqa: E402
+    KospelDutyCycleSensor,
+    KospelEnergySensor,
     KospelMaxPowerLimitSensor,
+    KospelPowerSensor,
+    KospelRollingStatisticSensor,
+    KospelRuntimeSensor,
     KospelTemperatureSensor,
 )
 
@@ -209,3 +218,126 @@ class TestKospelMaxPowerLimitSensorNativeValue:
 
         entity = KospelMaxPowerLimitSensor(mock_coordinator, mock_entry)
         assert entity.native_value is None
+
+
+class TestKospelEnergySensor:
+    """Tests for the integrated energy sensor."""
+
+    def test_native_value_and_gap_attributes_from_meter(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Value and attributes come from the coordinator's energy meter."""
+        mock_coordinator.energy.total_kwh = 12.345678
+        mock_coordinator.energy.gap_count = 2
+        mock_coordinator.energy.gap_seconds = 900.4
+
+        entity = KospelEnergySensor(mock_coordinator, mock_entry)
+
+        assert entity.native_value == 12.3457
+        assert entity.extra_state_attributes == {
+            "gap_count": 2,
+            "gap_seconds": 900,
+        }
+        # Bookkeeping attributes stay out of the recorder.
+        assert {"gap_count", "gap_seconds", "data_age"} <= (
+            KospelEnergySensor._unrecorded_attributes
+        )
+
+
+class TestKospelRollingStatisticSensor:
+    """Tests for rolling-window statistic sensors."""
+
+    def test_reads_statistic_of_its_window(self, mock_coordinator, mock_entry) -> None:
+        """native_value asks the coordinator's window for its statistic."""
+        window = MagicMock()
+        window.statistic.return_value = 21.04999
+        mock_coordinator.rolling.window.return_value = window
+
+        entity = KospelRollingStatisticSensor(
+            mock_coordinator, mock_entry, "room_temperature", "1h", "mean"
+        )
+
+        assert entity.native_value == 21.05
+        mock_coordinator.rolling.window.assert_called_with("room_temperature", "1h")
+        window.statistic.assert_called_with("mean")
+        assert entity._attr_translation_placeholders == {"window": "1 h"}
+
+
+class TestKospelRuntimeSensors:
+    """Tests for runtime and duty cycle sensors."""
+
+    def test_runtime_in_hours_and_duty_in_percent(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Counters are read for the sensor's dimension and state."""
+        mock_coordinator.runtime.runtime_seconds.return_value = 5400.0
+        mock_coordinator.runtime.duty_cycle.return_value = 0.375
+
+        runtime = KospelRuntimeSensor(
+            mock_coordinator, mock_entry, "ch", "running", "ch", True
+        )
+        duty = KospelDutyCycleSensor(
+            mock_coordinator, mock_entry, "mode", "winter", "mode_winter", False
+        )
+
+        assert runtime.native_value == 1.5
+        mock_coordinator.runtime.runtime_seconds.assert_called_with("ch", "running")
+        assert duty.native_value == 37.5
+        assert duty._attr_unique_id.endswith("_mode_winter_duty_cycle")
+        assert duty._attr_entity_registry_enabled_default is False
+
+
+class TestTelemetryStateWriteThrottle:
+    """Tests for the optional state write throttle of telemetry sensors."""
+
+    def test_writes_are_skipped_within_interval(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Only the first update within the interval writes state."""
+        mock_coordinator.state_write_interval = 60.0
+        entity = KospelPowerSensor(mock_coordinator, mock_entry)
+        entity.async_write_ha_state = MagicMock()
+
+        entity._handle_coordinator_update()
+        entity._handle_coordinator_update()
+
+        assert entity.async_write_ha_state.call_count == 1
+
+    def test_zero_interval_writes_every_update(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """With the throttle disabled every refresh writes state."""
+        mock_coordinator.state_write_interval = 0.0
+        entity = KospelPowerSensor(mock_coordinator, mock_entry)
+        entity.async_write_ha_state = MagicMock()
+
+        entity._handle_coordinator_update()
+        entity._handle_coordinator_update()
+
+        assert entity.async_write_ha_state.call_count == 2
+
+
+class TestPerEntityFreshness:
+    """Tests for availability and data_age from the entity's own registers."""
+
+    def test_power_sensor_follows_power_register(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """The power sensor asks for register 0b46 only and reports its age."""
+        mock_coordinator.registers_available.return_value = False
+        mock_coordinator.data_age.return_value = 12.4
+        entity = KospelPowerSensor(mock_coordinator, mock_entry)
+
+        assert entity.available is False
+        mock_coordinator.registers_available.assert_called_with(("0b46",))
+        assert entity.extra_state_attributes == {"data_age": 12}
+
+    def test_derived_sensor_has_no_registers(
+        self, mock_coordinator, mock_entry
+    ) -> None:
+        """Energy is derived, so it falls back to coordinator communication."""
+        entity = KospelEnergySensor(mock_coordinator, mock_entry)
+
+        entity.available
+
+        mock_coordinator.registers_available.assert_called_with(())
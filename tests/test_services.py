@@ -0,0 +1,225 @@
+"""Tests for service targets and the bulk_set fan-out."""
+
+import asyncio
+import sys
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi import KospelConnectionError  # noqa: E402
+
+from custom_components.kospel.const import CONF_HEATER_IP  # noqa: E402
+from custom_components.kospel import services  # noqa: E402
+from custom_components.kospel.services import (  # noqa: E402
+    async_bulk_set,
+    async_target_heaters,
+)
+from custom_components.kospel.transaction import (  # noqa: E402
+    RegisterTransaction,
+    TransactionResult,
+)
+
+_REGISTERS = {"0b55": "2000", "0b62": "0100", "0b68": "c800"}
+
+
+class _Concurrency:
+    """Counts heaters committing at once, overall and per host."""
+
+    def __init__(self) -> None:
+        self.active: dict[str, int] = {}
+        self.max_total = 0
+        self.max_per_host = 0
+
+    def enter(self, host: str) -> None:
+        self.active[host] = self.active.get(host, 0) + 1
+        self.max_total = max(self.max_total, sum(self.active.values()))
+        self.max_per_host = max(self.max_per_host, self.active[host])
+
+    def leave(self, host: str) -> None:
+        self.active[host] -= 1
+
+
+def _coordinator(host: str, concurrency: _Concurrency, fail: str | None = None):
+    """Coordinator stand-in committing transactions after a short delay."""
+    coordinator = MagicMock()
+    coordinator.entry.data = {CONF_HEATER_IP: host}
+    coordinator.entry.entry_id = f"entry-{host}-{id(coordinator)}"
+    coordinator.transaction = lambda: RegisterTransaction(_REGISTERS, _REGISTERS)
+
+    async def _commit(transaction: RegisterTransaction) -> TransactionResult:
+        concurrency.enter(host)
+        await asyncio.sleep(0.01)
+        concurrency.leave(host)
+        registers = tuple(write.register for write in transaction.writes)
+        if fail in registers:
+            applied = registers[: registers.index(fail)]
+            return TransactionResult(
+                transaction.writes,
+                applied,
+                applied,
+                True,
+                error=KospelConnectionError("reset"),
+                elided=transaction.elided,
+            )
+        return TransactionResult(
+            transaction.writes, registers, registers, True, elided=transaction.elided
+        )
+
+    coordinator.async_commit = AsyncMock(side_effect=_commit)
+    return coordinator
+
+
+class TestBulkSet:
+    """Tests for bounded fan-out and per-heater results."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_bounded_overall_and_per_host(self) -> None:
+        """Heaters run in parallel up to the limits; one at a time per module."""
+        concurrency = _Concurrency()
+        targets = {
+            f"device-{index}": _coordinator(f"10.0.0.{index % 3}", concurrency)
+            for index in range(9)
+        }
+
+        results = await async_bulk_set(
+            targets, {"max_power": 6}, max_parallel=2, host_parallel=1
+        )
+
+        assert concurrency.max_total == 2
+        assert concurrency.max_per_host == 1
+        assert all(result["status"] == "applied" for result in results.values())
+        for coordinator in targets.values():
+            coordinator.async_update_listeners.assert_called_once()
+            coordinator.entry.async_create_background_task.assert_called_once()
+            coordinator.entry.async_create_background_task.call_args.args[1].close()
+
+    @pytest.mark.asyncio
+    async def test_results_per_heater(self) -> None:
+        """Unchanged and failed heaters are reported separately."""
+        concurrency = _Concurrency()
+        unchanged = _coordinator("10.0.0.1", concurrency)
+        failing = _coordinator("10.0.0.2", concurrency, fail="0b68")
+        unplannable = _coordinator("10.0.0.3", concurrency)
+        unplannable.transaction = lambda: RegisterTransaction({})
+        settings = {"heater_mode": "winter", "room_temperature_economy": 21.5}
+        unchanged.transaction = lambda: RegisterTransaction(
+            {**_REGISTERS, "0b68": "d700"}, {**_REGISTERS, "0b68": "d700"}
+        )
+
+        results = await async_bulk_set(
+            {"a": unchanged, "b": failing, "c": unplannable, "d": failing}, settings
+        )
+
+        assert results["a"]["status"] == "unchanged"
+        assert results["a"]["unchanged"] == ["0b55", "0b68"]
+        unchanged.entry.async_create_background_task.assert_not_called()
+        assert results["b"]["status"] == "failed"
+        assert results["b"]["not_applied"] == ["0b68"]
+        assert results["b"]["error"] == "reset"
+        assert results["d"] is results["b"]
+        failing.async_commit.assert_awaited_once()
+        assert results["c"]["status"] == "failed"
+        unplannable.async_commit.assert_not_called()
+
+
+class _ValidationError(Exception):
+    """Stand-in for ServiceValidationError."""
+
+
+class TestTargetHeaters:
+    """Tests for resolving service targets to heaters."""
+
+    def test_areas_and_entities_select_kospel_heaters(self) -> None:
+        """Named devices must be heaters; other targets pick heaters out."""
+        heaters = {"dev-a": MagicMock(), "dev-b": MagicMock(), "dev-c": MagicMock()}
+
+        def _coordinators(hass, device_ids):
+            if device_ids[0] not in heaters:
+                raise _ValidationError(device_ids[0])
+            return [heaters[device_ids[0]]]
+
+        selected = SimpleNamespace(
+            referenced={"climate.kospel"},
+            indirectly_referenced={"light.hall"},
+            referenced_devices={"dev-a", "dev-c", "dev-lamp"},
+        )
+        entities = {
+            "climate.kospel": SimpleNamespace(device_id="dev-b"),
+            "light.hall": SimpleNamespace(device_id="dev-lamp"),
+        }
+        call = SimpleNamespace(data={services.ATTR_DEVICE_ID: ["dev-a"]})
+
+        with (
+            patch.object(services, "ServiceValidationError", _ValidationError),
+            patch.object(services, "async_coordinators_for_devices", _coordinators),
+            patch.object(services, "service_helper") as service_helper,
+            patch.object(services, "er") as er,
+        ):
+            service_helper.async_extract_referenced_entity_ids.return_value = selected
+            er.async_get.return_value.async_get = entities.get
+            targets = async_target_heaters(MagicMock(), call)
+
+            assert targets == heaters
+            assert list(targets)[0] == "dev-a"
+
+            call.data = {services.ATTR_DEVICE_ID: ["dev-lamp"]}
+            with pytest.raises(_ValidationError):
+                async_target_heaters(MagicMock(), call)
+
+            call.data = {}
+            selected.referenced_devices = {"dev-lamp"}
+            selected.referenced = set()
+            with pytest.raises(_ValidationError):
+                async_target_heaters(MagicMock(), call)
+
+    @pytest.mark.asyncio
+    async def test_start_burst_uses_service_targets(self) -> None:
+        """Burst polling starts on every heater the target resolves to."""
+        hass = MagicMock()
+        services.async_setup_services(hass)
+        start_burst = hass.services.async_register.call_args_list[0].args[2]
+        heaters = {"dev-a": MagicMock(), "dev-b": MagicMock()}
+        call = SimpleNamespace(
+            data={
+                services.ATTR_REGISTERS: ["0b46"],
+                services.ATTR_INTERVAL: 2.0,
+                services.ATTR_DURATION: 10,
+            }
+        )
+
+        with patch.object(
+            services, "async_target_heaters", return_value=heaters
+        ) as target_heaters:
+            await start_burst(call)
+
+        target_heaters.assert_called_once_with(hass, call)
+        for coordinator in heaters.values():
+            coordinator.async_start_burst.assert_called_once_with(
+                ["0b46"], 2.0, timedelta(minutes=10)
+            )
@@ -0,0 +1,165 @@
+"""Tests for the accelerated-time thermal simulation backend."""
+
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi.controller.device import EkcoM3  # noqa: E402
+from kospel_cmi.registers.enums import (  # noqa: E402
+    BoilerMaxPowerIndex,
+    HeaterMode,
+    ValvePosition,
+)
+
+from custom_components.kospel.simulation import (  # noqa: E402
+    SIMULATION_MAX_STEPS,
+    SimulatedHeaterBackend,
+)
+
+
+class _MemoryStore:
+    """In-memory register store."""
+
+    def __init__(self) -> None:
+        self.registers: dict[str, str] = {}
+
+    async def read_register(self, register: str) -> str:
+        return self.registers.get(register, "0000")
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        start = int(start_register[2:], 16)
+        return {
+            f"0b{index:02x}": self.registers.get(f"0b{index:02x}", "0000")
+            for index in range(start, start + count)
+        }
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        self.registers[register] = hex_value
+
+
+class _Clock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _controller(multiplier: float = 1.0):
+    clock = _Clock()
+    backend = SimulatedHeaterBackend(_MemoryStore(), multiplier, clock=clock)
+    controller = EkcoM3(backend=backend, strict_refresh=True)
+    await controller.refresh()
+    return controller, backend, clock
+
+
+class TestSimulatedHeaterBackend:
+    """Tests for seeding, thermal response, DHW priority and time scaling."""
+
+    @pytest.mark.asyncio
+    async def test_blank_store_is_seeded_with_complete_state(self) -> None:
+        """First refresh seeds winter mode and passes strict refresh."""
+        controller, _, _ = await _controller()
+
+        assert controller.heater_mode == HeaterMode.WINTER
+        assert controller.room_temperature == 19.0
+        assert controller.room_setpoint == 21.0
+        assert controller.supply_setpoint == 50.0
+        assert controller.boiler_max_power_kw == 8.0
+
+    @pytest.mark.asyncio
+    async def test_dhw_has_priority_then_room_heats_to_target(self) -> None:
+        """Cold tank is heated first (valve DHW), then the room reaches its target."""
+        controller, _, clock = await _controller()
+
+        clock.now = 60.0
+        await controller.refresh()
+        assert controller.valve_position == ValvePosition.DHW
+        assert controller.power == 8.0
+
+        clock.now = 12 * 3600.0
+        await controller.refresh()
+        assert controller.room_temperature >= 20.7
+        assert controller.water_current_temperature >= 47.0
+
+    @pytest.mark.asyncio
+    async def test_off_mode_stops_heating_and_room_cools(self) -> None:
+        """With the heater off there is no power and the room drifts down."""
+        controller, _, clock = await _controller()
+        await controller.set_heater_mode(HeaterMode.OFF)
+
+        clock.now = 24 * 3600.0
+        await controller.refresh()
+
+        assert controller.power == 0.0
+        assert controller.room_setpoint == 0.0
+        assert controller.room_temperature < 19.0
+
+    @pytest.mark.asyncio
+    async def test_time_multiplier_scales_simulated_time(self) -> None:
+        """One wall-clock minute at x1000 simulates 1000 minutes."""
+        controller, backend, clock = await _controller(multiplier=1000.0)
+
+        clock.now = 60.0
+        await controller.refresh()
+
+        assert backend.simulated_seconds == pytest.approx(60_000.0)
+
+    @pytest.mark.asyncio
+    async def test_long_advance_takes_bounded_steps(self) -> None:
+        """A poll at the top multiplier grows the steps and still holds targets."""
+        controller, backend, clock = await _controller(multiplier=10000.0)
+        steps = 0
+        step = backend._step
+
+        def _count(registers: dict[str, str], dt: float) -> float:
+            nonlocal steps
+            steps += 1
+            return step(registers, dt)
+
+        backend._step = _count
+        clock.now = 60.0
+        await controller.refresh()
+
+        assert backend.simulated_seconds == pytest.approx(600_000.0)
+        # Growing steps plus one extra per switch-off of a heated circuit.
+        assert steps < 2 * SIMULATION_MAX_STEPS
+        assert 20.5 <= controller.room_temperature <= 21.5
+        assert 46.0 <= controller.water_current_temperature <= 50.5
+
+    @pytest.mark.asyncio
+    async def test_power_step_updates_limit(self) -> None:
+        """Writing the 0b62 power step updates 0b34 like the firmware does."""
+        controller, _, _ = await _controller()
+
+        await controller.set_boiler_max_power_index(BoilerMaxPowerIndex.KW_4)
+        await controller.refresh()
+
+        assert controller.boiler_max_power_kw == 4.0
@@ -0,0 +1,200 @@
+"""Tests for transactional multi-register writes."""
+
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi import KospelConnectionError  # noqa: E402
+from kospel_cmi.registers.enums import HeaterMode  # noqa: E402
+
+from custom_components.kospel.transaction import RegisterTransaction  # noqa: E402
+
+
+class _MemoryBackend:
+    """Register map with a request log; can fail a write or all reads."""
+
+    def __init__(self, registers: dict[str, str]) -> None:
+        self.registers = dict(registers)
+        self.requests: list[tuple] = []
+        self.fail_write: str | None = None
+        self.fail_reads = False
+
+    async def write_register(self, register: str, hex_value: str) -> None:
+        self.requests.append(("write", register, hex_value))
+        if register == self.fail_write:
+            raise KospelConnectionError("reset")
+        self.registers[register] = hex_value
+
+    async def read_registers(self, start_register: str, count: int) -> dict[str, str]:
+        self.requests.append(("read", start_register, count))
+        if self.fail_reads:
+            raise KospelConnectionError("timeout")
+        start = int(start_register[2:], 16)
+        return {
+            register: value
+            for register, value in self.registers.items()
+            if start <= int(register[2:], 16) < start + count
+        }
+
+
+_DEVICE = {"0b32": "0000", "0b55": "2000", "0b8d": "c800"}
+
+
+class TestRegisterTransaction:
+    """Tests for planning, ordered sending and verification."""
+
+    def test_plan_encodes_against_snapshot_and_merges_registers(self) -> None:
+        """Read-modify-write keeps other bits; a register is written once."""
+        transaction = RegisterTransaction({"0b55": "1000"})
+        transaction.set_heater_mode(HeaterMode.WINTER)
+        transaction.set_manual_heating(21.5)
+
+        assert [(write.register, write.value) for write in transaction.writes] == [
+            ("0b55", "3002"),
+            ("0b32", "4000"),
+            ("0b8d", "d700"),
+        ]
+
+    def test_heater_mode_needs_current_register(self) -> None:
+        """0b55 cannot be planned before it was read."""
+        with pytest.raises(ValueError):
+            RegisterTransaction({}).set_heater_mode(HeaterMode.OFF)
+
+    @pytest.mark.asyncio
+    async def test_commit_sends_in_order_and_verifies_once(self) -> None:
+        """One request per register, then a single read back."""
+        backend = _MemoryBackend(_DEVICE)
+        transaction = RegisterTransaction(_DEVICE)
+        transaction.set_manual_heating(21.5)
+
+        result = await transaction.async_commit(backend)
+
+        assert backend.requests == [
+            ("write", "0b55", "2002"),
+            ("write", "0b32", "4000"),
+            ("write", "0b8d", "d700"),
+            ("read", "0b32", 0x8D - 0x32 + 1),
+        ]
+        assert result.complete
+        assert result.applied == ("0b55", "0b32", "0b8d")
+        assert result.read_back == {"0b32": "4000", "0b55": "2002", "0b8d": "d700"}
+
+    @pytest.mark.asyncio
+    async def test_read_back_waits_for_the_device_to_settle(self) -> None:
+        """Writes the device persists late are verified after the settle delay."""
+        backend = _MemoryBackend(_DEVICE)
+        original_write = backend.write_register
+        pending: list[tuple[str, str]] = []
+
+        async def _write_later(register: str, hex_value: str) -> None:
+            await original_write(register, _DEVICE.get(register, "0000"))
+            pending.append((register, hex_value))
+
+        async def _settle(delay: float) -> None:
+            backend.registers.update(pending)
+
+        backend.write_register = _write_later
+        transaction = RegisterTransaction(_DEVICE)
+        transaction.set_manual_temperature(21.5)
+
+        with patch(
+            "custom_components.kospel.transaction.asyncio.sleep", side_effect=_settle
+        ) as sleep:
+            result = await transaction.async_commit(backend, settle_delay=1.0)
+
+        sleep.assert_awaited_once_with(1.0)
+        assert result.complete
+
+    @pytest.mark.asyncio
+    async def test_failed_write_reports_what_was_applied(self) -> None:
+        """Writes stop at the failure; the read back tells what the device holds."""
+        backend = _MemoryBackend(_DEVICE)
+        backend.fail_write = "0b32"
+        transaction = RegisterTransaction(_DEVICE)
+        transaction.set_manual_heating(21.5)
+
+        result = await transaction.async_commit(backend)
+
+        assert ("write", "0b8d", "d700") not in backend.requests
+        assert not result.complete
+        assert result.sent == ("0b55",)
+        assert result.applied == ("0b55",)
+        assert result.not_applied == ("0b32", "0b8d")
+        assert isinstance(result.error, KospelConnectionError)
+        assert result.verified
+
+    @pytest.mark.asyncio
+    async def test_mode_verification_ignores_other_flags(self) -> None:
+        """Flags the heater changes itself in 0b55 do not fail verification."""
+        backend = _MemoryBackend(_DEVICE)
+        transaction = RegisterTransaction(_DEVICE)
+        transaction.set_heater_mode(HeaterMode.OFF)
+
+        original_write = backend.write_register
+
+        async def _write_and_flip_flag(register: str, hex_value: str) -> None:
+            await original_write(register, hex_value)
+            backend.registers["0b55"] = "1000"  # bit 4 set by the heater
+
+        backend.write_register = _write_and_flip_flag
+        result = await transaction.async_commit(backend)
+
+        assert result.complete
+
+    @pytest.mark.asyncio
+    async def test_unverified_commit_reports_acknowledged_writes(self) -> None:
+        """When the read back fails, acknowledged writes count as applied."""
+        backend = _MemoryBackend(_DEVICE)
+        backend.fail_reads = True
+        transaction = RegisterTransaction(_DEVICE)
+        transaction.set_room_preset("set_room_temperature_comfort", 22.0)
+
+        result = await transaction.async_commit(backend)
+
+        assert not result.verified
+        assert result.applied == ("0b6a",)
+        assert result.read_back == {}
+        assert "unverified" in str(result)
+
+    @pytest.mark.asyncio
+    async def test_values_the_device_holds_are_elided(self) -> None:
+        """Only registers that would change are sent; nothing at all is free."""
+        backend = _MemoryBackend(_DEVICE)
+        transaction = RegisterTransaction(_DEVICE, {"0b32": "4000", "0b55": "2002"})
+        transaction.set_manual_heating(20.0)
+
+        assert transaction.elided == ("0b55", "0b32")
+        assert [write.register for write in transaction.writes] == ["0b8d"]
+
+        unchanged = RegisterTransaction(_DEVICE, _DEVICE)
+        unchanged.set_manual_temperature(20.0)
+        result = await unchanged.async_commit(backend)
+
+        assert backend.requests == []
+        assert result.complete
+        assert result.elided == ("0b8d",)
@@ -25,12 +25,16 @@ sys.modules["homeassistant.components.sensor"] = MagicMock()
 sys.modules["homeassistant.components.switch"] = MagicMock()
 sys.modules["homeassistant.components.water_heater"] = MagicMock()
 sys.modules["homeassistant.const"] = MagicMock()
-sys.modules["homeassistant.core"] = MagicMock()
+_ha_core_mock = MagicMock()
+# Real identity decorator so @callback methods (e.g. discovery cache) stay callable.
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
 sys.modules["homeassistant.exceptions"] = MagicMock()
 sys.modules["homeassistant.helpers"] = MagicMock()
 sys.modules["homeassistant.helpers.entity"] = MagicMock()
 sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
 sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
 
 
 def _device_info(**kwargs):
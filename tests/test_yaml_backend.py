@@ -0,0 +1,119 @@
+"""Tests for the write-behind YAML register backend."""
+
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+
+# Mock homeassistant before importing integration modules.
+class _HAModule:
+    __path__ = []
+    __file__ = ""
+    __name__ = "homeassistant"
+    __spec__ = None
+
+
+_ha = _HAModule()
+sys.modules["homeassistant"] = _ha
+sys.modules["homeassistant.config_entries"] = MagicMock()
+sys.modules["homeassistant.components"] = MagicMock()
+sys.modules["homeassistant.const"] = MagicMock()
+_ha_core_mock = MagicMock()
+_ha_core_mock.callback = lambda f: f
+sys.modules["homeassistant.core"] = _ha_core_mock
+sys.modules["homeassistant.exceptions"] = MagicMock()
+sys.modules["homeassistant.helpers"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"] = MagicMock()
+sys.modules["homeassistant.helpers.entity"].DeviceInfo = lambda **kwargs: kwargs
+sys.modules["homeassistant.helpers.entity_platform"] = MagicMock()
+sys.modules["homeassistant.helpers.storage"] = MagicMock()
+sys.modules["homeassistant.helpers.update_coordinator"] = MagicMock()
+
+from kospel_cmi.controller.device import EkcoM3  # noqa: E402
+from kospel_cmi.registers.enums import HeaterMode  # noqa: E402
+
+from custom_components.kospel.yaml_backend import (  # noqa: E402
+    CachedYamlRegisterBackend,
+)
+
+
+class _Hass:
+    """Event loop and executor helpers used by the backend."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.executor_jobs = 0
+
+    async def async_add_executor_job(self, target, *args):
+        self.executor_jobs += 1
+        return await self.loop.run_in_executor(None, target, *args)
+
+    def async_create_background_task(self, target, name):
+        return self.loop.create_task(target, name=name)
+
+
+class TestCachedYamlRegisterBackend:
+    """Tests for in-memory reads, debounced atomic flushes and seeding."""
+
+    @pytest.mark.asyncio
+    async def test_reads_from_memory_after_load(self, tmp_path) -> None:
+        """State is read once; batch reads fill missing registers with 0000."""
+        state_file = tmp_path / "state_a.yaml"
+        state_file.write_text(yaml.safe_dump({"0b55": "2000"}))
+        hass = _Hass()
+        backend = CachedYamlRegisterBackend(hass, state_file)
+        await backend.async_load()
+        state_file.unlink()
+
+        registers = await backend.read_registers("0b54", 3)
+
+        assert registers == {"0b54": "0000", "0b55": "2000", "0b56": "0000"}
+        assert hass.executor_jobs == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_are_flushed_once_after_delay(self, tmp_path) -> None:
+        """Several writes within the debounce window produce one file write."""
+        state_file = tmp_path / "state_a.yaml"
+        hass = _Hass()
+        backend = CachedYamlRegisterBackend(hass, state_file, flush_delay=0.01)
+        await backend.async_load()
+
+        await backend.write_register("0b55", "2000")
+        await backend.write_register("0b32", "0100")
+        assert not state_file.exists()
+        await asyncio.sleep(0.05)
+
+        assert yaml.safe_load(state_file.read_text()) == {
+            "0b32": "0100",
+            "0b55": "2000",
+        }
+        assert hass.executor_jobs == 2
+        assert list(tmp_path.glob(".*.tmp")) == []
+
+    @pytest.mark.asyncio
+    async def test_aclose_flushes_pending_writes(self, tmp_path) -> None:
+        """Closing the backend writes state without waiting for the timer."""
+        state_file = tmp_path / "state_a.yaml"
+        backend = CachedYamlRegisterBackend(_Hass(), state_file, flush_delay=60)
+        await backend.async_load()
+        controller = EkcoM3(backend=backend)
+        await controller.refresh()
+
+        await controller.set_heater_mode(HeaterMode.WINTER)
+        await controller.aclose()
+
+        assert "0b55" in yaml.safe_load(state_file.read_text())
+
+    @pytest.mark.asyncio
+    async def test_new_entry_is_seeded_from_legacy_file(self, tmp_path) -> None:
+        """A missing per-entry file starts from the legacy shared state."""
+        seed_file = tmp_path / "state.yaml"
+        seed_file.write_text(yaml.safe_dump({"0b8d": "fa00"}))
+        backend = CachedYamlRegisterBackend(
+            _Hass(), tmp_path / "state_b.yaml", seed_file=seed_file
+        )
+        await backend.async_load()
+
+        assert await backend.read_register("0b8d") == "fa00"